@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark : construction et interrogation de l'index hors ligne des fuites
+by Dvrk_Smith
+
+Usage: python3 benchmarks/bench_breach_index.py [nombre_d_adresses] [--run-size 200000]
+
+Génère des corpus synthétiques (adresses réparties sur plusieurs fuites,
+avec recouvrements), construit l'index par tri externe puis mesure les
+recherches d'adresses présentes et absentes, et le filtre de Bloom tiré
+de l'index (taille, faux positifs mesurés).
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import resource
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.breach_index import BreachIndex
+from modules.bloom_filter import BloomFilter
+
+BREACHES = ["Adobe", "LinkedIn", "Dropbox", "Canva", "Deezer", "MySpace", "Tumblr", "Zynga"]
+
+def write_corpora(directory, count, seed=42):
+    """Un fichier par fuite ; une adresse peut figurer dans plusieurs fuites"""
+    rng = random.Random(seed)
+    files = {name: open(os.path.join(directory, f"{name.lower()}.txt"), "w") for name in BREACHES}
+    try:
+        for i in range(count):
+            email = f"user{i}@example{i % 97}.com"
+            for name in rng.sample(BREACHES, rng.choice((1, 1, 1, 2, 3))):
+                files[name].write(f"{email}:motdepasse{i}\n")
+    finally:
+        for f in files.values():
+            f.close()
+    return [{"Name": name, "files": [f.name]} for name, f in files.items()]
+
+def timed_lookups(index, emails):
+    """Temps moyen d'une recherche (µs)"""
+    start = time.perf_counter()
+    for email in emails:
+        index.check(email)
+    return (time.perf_counter() - start) * 1e6 / len(emails)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'index des fuites")
+    parser.add_argument("count", nargs="?", type=int, default=500000, help="Adresses distinctes")
+    parser.add_argument("--run-size", type=int, default=200000, help="Enregistrements triés en mémoire par run")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    manifest = write_corpora(directory, args.count)
+    path = os.path.join(directory, "breaches.idx")
+
+    start = time.perf_counter()
+    index = BreachIndex.build(path, manifest, run_size=args.run_size)
+    build = time.perf_counter() - start
+    print(f"Construction      {build:.1f} s ({args.count / build:,.0f} adresses/s), "
+          f"{os.path.getsize(path) / 1e6:.1f} Mo, pic RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} Mo")
+
+    start = time.perf_counter()
+    index = BreachIndex(path)
+    print(f"Ouverture (mmap)  {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    rng = random.Random(7)
+    present = [f"user{i}@example{i % 97}.com" for i in rng.sample(range(args.count), 20000)]
+    absent = [f"inconnu{i}@example.org" for i in range(20000)]
+    print(f"Adresse présente  {timed_lookups(index, present):.1f} µs")
+    print(f"Adresse absente   {timed_lookups(index, absent):.1f} µs")
+
+    assert all(index.check(email)["breached"] for email in present[:1000])
+    assert not any(index.check(email)["breached"] for email in absent[:1000])
+    print(f"Adresses indexées {index.count:,}, ensembles de fuites distincts {len(index._sets)}")
+
+    # Filtre de Bloom construit depuis l'index, pour plusieurs taux visés
+    for fp_rate in (0.01, 0.001, 0.0001):
+        start = time.perf_counter()
+        bloom = BloomFilter.from_index(index, fp_rate)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        false_positives = sum(1 for email in absent if bloom.might_contain(email))
+        lookup = (time.perf_counter() - start) * 1e6 / len(absent)
+        assert all(bloom.might_contain(email) for email in present[:1000])
+        print(f"Bloom {fp_rate:<7}     {len(bloom._array) / 1e6:.2f} Mo, {bloom.hashes} hachages, "
+              f"construit en {build:.1f} s, {lookup:.1f} µs, faux positifs {false_positives / len(absent):.3%}")
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark : chargement du catalogue des plateformes et évaluation des règles
+by Dvrk_Smith
+
+Usage: python3 benchmarks/bench_catalogue.py [--sizes 16,100,500,2000] [--sweep 500]
+
+Pour chaque taille de catalogue synthétique (sites du catalogue livré
+dupliqués sur des hôtes distincts) : coût de création de UsernameSearch,
+de chargement et compilation, de construction des URLs et d'évaluation
+des règles pour un username. --sweep sonde réellement N sites contre le
+serveur de substitution.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_server import start_server
+from modules.platforms import CATALOGUE_PATH, Catalogue
+from modules.http_transport import HTTPTransport
+from modules.username_search import UsernameSearch
+
+# Page de profil typique : le marqueur de détection est loin dans le corps
+PAGE = (b"<html><head><title>profile</title></head><body>" + b"lorem ipsum " * 5000
+        + b"<div class=\"tgme_page_title\">bob</div></body></html>")
+
+def synthetic_catalogue(size):
+    """Catalogue de size sites sur des hôtes distincts, règles du catalogue livré"""
+    with open(CATALOGUE_PATH, "r", encoding="utf-8") as f:
+        shipped = json.load(f)
+
+    sites = []
+    for i in range(size):
+        spec = dict(shipped["username"][i % len(shipped["username"])])
+        spec["name"] = f"{spec['name']} {i}"
+        spec["url"] = f"https://site{i}.example/" + spec["url"].split("/", 3)[-1]
+        sites.append(spec)
+    return dict(shipped, username=sites)
+
+def timed(func, repeat):
+    """Durée moyenne d'un appel (secondes)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+def measure(size, directory):
+    """Mesures pour un catalogue de size sites"""
+    path = os.path.join(directory, f"platforms_{size}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(synthetic_catalogue(size), f)
+
+    repeat = max(2000 // size, 3)
+    create, _ = timed(lambda: UsernameSearch(catalogue=path, transport=object()), repeat)
+    load, catalogue = timed(lambda: Catalogue.load(path), repeat)
+    urls, sites = timed(lambda: catalogue.username_urls("bob"), repeat)
+    evaluate, _ = timed(lambda: [
+        platform.evaluate(200, url, PAGE if platform.needs_body else b"")
+        for platform, url in zip(catalogue.platforms, sites.values())
+    ], repeat)
+
+    print(f"{size:>6} {create * 1e6:>14.1f} {load * 1e3:>12.2f} {load * 1e6 / size:>10.1f}"
+          f" {catalogue.pattern_count:>10} {urls * 1e6 / size:>12.2f} {evaluate * 1e6 / size:>12.2f}")
+
+def sweep(size, directory, max_workers, per_host):
+    """Sondage réel de size sites contre le serveur de substitution"""
+    path = os.path.join(directory, f"platforms_{size}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(synthetic_catalogue(size), f)
+
+    server, url = start_server(latency=20, jitter=10)
+    searcher = UsernameSearch(max_workers=max_workers, per_host=per_host, catalogue=path,
+                              transport=HTTPTransport(endpoint_override=url, dns_ttl=0))
+    start = time.perf_counter()
+    results = searcher.probe_username("bob")
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    undetermined = sum(1 for r in results.values() if r["available"] is None)
+    print(f"\nBalayage de {size} sites ({max_workers} sondes simultanées, {per_host} par hôte): "
+          f"{elapsed:.2f} s, {size / elapsed:.0f} sites/s, {undetermined} indéterminé(s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du catalogue des plateformes")
+    parser.add_argument("--sizes", default="16,100,500,2000", help="Tailles de catalogue à mesurer")
+    parser.add_argument("--sweep", type=int, default=0, help="Sonde N sites contre le serveur de substitution")
+    parser.add_argument("--workers", type=int, default=32, help="Sondes simultanées pour --sweep")
+    parser.add_argument("--per-host", type=int, default=4, help="Sondes simultanées par hôte pour --sweep")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    print(f"{'sites':>6} {'création µs':>14} {'charge ms':>12} {'µs/site':>10} {'regex':>10}"
+          f" {'URL µs/site':>12} {'règle µs/site':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        measure(size, directory)
+
+    if args.sweep:
+        sweep(args.sweep, directory, args.workers, args.per_host)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark : mémoire d'un lot de numéros, un dict par numéro contre stockage par colonnes
+by Dvrk_Smith
+
+Usage: python3 benchmarks/bench_phone_batch.py [nombre_de_numeros]
+"""
+
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import phonenumbers
+from bench_prefix_index import sample_numbers
+from modules.phone_analyzer import PhoneAnalyzer
+from modules.phone_batch import PhoneBatch
+
+def measured(label, build, count):
+    """Construit une structure et affiche la mémoire retenue par numéro"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {retained / count:>10,.0f} octets/numéro  ({elapsed:.2f} s)")
+    return value
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    numbers = [phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+               for number in sample_numbers(count)]
+    items = list(PhoneAnalyzer().bulk_validate(numbers, fields=('e164',), processes=2))
+
+    batch = measured("Stockage par colonnes", lambda: _columns(items), count)
+    measured("Un dict par numéro", lambda: [result.to_dict() for result in batch], count)
+
+    print(f"Colonnes (hors chaînes)      {batch.nbytes() / count:>10,.1f} octets/numéro")
+    start = time.perf_counter()
+    batch.to_csv(io.StringIO())
+    print(f"Export CSV                   {(time.perf_counter() - start) * 1e3:>10,.0f} ms")
+
+def _columns(items):
+    batch = PhoneBatch()
+    batch.extend(items)
+    return batch
+
+if __name__ == "__main__":
+    main()
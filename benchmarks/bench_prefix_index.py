@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark : index de préfixes contre les trois appels phonenumbers
+by Dvrk_Smith
+
+Usage: python3 benchmarks/bench_prefix_index.py [nombre_de_numeros]
+"""
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import phonenumbers
+from modules.prefix_index import PrefixIndex
+from modules.phone_analyzer import lookup_carrier, lookup_location, lookup_timezone
+
+# Échantillon de pays pour générer des numéros réalistes
+REGIONS = ["FR", "FR", "FR", "BE", "CH", "DE", "GB", "US", "CA", "ES", "IT", "MA", "SN", "CI",
+           "AU", "AR", "RU", "KZ"]
+
+def sample_numbers(count, seed=42):
+    """Numéros valides générés à partir des exemples de métadonnées"""
+    rng = random.Random(seed)
+    numbers = []
+    # Fixes et mobiles surtout, plus des types non géographiques (pays et fuseau de l'indicatif)
+    types = [phonenumbers.PhoneNumberType.MOBILE, phonenumbers.PhoneNumberType.FIXED_LINE] * 3 + [
+        phonenumbers.PhoneNumberType.TOLL_FREE, phonenumbers.PhoneNumberType.VOIP,
+        phonenumbers.PhoneNumberType.PERSONAL_NUMBER, phonenumbers.PhoneNumberType.UAN
+    ]
+    while len(numbers) < count:
+        example = phonenumbers.example_number_for_type(rng.choice(REGIONS), rng.choice(types))
+        if example is None:
+            continue
+        national = str(example.national_number)
+        # Fait varier les derniers chiffres pour couvrir plusieurs préfixes
+        tail = str(rng.randrange(10 ** 4)).zfill(4)
+        candidate = phonenumbers.parse(f"+{example.country_code}{national[:-4]}{tail}")
+        if phonenumbers.is_valid_number(candidate):
+            numbers.append(candidate)
+    return numbers
+
+def timed(label, func, numbers):
+    """Exécute func sur chaque numéro et affiche le débit"""
+    start = time.perf_counter()
+    results = [func(number) for number in numbers]
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(numbers) / elapsed:>12,.0f} numéros/s  ({elapsed * 1e6 / len(numbers):.1f} µs/numéro)")
+    return results
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    numbers = sample_numbers(count)
+
+    path = os.path.join(tempfile.mkdtemp(), "prefix_fr.idx")
+    start = time.perf_counter()
+    PrefixIndex.build(path, "fr").close()
+    print(f"Construction de l'index      {time.perf_counter() - start:.2f} s ({os.path.getsize(path) / 1e6:.1f} Mo)")
+
+    start = time.perf_counter()
+    index = PrefixIndex(path)
+    print(f"Ouverture (mmap)             {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    three_calls = timed("Trois appels phonenumbers", lambda n: (
+        lookup_carrier(n), lookup_location(n), lookup_timezone(n)
+    ), numbers)
+    indexed = timed("Index de préfixes", index.describe, numbers)
+
+    # Mêmes règles par type de numéro que phonenumbers : aucun écart toléré
+    different = []
+    for number, expected, (carrier_name, region, zone) in zip(numbers, three_calls, indexed):
+        found = (carrier_name or "Inconnu", region or "Inconnue", zone or "Inconnu")
+        if found != expected:
+            e164 = phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+            different.append((e164, expected, found))
+    print(f"Résultats identiques         {1 - len(different) / len(numbers):.1%}")
+    index.close()
+    for e164, expected, found in different[:10]:
+        print(f"  {e164}: phonenumbers {expected}, index {found}")
+    if different:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
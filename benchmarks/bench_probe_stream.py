@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark : sondes GET en flux avec arrêt anticipé contre téléchargement complet
+by Dvrk_Smith
+
+Usage: python3 benchmarks/bench_probe_stream.py [--sites 20] [--usernames 10] [--page-kb 300]
+
+Les sites imités répondent 200 pour tous les profils (inexistants compris)
+avec des pages de --page-kb Ko : seule l'inspection du corps permet de
+trancher.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_server import start_server
+from modules.platforms import Catalogue
+from modules.http_transport import HTTPTransport
+from modules.username_search import UsernameSearch
+
+def body_catalogue(sites):
+    """Catalogue de sites détectés uniquement par le corps de la page"""
+    return Catalogue({"username": [
+        {"name": f"Site {i}", "url": f"https://site{i}.example/{{username}}",
+         "detect": [
+             {"status": [200], "body": "data-profile=", "result": "taken"},
+             {"status": [200], "result": "available"}
+         ]}
+        for i in range(sites)
+    ]})
+
+class FullDownloadSearch(UsernameSearch):
+    """Ancien comportement : corps téléchargé en entier puis évalué"""
+
+    def _probe_site(self, platform, url):
+        response = self.transport.request(platform.method, url, headers=self.headers,
+                                          timeout=self.probe_timeout, allow_redirects=True,
+                                          provider='username')
+        with self._stream_lock:
+            self.stream_stats['probes'] += 1
+            self.stream_stats['bytes_read'] += len(response.content)
+        return response.status_code, platform.evaluate(response.status_code, response.url, response.content)
+
+def run(cls, url, catalogue, usernames):
+    """Sonde tous les sites pour chaque username et retourne (secondes, sondeur, résultats)"""
+    transport = HTTPTransport(endpoint_override=url, dns_ttl=0)
+    searcher = cls(transport=transport, catalogue=catalogue)
+    start = time.perf_counter()
+    results = [searcher.probe_username(f"user{i}") for i in range(usernames)]
+    elapsed = time.perf_counter() - start
+    return elapsed, searcher, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des sondes en flux")
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--usernames", type=int, default=10)
+    parser.add_argument("--page-kb", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=20, help="Latence simulée (ms)")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency, page_kb=args.page_kb, soft_404=True)
+    catalogue = body_catalogue(args.sites)
+
+    print(f"{args.sites} sites × {args.usernames} usernames, pages de ~{args.page_kb} Ko\n")
+    print(f"{'mode':<12}{'secondes':>10}{'ms/sonde':>10}{'Ko/sonde':>10}{'arrêts':>8}{'plafonds':>10}{'fermées':>9}")
+    reference = None
+    for label, cls in (("complet", FullDownloadSearch), ("flux", UsernameSearch)):
+        elapsed, searcher, results = run(cls, url, catalogue, args.usernames)
+        stats = searcher.stream_stats
+        probes = stats['probes'] or 1
+        print(f"{label:<12}{elapsed:>10.2f}{elapsed * 1000 / probes:>10.1f}{stats['bytes_read'] / 1024 / probes:>10.1f}"
+              f"{stats['early_stops']:>8}{stats['capped']:>10}{stats['closed']:>9}")
+        if reference is None:
+            reference = results
+        elif results != reference:
+            print("⚠️  Les deux modes ne donnent pas les mêmes résultats")
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark : lot d'emails face à un fournisseur limité par clé (429 + Retry-After)
+by Dvrk_Smith
+
+Usage: python3 benchmarks/bench_rate_limit.py [nombre_d_emails] [--key-rate 10] [--keys 2]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_server import start_server
+from modules.http_transport import HTTPTransport
+from modules.email_checker import EmailChecker
+from modules.probe_engine import stream_map
+from modules.rate_limiter import RateLimiter
+
+# Sans débit par clé (les débits par défaut sont ceux des vrais fournisseurs)
+UNLIMITED = {'hibp': {'rate': None}}
+
+def run(label, url, emails, keys, limiter, workers):
+    """Vérifie les emails sur HIBP et affiche durée, erreurs et refus"""
+    transport = HTTPTransport(endpoint_override=url, dns_ttl=0)
+    checker = EmailChecker(transport=transport, api_keys={'hibp': keys}, rate_limiter=limiter)
+    start = time.perf_counter()
+    errors = sum(1 for _, result in stream_map(checker.check_hibp, emails, max_workers=workers)
+                 if isinstance(result, Exception) or 'error' in result)
+    elapsed = time.perf_counter() - start
+    stats = limiter.stats()['hibp']
+    print(f"{label:<34} {elapsed:6.1f} s  {len(emails) / elapsed:6.1f} emails/s  "
+          f"erreurs: {errors:<4} refus 429: {stats['throttled']:<4} remis en file: {stats['requeued']}")
+    transport.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("count", nargs="?", type=int, default=200)
+    parser.add_argument("--key-rate", type=float, default=10, help="Débit permis par clé (appels/s)")
+    parser.add_argument("--keys", type=int, default=2, help="Nombre de clés HIBP")
+    parser.add_argument("--workers", type=int, default=16)
+    args = parser.parse_args()
+
+    server, url = start_server(latency=20, key_rate=args.key_rate)
+    emails = [f"user{i}@exemple.fr" for i in range(args.count)]
+    keys = [f"cle-{i}" for i in range(args.keys)]
+    print(f"{args.count} emails, {args.keys} clé(s) à {args.key_rate:g} appels/s "
+          f"(débit maximal {args.keys * args.key_rate:g} emails/s)")
+
+    run("Sans planification", url, emails, keys, RateLimiter(UNLIMITED, max_retries=0), args.workers)
+    run("429 remis en file", url, emails, keys, RateLimiter(UNLIMITED), args.workers)
+    run("Seau de jetons par clé", url, emails, keys,
+        RateLimiter({'hibp': {'rate': args.key_rate}}), args.workers)
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks des chemins critiques contre le serveur de substitution
+by Dvrk_Smith
+
+Usage:
+    python3 benchmarks/run_benchmarks.py [--scale 1.0] [--latency 20] [--jitter 10]
+                                         [--rate-429 0] [--memory] [--json resultats.json]
+
+Charges mesurées : email unique, emails en masse, balayage de usernames,
+téléphones en masse. Pour chacune : requêtes/s, latences p50/p95/p99 et mémoire.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import threading
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_server import start_server
+from modules.http_transport import HTTPTransport
+from modules.email_checker import EmailChecker
+from modules.phone_analyzer import PhoneAnalyzer
+from modules.username_search import UsernameSearch
+from modules.rate_limiter import RateLimiter, DEFAULT_LIMITS
+
+class TimedTransport(HTTPTransport):
+    """Transport qui mesure la latence et le statut de chaque requête"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.latencies = []
+            self.statuses = {}
+            self.failures = 0
+
+    def request(self, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = super().request(method, url, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.latencies.append(elapsed)
+            self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        return response
+
+def percentile(values, fraction):
+    """Percentile par rang le plus proche"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(fraction * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+def run_workload(name, func, transport, memory=False):
+    """Exécute une charge et retourne ses mesures"""
+    transport.reset()
+    if memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    items, latencies = func()
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    # Les charges réseau sont mesurées par requête, les autres par élément
+    if transport.latencies:
+        latencies = transport.latencies
+        requests_done = len(transport.latencies) + transport.failures
+    else:
+        requests_done = items
+
+    return {
+        "workload": name,
+        "items": items,
+        "requests": requests_done,
+        "seconds": elapsed,
+        "requests_per_s": requests_done / elapsed if elapsed else 0.0,
+        "p50_ms": _ms(percentile(latencies, 0.50)),
+        "p95_ms": _ms(percentile(latencies, 0.95)),
+        "p99_ms": _ms(percentile(latencies, 0.99)),
+        "statuses": {str(code): count for code, count in sorted(transport.statuses.items())},
+        "failures": transport.failures,
+        "peak_traced_kb": peak / 1024 if peak is not None else None,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+def _ms(seconds):
+    return seconds * 1000 if seconds is not None else None
+
+def single_email(checker, count):
+    """Vérifications complètes successives (trois fournisseurs en parallèle)"""
+    def run():
+        latencies = []
+        for i in range(count):
+            start = time.perf_counter()
+            checker.check_all(f"single{i}@example.com")
+            latencies.append(time.perf_counter() - start)
+        return count, latencies
+    return run
+
+def bulk_email(checker, count):
+    """Flux d'emails via bulk_check"""
+    def run():
+        emails = (f"staff{i}@example.com" for i in range(count))
+        done = sum(1 for _ in checker.bulk_check(emails))
+        return done, []
+    return run
+
+def username_sweep(searcher, count):
+    """Sondage de tous les sites pour une série de usernames"""
+    def run():
+        latencies = []
+        for i in range(count):
+            start = time.perf_counter()
+            searcher.probe_username(f"user{i}")
+            latencies.append(time.perf_counter() - start)
+        return count, latencies
+    return run
+
+def bulk_phone(analyzer, count, processes):
+    """Validation et enrichissement de numéros en masse"""
+    def run():
+        numbers = (f"+336{i:08d}" for i in range(count))
+        latencies = []
+        last = time.perf_counter()
+        done = 0
+        for _ in analyzer.bulk_validate(numbers, processes=processes, chunk_size=1000):
+            done += 1
+            # Latence moyenne par numéro, mesurée par lot de 1000
+            if done % 1000 == 0:
+                now = time.perf_counter()
+                latencies.append((now - last) / 1000)
+                last = now
+        return done, latencies
+    return run
+
+def print_table(results):
+    """Affiche les mesures sous forme de tableau"""
+    header = f"{'charge':<16}{'éléments':>9}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'RSS Mo':>8}{'pic Ko':>9}  statuts"
+    print(header)
+    print("─" * len(header))
+    for r in results:
+        cells = [
+            f"{r['workload']:<16}",
+            f"{r['items']:>9}",
+            f"{r['requests_per_s']:>10.0f}",
+        ]
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            cells.append(f"{r[key]:>9.2f}" if r[key] is not None else f"{'-':>9}")
+        cells.append(f"{r['max_rss_kb'] / 1024:>8.0f}")
+        cells.append(f"{r['peak_traced_kb']:>9.0f}" if r['peak_traced_kb'] is not None else f"{'-':>9}")
+        statuses = ", ".join(f"{code}×{count}" for code, count in r["statuses"].items())
+        if r["failures"]:
+            statuses += f", échecs×{r['failures']}"
+        cells.append(f"  {statuses}")
+        print("".join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks OSINT Tool Pro")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplicateur du volume de chaque charge")
+    parser.add_argument("--latency", type=float, default=20, help="Latence simulée des fournisseurs (ms)")
+    parser.add_argument("--jitter", type=float, default=10, help="Gigue simulée (ms)")
+    parser.add_argument("--rate-429", type=float, default=0, help="Proportion de réponses 429")
+    parser.add_argument("--processes", type=int, default=None, help="Processus pour la charge téléphone")
+    parser.add_argument("--only", action="append", help="Ne lancer que cette charge (répétable)")
+    parser.add_argument("--memory", action="store_true", help="Mesure le pic d'allocations (tracemalloc, plus lent)")
+    parser.add_argument("--json", help="Écrit les mesures dans ce fichier JSON")
+    args = parser.parse_args()
+
+    server, url = start_server(latency=args.latency, jitter=args.jitter, rate_429=args.rate_429)
+    transport = TimedTransport(endpoint_override=url, dns_ttl=0)
+
+    # Le serveur de substitution ne limite pas le débit : pas de planification par clé
+    limiter = RateLimiter({provider: {'rate': None} for provider in DEFAULT_LIMITS})
+    checker = EmailChecker(transport=transport, rate_limiter=limiter)
+    checker.hunter_api_key = "benchmark"
+    searcher = UsernameSearch(transport=transport)
+    analyzer = PhoneAnalyzer(transport=transport, rate_limiter=limiter)
+
+    def scaled(count):
+        return max(int(count * args.scale), 1)
+
+    workloads = [
+        ("single_email", single_email(checker, scaled(50))),
+        ("bulk_email", bulk_email(checker, scaled(2000))),
+        ("username_sweep", username_sweep(searcher, scaled(50))),
+        ("bulk_phone", bulk_phone(analyzer, scaled(20000), args.processes)),
+    ]
+
+    results = []
+    for name, func in workloads:
+        if args.only and name not in args.only:
+            continue
+        results.append(run_workload(name, func, transport, args.memory))
+
+    server.shutdown()
+    print(f"Serveur de substitution: latence {args.latency} ms ± {args.jitter} ms, 429: {args.rate_429:.0%}")
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
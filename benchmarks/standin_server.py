@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Serveur local imitant les fournisseurs (HIBP, EmailRep, Hunter, NumVerify, réseaux sociaux)
+by Dvrk_Smith
+
+Usage:
+    python3 benchmarks/standin_server.py --port 8765 --latency 40 --jitter 20 --rate-429 0.02
+    OSINT_ENDPOINT_OVERRIDE=http://127.0.0.1:8765 python3 main.py
+
+Le transport HTTP réécrit https://hote/chemin en http://127.0.0.1:8765/hote/chemin :
+le premier segment du chemin indique donc le fournisseur imité.
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+BREACHES = [
+    {"Name": "Adobe", "BreachDate": "2013-10-04", "PwnCount": 152445165},
+    {"Name": "LinkedIn", "BreachDate": "2012-05-05", "PwnCount": 164611595},
+    {"Name": "Dropbox", "BreachDate": "2012-07-01", "PwnCount": 68648009},
+    {"Name": "Canva", "BreachDate": "2019-05-24", "PwnCount": 137272116},
+    {"Name": "Deezer", "BreachDate": "2019-04-22", "PwnCount": 229037936},
+]
+
+# Hôtes des API dont le débit est limité par clé (--key-rate)
+API_HOSTS = ("haveibeenpwned.com", "emailrep.io", "api.hunter.io", "apilayer.net")
+
+def _score(value):
+    """Valeur pseudo-aléatoire stable dans [0, 1) dérivée d'une chaîne"""
+    digest = hashlib.sha256(value.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    options = {}
+    # Prochain appel permis par (hôte, clé) : un appel toutes les 1/key_rate secondes,
+    # avec une avance d'un appel pour absorber la gigue du réseau
+    limits = {}
+    limits_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        """Pas de journal par requête"""
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        """Envoie une réponse JSON ou HTML"""
+        if isinstance(body, (dict, list)):
+            payload = json.dumps(body).encode("utf-8")
+            content_type = "application/json"
+        else:
+            payload = (body or "").encode("utf-8")
+            content_type = "text/html; charset=utf-8"
+
+        # Validateur de la réponse : 304 sans corps si le client a déjà cette version
+        if self.options.get("etag") and status in (200, 404):
+            etag = '"%s"' % hashlib.sha256(b"%d:" % status + payload).hexdigest()[:16]
+            headers = dict(headers or {}, ETag=etag)
+            if self.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if status != 304:
+            self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _inject(self):
+        """Latence, 429 et erreurs serveur simulés ; retourne True si la réponse est déjà envoyée"""
+        latency = self.options.get("latency", 0) + random.uniform(0, self.options.get("jitter", 0))
+        if latency:
+            time.sleep(latency / 1000)
+
+        roll = random.random()
+        if roll < self.options.get("rate_429", 0):
+            self._send(429, {"statusCode": 429, "message": "Rate limit exceeded"},
+                       {"Retry-After": str(self.options.get("retry_after", 1))})
+            return True
+        if roll < self.options.get("rate_429", 0) + self.options.get("rate_5xx", 0):
+            self._send(503, {"error": "Service unavailable"})
+            return True
+        return False
+
+    def _over_limit(self, host, query):
+        """Refuse (429 + Retry-After) un appel dépassant le débit de sa clé ; retourne True si refusé"""
+        rate = self.options.get("key_rate")
+        if not rate or host not in API_HOSTS:
+            return False
+        key = (self.headers.get("hibp-api-key") or self.headers.get("Key")
+               or query.get("api_key") or query.get("access_key") or self.client_address[0])
+        now = time.monotonic()
+        with self.limits_lock:
+            allowed = self.limits.get((host, key), 0.0)
+            if now < allowed:
+                wait = allowed - now
+            else:
+                self.limits[(host, key)] = max(allowed, now - 1 / rate) + 1 / rate
+                return False
+        self._send(429, {"statusCode": 429, "message": "Rate limit exceeded"},
+                   {"Retry-After": str(math.ceil(wait))})
+        return True
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        host, _, rest = parts.path.lstrip("/").partition("/")
+        rest = unquote(rest)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+
+        if self._inject() or self._over_limit(host, query):
+            return
+
+        if host == "haveibeenpwned.com":
+            self._hibp(rest.rsplit("/", 1)[-1])
+        elif host == "emailrep.io":
+            self._emailrep(rest)
+        elif host == "api.hunter.io":
+            self._hunter(query.get("email", ""))
+        elif host == "apilayer.net":
+            self._numverify(query.get("number", ""))
+        else:
+            self._profile(host, rest)
+
+    def _hibp(self, email):
+        """GET /api/v3/breachedaccount/{email} : 200 + liste des fuites ou 404"""
+        score = _score(email.lower())
+        if score < self.options.get("breached_ratio", 0.3):
+            count = 1 + int(score * 1000) % len(BREACHES)
+            self._send(200, BREACHES[:count])
+        else:
+            self._send(404)
+
+    def _emailrep(self, email):
+        """GET /{email} : réputation"""
+        score = _score(email.lower())
+        reputation = "high" if score < 0.5 else "medium" if score < 0.8 else "low"
+        self._send(200, {
+            "email": email,
+            "reputation": reputation,
+            "suspicious": reputation == "low",
+            "details": {"blacklisted": False, "credentials_leaked": score < 0.3}
+        })
+
+    def _hunter(self, email):
+        """GET /v2/email-verifier?email= : vérification d'existence"""
+        score = _score(email.lower())
+        self._send(200, {"data": {
+            "status": "valid" if score < 0.7 else "invalid",
+            "score": int(score * 100),
+            "sources": []
+        }})
+
+    def _numverify(self, number):
+        """GET /api/validate?number= : validation de numéro"""
+        valid = number.lstrip("+").isdigit() and len(number.lstrip("+")) >= 8
+        self._send(200, {
+            "valid": valid,
+            "number": number.lstrip("+"),
+            "local_format": number[-9:],
+            "international_format": "+" + number.lstrip("+"),
+            "country_prefix": "+33",
+            "country_code": "FR",
+            "country_name": "France",
+            "location": "",
+            "carrier": "Orange" if valid else "",
+            "line_type": "mobile" if valid else ""
+        })
+
+    def _profile(self, host, path):
+        """Page de profil d'un réseau social : 200 si le profil « existe », 404 sinon"""
+        exists = _score(f"{host}/{path}".lower()) < self.options.get("taken_ratio", 0.5)
+        filler = "<div class=\"feed\">" + "lorem ipsum " * self.options.get("page_kb", 0) * 85 + "</div>"
+        if exists:
+            body = f"<html><head><title>{path} profile</title></head><body data-profile=\"{path}\">{filler}</body></html>"
+            self._send(200, body)
+        else:
+            # Certains sites répondent 200 même pour un profil inexistant
+            status = 200 if self.options.get("soft_404") else 404
+            self._send(status, f"<html><body>Page not found{filler}</body></html>")
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # File d'attente large : les sondes qui ferment leurs connexions en ouvrent beaucoup
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address):
+        """Ignore les clients qui ferment la connexion avant la fin de la réponse"""
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+def start_server(host="127.0.0.1", port=0, **options):
+    """Démarre le serveur dans un thread et retourne (serveur, URL de base)"""
+    handler = type("ConfiguredStandinHandler", (StandinHandler,), {"options": options, "limits": {}})
+    server = StandinServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_port}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de substitution des fournisseurs OSINT")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="Latence ajoutée (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="Gigue aléatoire ajoutée (ms)")
+    parser.add_argument("--rate-429", type=float, default=0, help="Proportion de réponses 429")
+    parser.add_argument("--rate-5xx", type=float, default=0, help="Proportion de réponses 503")
+    parser.add_argument("--retry-after", type=int, default=1, help="Valeur de Retry-After (s)")
+    parser.add_argument("--page-kb", type=int, default=0, help="Taille approximative des pages de profil (Ko)")
+    parser.add_argument("--soft-404", action="store_true", help="Profils inexistants servis avec un statut 200")
+    parser.add_argument("--key-rate", type=float, default=0,
+                        help="Appels par seconde permis par clé d'API (0 = illimité), 429 au-delà")
+    parser.add_argument("--etag", action="store_true", help="Envoie des ETag et répond 304 aux requêtes conditionnelles")
+    args = parser.parse_args()
+
+    server, url = start_server(
+        args.host, args.port,
+        latency=args.latency, jitter=args.jitter,
+        rate_429=args.rate_429, rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after, page_kb=args.page_kb, soft_404=args.soft_404, etag=args.etag,
+        key_rate=args.key_rate
+    )
+    print(f"Serveur de substitution prêt: {url}")
+    print(f"export OSINT_ENDPOINT_OVERRIDE={url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,12 @@ CONFIGURATION EXEMPLE - OSINT TOOL PRO
 Copiez ce fichier en 'config.py' et ajoutez vos clés API
 """
 
+# Une clé, ou une liste de clés utilisées à tour de rôle (débit cumulé)
 API_KEYS = {
     'hibp': 'VOTRE_CLE_HIBP_ICI',      # https://haveibeenpwned.com/API/Key
     'hunter': 'VOTRE_CLE_HUNTER_ICI',  # https://hunter.io/api-keys
     'virustotal': 'VOTRE_CLE_VT_ICI',  # https://www.virustotal.com/gui/join-us
+    'numverify': 'VOTRE_CLE_NUMVERIFY_ICI',  # https://numverify.com/product
 }
 
 APP_CONFIG = {
@@ -14,4 +16,80 @@ APP_CONFIG = {
     'version': '1.3',
     'author': 'Dvrk_Smith',
     'timeout': 15,
+    'http': {
+        'pool_connections': 32,  # Nombre d'hôtes gardés en pool
+        'pool_maxsize': 16,      # Connexions keep-alive par hôte
+        # Réutilisation des résolutions DNS (secondes, 0 = désactivée). Remplace
+        # socket.getaddrinfo pour tout le processus : à réserver aux gros lots
+        'dns_ttl': 0,
+        'endpoint_override': None,  # Ex. 'http://127.0.0.1:8765' (benchmarks/standin_server.py)
+        'resilience': {
+            'min_timeout': 1.0,       # Délai adaptatif minimum (secondes)
+            'multiplier': 3.0,        # Délai = 3 × p95 des latences observées de l'hôte
+            'failure_threshold': 5,   # Échecs consécutifs avant de court-circuiter l'hôte
+            'cooldown': 30,           # Pause avant un nouvel essai (doublée à chaque échec)
+        },
+    },
+    'rate_limits': {
+        'max_wait': 60,     # Attente maximale d'une clé libre avant d'abandonner l'appel (secondes)
+        'max_retries': 5,   # Remises en file d'un appel refusé (429) avant de rendre l'erreur
+        # Débit par clé : appels par seconde, avance permise (burst). Sans entrée, les clés
+        # ont un débit prudent (rate_limiter.DEFAULT_LIMITS) ; {'rate': None} le supprime
+        'limits': {
+            'hibp': {'rate': 10 / 60, 'burst': 1},   # Abonnement Pwned 1 : 10 requêtes/minute
+            'hunter': {'rate': 10, 'burst': 10},
+            'emailrep': {'rate': 1, 'burst': 1},
+            'numverify': {'rate': 1, 'burst': 1},
+        },
+    },
+    'cache': {
+        'path': 'data/cache.sqlite3',  # None pour un cache uniquement en mémoire
+        'memory_size': 1024,           # Entrées gardées en mémoire (LRU)
+        'disk_size': 100000,           # Entrées maximum sur disque
+        'negative_ttl': 300,           # Durée de vie des refus 4xx (erreurs passagères non gardées)
+        'ttls': {                      # Durée de vie par fournisseur (secondes)
+            'hibp': 86400,
+            'emailrep': 21600,
+            'hunter': 604800,
+            'numverify': 2592000,
+        },
+    },
+    'email': {
+        # Index hors ligne des fuites, remplace l'API HIBP
+        # (python3 -m modules.breach_index data/breaches.idx manifeste.json)
+        'breach_index': None,
+        # Filtre de Bloom des adresses compromises : évite l'appel HIBP pour les autres
+        # (python3 -m modules.bloom_filter data/breached.bloom --index data/breaches.idx)
+        'breach_filter': None,
+    },
+    'phone': {
+        # Index de préfixes (python3 -m modules.prefix_index data/prefix_fr.idx fr)
+        'prefix_index': 'data/prefix_fr.idx',
+    },
+    'username': {
+        'catalogue': None,   # Catalogue JSON des plateformes (None = modules/platforms.json)
+        'max_workers': 16,   # Sondes simultanées au total
+        'per_host': 4,       # Sondes simultanées par hôte
+        'max_body_bytes': 64 * 1024,  # Plafond de lecture des pages inspectées
+        'max_variants': 8,       # Variantes de username sondées pour un nom
+        'variant_budget': 30.0,  # Temps alloué au sondage des variantes (secondes, None = illimité)
+    },
+    'jobs': {
+        'path': 'data/jobs.sqlite3',   # Lots persistants (python3 main.py jobs ...)
+        'max_attempts': 3,             # Tentatives d'un fournisseur en erreur, reprises comprises
+    },
+    'service': {
+        'host': '127.0.0.1',   # python3 main.py serve : écoute locale uniquement par défaut
+        'port': 8770,
+        'token': None,         # Si défini, exigé dans l'en-tête Authorization: Bearer <token>
+    },
+    'watchlist': {
+        'path': 'data/watchlist.sqlite3',   # Cibles surveillées et derniers relevés (+ _validators.sqlite3)
+        'min_interval': 20 * 3600,          # Cible ignorée si vérifiée depuis moins longtemps (secondes)
+        'workers': 8,                       # Cibles vérifiées en parallèle
+    },
+    'reports': {
+        'root': 'reports',                  # Dossier des segments et de l'index
+        'segment_size': 64 * 1024 * 1024,   # Rotation des segments (octets)
+    },
 }
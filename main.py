@@ -7,35 +7,80 @@ by Dvrk_Smith
 import os
 import sys
 import time
+
+# Référence pour mesurer le temps de démarrage
+STARTUP_TIME = time.perf_counter()
+
 import json
+import argparse
+import importlib
+import importlib.util
+import threading
 from datetime import datetime
+from collections import deque
 from colorama import init, Fore, Style
+from modules.normalize import valid_email
 
 # Initialisation Colorama
 init(autoreset=True)
 
-# Import des modules
-MODULES_LOADED = False
-PHONE_MODULE_LOADED = False
-USERNAME_MODULE_LOADED = False
+# Modules chargés à la demande : nom -> (module, classe)
+LAZY_MODULES = {
+    'transport': ('modules.http_transport', 'HTTPTransport'),
+    'cache': ('modules.result_cache', 'ResultCache'),
+    'email': ('modules.email_checker', 'EmailChecker'),
+    'phone': ('modules.phone_analyzer', 'PhoneAnalyzer'),
+    'username': ('modules.username_search', 'UsernameSearch'),
+    'reports': ('modules.report_store', 'ReportStore'),
+    'watchlist': ('modules.watchlist', 'Watchlist'),
+    'jobs': ('modules.job_queue', 'JobQueue'),
+    'limiter': ('modules.rate_limiter', 'RateLimiter'),
+}
 
-try:
-    from modules.email_checker import EmailChecker
-    MODULES_LOADED = True
-except ImportError as e:
-    print(Fore.YELLOW + f"⚠️  Module email non chargé: {e}")
+# Fournisseurs d'un lot email -> nom de leur entrée dans le cache de résultats
+JOB_CACHE_PROVIDERS = {'hibp': 'hibp', 'reputation': 'emailrep', 'hunter': 'hunter'}
 
-try:
-    from modules.phone_analyzer import PhoneAnalyzer
-    PHONE_MODULE_LOADED = True
-except ImportError as e:
-    print(Fore.YELLOW + f"⚠️  Module phone non chargé: {e}")
+# État de chargement : nom -> True (chargé) ou message d'erreur
+MODULE_STATUS = {}
+# Coût d'import mesuré : nom -> (secondes, nouveaux modules Python)
+IMPORT_COSTS = {}
 
-try:
-    from modules.username_search import UsernameSearch
-    USERNAME_MODULE_LOADED = True
-except ImportError as e:
-    print(Fore.YELLOW + f"⚠️  Module username non chargé: {e}")
+def load_class(name):
+    """Importe un module à la première utilisation et retourne sa classe"""
+    module_name, class_name = LAZY_MODULES[name]
+    if MODULE_STATUS.get(name) not in (None, True):
+        return None
+    
+    loaded_before = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        MODULE_STATUS[name] = str(e)
+        print(Fore.YELLOW + f"⚠️  Module {name} non chargé: {e}", file=sys.stderr)
+        return None
+    
+    if name not in IMPORT_COSTS:
+        IMPORT_COSTS[name] = (time.perf_counter() - start, len(sys.modules) - loaded_before)
+    MODULE_STATUS[name] = True
+    return getattr(module, class_name)
+
+def module_status(name):
+    """Libellé de l'état d'un module pour l'écran de configuration"""
+    status = MODULE_STATUS.get(name)
+    if status is None:
+        return '⏳ Non chargé'
+    return '✅ Chargé' if status is True else '❌ Erreur'
+
+def print_startup_profile(stream=sys.stderr):
+    """Affiche le coût d'import de chaque module chargé"""
+    print("Profil de démarrage (coût d'import par module):", file=stream)
+    for name, (seconds, modules) in IMPORT_COSTS.items():
+        print(f"   {name:<10} {LAZY_MODULES[name][0]:<26} {seconds * 1000:8.1f} ms  (+{modules} modules)", file=stream)
+    for name, status in MODULE_STATUS.items():
+        if status is not True:
+            print(f"   {name:<10} {LAZY_MODULES[name][0]:<26} erreur: {status}", file=stream)
+    print(f"   Total depuis le lancement: {(time.perf_counter() - STARTUP_TIME) * 1000:.1f} ms", file=stream)
 
 # Import de la configuration
 try:
@@ -49,9 +94,104 @@ class OSINTToolPro:
         self.name = "OSINT Tool Pro"
         self.version = "1.3"
         self.author = "Dvrk_Smith"
-        self.email_checker = EmailChecker() if MODULES_LOADED else None
-        self.phone_analyzer = PhoneAnalyzer() if PHONE_MODULE_LOADED else None
-        self.username_searcher = UsernameSearch() if USERNAME_MODULE_LOADED else None
+        # Composants créés à la première utilisation
+        self._components = {}
+        self._components_lock = threading.RLock()
+    
+    def app_config(self, section):
+        """Section de APP_CONFIG dans config.py (dict vide si absente)"""
+        if CONFIG_LOADED:
+            return getattr(config, 'APP_CONFIG', {}).get(section, {})
+        return {}
+    
+    def _component(self, name):
+        """Retourne un composant, en le créant au premier accès"""
+        with self._components_lock:
+            if name not in self._components:
+                self._components[name] = self._create_component(name)
+            return self._components[name]
+    
+    def _create_component(self, name):
+        """Importe le module d'un composant et l'instancie"""
+        cls = load_class(name)
+        if cls is None:
+            return None
+        
+        if name == 'transport':
+            return cls(**self.app_config('http'))
+        elif name == 'cache':
+            try:
+                return cls(**self.app_config('cache'))
+            except Exception as e:
+                print(Fore.YELLOW + f"⚠️  Cache désactivé: {e}", file=sys.stderr)
+                return None
+        elif name == 'reports':
+            return cls(**self.app_config('reports'))
+        elif name == 'jobs':
+            return cls(**self.app_config('jobs'))
+        elif name == 'limiter':
+            return cls(**self.app_config('rate_limits'))
+        elif name == 'watchlist':
+            return cls(email_checker=self.email_checker, username_searcher=self.username_searcher,
+                       **self.app_config('watchlist'))
+        
+        transport = self.transport
+        if transport is None:
+            return None
+        if name == 'email':
+            return cls(transport=transport, cache=self.cache,
+                       breach_index=self.data_path('email', 'breach_index'),
+                       breach_filter=self.data_path('email', 'breach_filter'),
+                       api_keys=self.api_keys(), rate_limiter=self._component('limiter'))
+        elif name == 'phone':
+            return cls(transport=transport, cache=self.cache, prefix_index=self.prefix_index_path(),
+                       api_keys=self.api_keys(), rate_limiter=self._component('limiter'))
+        return cls(transport=transport, **self.app_config('username'))
+    
+    def is_loaded(self, name):
+        """Indique si un composant a déjà été créé"""
+        return self._components.get(name) is not None
+    
+    @property
+    def transport(self):
+        """Transport HTTP partagé par tous les modules"""
+        return self._component('transport')
+    
+    @property
+    def cache(self):
+        """Cache de résultats des fournisseurs"""
+        return self._component('cache')
+    
+    @property
+    def email_checker(self):
+        return self._component('email')
+    
+    @property
+    def phone_analyzer(self):
+        return self._component('phone')
+    
+    @property
+    def username_searcher(self):
+        return self._component('username')
+    
+    def api_keys(self):
+        """Clés d'API de config.py : une liste par fournisseur, valeurs d'exemple ignorées"""
+        keys = {}
+        if CONFIG_LOADED:
+            for provider, values in getattr(config, 'API_KEYS', {}).items():
+                if isinstance(values, str):
+                    values = [values]
+                keys[provider] = [key for key in values or [] if key and not key.startswith('VOTRE_')]
+        return keys
+    
+    def data_path(self, section, key):
+        """Chemin d'un fichier de données configuré, s'il a été construit"""
+        path = self.app_config(section).get(key)
+        return path if path and os.path.exists(path) else None
+    
+    def prefix_index_path(self):
+        """Chemin de l'index de préfixes téléphoniques s'il a été construit"""
+        return self.data_path('phone', 'prefix_index')
         
     def clear_screen(self):
         """Nettoie l'écran"""
@@ -118,7 +258,7 @@ class OSINTToolPro:
         
         email = input(Fore.YELLOW + "\n[?] " + Fore.WHITE + "Entrez l'email à analyser: ").strip()
         
-        if not "@" in email or "." not in email.split("@")[1]:
+        if not valid_email(email):
             print(Fore.RED + "❌ Format d'email invalide!")
             input(Fore.YELLOW + "\n[↩] Appuyez sur Entrée...")
             return
@@ -212,11 +352,13 @@ class OSINTToolPro:
             return
         
         full_name = f"{prenom} {nom}"
+        # Email connu : sa partie locale est la variante de username la plus probable
+        email = input(Fore.YELLOW + "[?] " + Fore.WHITE + "Email connu (optionnel): ").strip() or None
         
         print(Fore.YELLOW + f"\n🔍 Lancement de la recherche pour: {full_name}")
         print(Fore.CYAN + "═" * 50)
         
-        results = self.username_searcher.comprehensive_search(full_name, "name")
+        results = self.username_searcher.comprehensive_search(full_name, "name", email=email)
         
         # Demander si l'utilisateur veut sauvegarder
         save = input(Fore.YELLOW + "\n[?] " + Fore.WHITE + "Sauvegarder le rapport? (o/n): ").lower()
@@ -275,24 +417,32 @@ class OSINTToolPro:
         
         input(Fore.YELLOW + "\n[↩] Appuyez sur Entrée pour continuer...")
     
+    @property
+    def report_store(self):
+        """Stockage des rapports, ouvert à la première sauvegarde"""
+        return self._component('reports')
+    
     def save_report(self, target, data):
         """Sauvegarde un rapport"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"reports/report_{target}_{timestamp}.json"
         
         try:
-            os.makedirs("reports", exist_ok=True)
-            with open(filename, 'w') as f:
-                json.dump({
-                    'target': target,
-                    'date': timestamp,
-                    'tool': self.name,
-                    'version': self.version,
-                    'author': self.author,
-                    'results': data
-                }, f, indent=4)
+            if self.report_store is None:
+                raise RuntimeError("stockage des rapports indisponible")
+            report_id = self.report_store.append(
+                target, timestamp, data,
+                tool=self.name,
+                version=self.version,
+                author=self.author
+            )
             
-            print(Fore.GREEN + f"✅ Rapport sauvegardé: {filename}")
+            print(Fore.GREEN + f"✅ Rapport sauvegardé: #{report_id} ({self.report_store.root})")
+            
+            # Rapports antérieurs partageant un email, un numéro, un profil...
+            related = self.report_store.related(report_id)
+            if related:
+                print(Fore.CYAN + f"🔗 Lié à {len(related)} autre(s) rapport(s): "
+                      + ", ".join(f"#{other}" for other in list(related)[:10]))
         except Exception as e:
             print(Fore.RED + f"❌ Erreur sauvegarde: {e}")
     
@@ -308,11 +458,72 @@ class OSINTToolPro:
         print(Fore.WHITE + f"   Nom: {self.name}")
         print(Fore.WHITE + f"   Version: {self.version}")
         print(Fore.WHITE + f"   Auteur: {self.author}")
-        print(Fore.WHITE + f"   Module Email: {'✅ Chargé' if MODULES_LOADED else '❌ Erreur'}")
-        print(Fore.WHITE + f"   Module Téléphone: {'✅ Chargé' if PHONE_MODULE_LOADED else '❌ Erreur'}")
-        print(Fore.WHITE + f"   Module Recherche: {'✅ Chargé' if USERNAME_MODULE_LOADED else '❌ Erreur'}")
+        print(Fore.WHITE + f"   Module Email: {module_status('email')}")
+        print(Fore.WHITE + f"   Module Téléphone: {module_status('phone')}")
+        print(Fore.WHITE + f"   Module Recherche: {module_status('username')}")
         print(Fore.WHITE + f"   Configuration: {'✅ Chargée' if CONFIG_LOADED else '❌ Erreur'}")
         
+        # Statistiques des composants déjà chargés uniquement
+        if self.is_loaded('transport'):
+            stats = self.transport.stats()['total']
+            print(Fore.GREEN + "\n🌐 CONNEXIONS HTTP:")
+            print(Fore.CYAN + "─" * 40)
+            print(Fore.WHITE + f"   Requêtes: {stats['requests']}")
+            print(Fore.WHITE + f"   Nouvelles connexions: {stats['new_connections']}")
+            print(Fore.WHITE + f"   Connexions réutilisées: {stats['reused']}")
+            shared = sum(self._component(name).flights.stats()['shared']
+                         for name in ('email', 'phone', 'username') if self.is_loaded(name))
+            print(Fore.WHITE + f"   Requêtes identiques regroupées: {shared}")
+            
+            from modules.resilience import CLOSED
+            
+            unhealthy = {host: state for host, state in self.transport.resilience.stats().items()
+                         if state['state'] != CLOSED or state['short_circuits']}
+            if unhealthy:
+                print(Fore.GREEN + "\n🔌 HÔTES COURT-CIRCUITÉS:")
+                print(Fore.CYAN + "─" * 40)
+                for host, state in sorted(unhealthy.items()):
+                    print(Fore.WHITE + f"   • {host}: disjoncteur {state['state']}, "
+                                       f"{state['short_circuits']} requête(s) ignorée(s)")
+            
+            summary = self.transport.metrics.summary()
+            if summary:
+                print(Fore.GREEN + "\n⏱️  LATENCE PAR FOURNISSEUR:")
+                print(Fore.CYAN + "─" * 40)
+                for provider, counters in sorted(summary.items()):
+                    mean = counters['sum_seconds'] / counters['count'] * 1000 if counters['count'] else 0
+                    print(Fore.WHITE + f"   • {provider}: {counters['count']} requêtes, "
+                                       f"{mean:.0f} ms en moyenne, {counters['errors']} échec(s)")
+        
+        if self.is_loaded('cache'):
+            cache_stats = self.cache.stats()
+            total = cache_stats['total']
+            print(Fore.GREEN + "\n💾 CACHE DES RÉSULTATS:")
+            print(Fore.CYAN + "─" * 40)
+            print(Fore.WHITE + f"   Entrées: {cache_stats['memory_entries']} en mémoire, {cache_stats['disk_entries']} sur disque")
+            print(Fore.WHITE + f"   Hits: {total['memory_hits']} mémoire, {total['disk_hits']} disque")
+            print(Fore.WHITE + f"   Misses: {total['misses']}")
+            print(Fore.WHITE + f"   Taux de hits: {total['hit_rate']:.0%}")
+            for provider, counters in sorted(cache_stats['providers'].items()):
+                hits = counters['memory_hits'] + counters['disk_hits']
+                print(Fore.WHITE + f"     • {provider}: {hits} hits / {counters['misses']} misses")
+        
+        if self.is_loaded('limiter'):
+            print(Fore.GREEN + "\n🚦 LIMITES DE DÉBIT:")
+            print(Fore.CYAN + "─" * 40)
+            for provider, counters in sorted(self._component('limiter').stats().items()):
+                print(Fore.WHITE + f"   • {provider}: {counters['calls']} appels, {counters['keys']} clé(s), "
+                                   f"{counters['throttled']} refus 429, {counters['requeued']} remis en file, "
+                                   f"{counters['waited']:.1f} s d'attente")
+        
+        if self.is_loaded('email') and self.email_checker.breach_filter is not None:
+            filter_stats = self.email_checker.filter_stats
+            print(Fore.GREEN + "\n🧮 FILTRE DES FUITES:")
+            print(Fore.CYAN + "─" * 40)
+            print(Fore.WHITE + f"   Adresses vérifiées: {filter_stats['checked']}")
+            print(Fore.WHITE + f"   Appels évités: {filter_stats['skipped']}")
+            print(Fore.WHITE + f"   Faux positifs: {filter_stats['false_positives']} / {filter_stats['passed']} transmises")
+        
         print(Fore.YELLOW + "\n🔑 CONFIGURATION DES APIs:")
         print(Fore.CYAN + "─" * 40)
         print(Fore.WHITE + "   Pour améliorer les fonctionnalités:")
@@ -328,6 +539,316 @@ class OSINTToolPro:
         
         input(Fore.YELLOW + "\n[↩] Appuyez sur Entrée pour continuer...")
     
+    def export_metrics(self, path):
+        """Écrit les métriques HTTP (Prometheus, ou JSON si path finit par .json)"""
+        from modules.metrics import METRICS
+        
+        metrics = self.transport.metrics if self.is_loaded('transport') else METRICS
+        metrics.export(path)
+    
+    def batch_results(self, target_type, targets, workers=8, processes=0):
+        """Analyse un flux de cibles et produit des tuples (cible, résultats)"""
+        if target_type == 'phone' and processes:
+            # Validation et enrichissement multi-cœurs, sans liens de recherche
+            if not self.phone_analyzer:
+                raise RuntimeError("Module téléphone non chargé")
+            fields = ('formatted', 'national', 'e164')
+            for item in self.phone_analyzer.bulk_validate(targets, fields=fields, processes=processes):
+                yield item.pop('input'), item
+            return
+        
+        if target_type == 'email':
+            if not self.email_checker:
+                raise RuntimeError("Module email non chargé")
+            # Les adresses mal formées ne sont pas envoyées aux fournisseurs
+            invalid = deque()
+            
+            def valid_targets():
+                for target in targets:
+                    if valid_email(target):
+                        yield target
+                    else:
+                        invalid.append(target)
+            
+            for item in self.email_checker.bulk_check(valid_targets(), max_workers=workers):
+                while invalid:
+                    yield invalid.popleft(), {"error": "Format d'email invalide"}
+                yield item.pop('email'), item
+            while invalid:
+                yield invalid.popleft(), {"error": "Format d'email invalide"}
+            return
+        
+        if target_type == 'phone':
+            if not self.phone_analyzer:
+                raise RuntimeError("Module téléphone non chargé")
+            analyze = self.phone_analyzer.collect
+        else:
+            if not self.username_searcher:
+                raise RuntimeError("Module recherche non chargé")
+            analyze = lambda target: self.username_searcher.collect(target, target_type)
+        
+        from modules.probe_engine import stream_map
+        
+        for target, results in stream_map(analyze, targets, max_workers=workers):
+            if isinstance(results, Exception):
+                results = {"error": str(results)}
+            yield target, results
+    
+    def run_batch(self, target_type, input_path="-", output_path="-", workers=8, processes=0):
+        """Mode non interactif : une ligne JSON par cible, sans affichage terminal"""
+        source = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+        sink = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8")
+        targets = (line.strip() for line in source if line.strip())
+        count = 0
+        
+        try:
+            for target, results in self.batch_results(target_type, targets, workers, processes):
+                sink.write(json.dumps({
+                    'type': target_type,
+                    'target': target,
+                    'date': datetime.now().strftime("%Y%m%d_%H%M%S"),
+                    'results': results
+                }, ensure_ascii=False, default=str) + "\n")
+                count += 1
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sink is not sys.stdout:
+                sink.close()
+            else:
+                sink.flush()
+        
+        return count
+    
+    def run_phone_export(self, input_path="-", output_path="-", output_format="csv", processes=0):
+        """Validation en masse de numéros, stockée par colonnes puis exportée en CSV ou Parquet"""
+        if not self.phone_analyzer:
+            raise RuntimeError("Module téléphone non chargé")
+        if output_format == "parquet" and output_path == "-":
+            raise ValueError("L'export Parquet demande un fichier de sortie (--output)")
+        if output_format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            raise RuntimeError("Export Parquet indisponible: pip install pyarrow")
+        
+        source = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+        try:
+            targets = (line.strip() for line in source if line.strip())
+            batch = self.phone_analyzer.bulk_columns(targets, processes=processes or None)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        
+        if output_format == "parquet":
+            return batch.to_parquet(output_path)
+        
+        sink = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8", newline="")
+        try:
+            return batch.to_csv(sink)
+        finally:
+            if sink is not sys.stdout:
+                sink.close()
+            else:
+                sink.flush()
+    
+    def app_stats(self):
+        """Statistiques des composants déjà chargés (transport, cache, regroupement)"""
+        stats = {}
+        if self.is_loaded('transport'):
+            stats['http'] = self.transport.stats()['total']
+        if self.is_loaded('cache'):
+            stats['cache'] = self.cache.stats()['total']
+        if self.is_loaded('limiter'):
+            stats['rate_limits'] = self._component('limiter').stats()
+        for name in ('email', 'phone', 'username'):
+            component = self._components.get(name)
+            if component is not None:
+                stats.setdefault('single_flight', {})[name] = component.flights.stats()
+        return stats
+    
+    def run_service(self, host=None, port=None):
+        """Mode service : analyseurs chargés une fois et exposés en HTTP/JSON"""
+        from modules.service import OSINTService
+        
+        config = self.app_config('service')
+        host = host or config.get('host', '127.0.0.1')
+        port = port if port is not None else config.get('port', 8770)
+        
+        start = time.perf_counter()
+        service = OSINTService(
+            email_checker=self.email_checker,
+            phone_analyzer=self.phone_analyzer,
+            username_searcher=self.username_searcher,
+            report_store=self.report_store,
+            metrics=self.transport.metrics if self.transport else None,
+            stats=self.app_stats,
+            token=config.get('token')
+        )
+        service.warm_up()
+        host, port = service.start(host, port)
+        print(f"Service prêt en {(time.perf_counter() - start) * 1000:.0f} ms: http://{host}:{port}", file=sys.stderr)
+        try:
+            service.serve_forever()
+        finally:
+            service.shutdown()
+    
+    def job_providers(self, target_type):
+        """Fournisseurs d'un lot persistant : {nom: fonction(cible)}"""
+        if target_type == 'email':
+            checker = self.email_checker
+            if not checker:
+                raise RuntimeError("Module email non chargé")
+            providers = {'hibp': checker.check_hibp, 'reputation': checker.check_emailrep}
+            # Sans clé, Hunter échouerait à chaque reprise
+            if checker.hunter_api_key:
+                providers['hunter'] = checker.check_hunter
+            return providers
+        if target_type == 'phone':
+            if not self.phone_analyzer:
+                raise RuntimeError("Module téléphone non chargé")
+            return {'phone': self.phone_analyzer.collect}
+        if not self.username_searcher:
+            raise RuntimeError("Module recherche non chargé")
+        return {target_type: lambda target: self.username_searcher.collect(target, target_type)}
+    
+    def run_jobs(self, action, job_id=None, target_type=None, input_path="-", output_path="-", workers=8):
+        """Lots persistants : submit, run (reprise comprise), status, export"""
+        queue = self._component('jobs')
+        if queue is None:
+            raise RuntimeError("file de travaux indisponible")
+        
+        if action == 'submit':
+            source = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+            try:
+                return queue.submit(target_type, source, self.job_providers(target_type))
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+        
+        if action == 'status':
+            jobs = [queue.job(job_id)] if job_id else queue.jobs()
+            for job in jobs:
+                if job is None:
+                    raise RuntimeError(f"lot #{job_id} introuvable")
+                print(json.dumps(dict(job, **queue.status(job['id'])), ensure_ascii=False))
+            return len(jobs)
+        
+        job = queue.job(job_id)
+        if job is None:
+            raise RuntimeError(f"lot #{job_id} introuvable")
+        if action == 'run':
+            providers = self.job_providers(job['type'])
+            missing = set(job['providers']) - set(providers)
+            if missing:
+                raise RuntimeError(f"fournisseurs indisponibles: {', '.join(sorted(missing))}")
+            # Cibles déjà écrites par une exécution interrompue avant d'être marquées
+            written = self.written_seqs(output_path, job_id)
+            queue.mark_emitted(job_id, written)
+            refresh = self.job_refresh if job['type'] == 'email' else None
+            items = queue.run(job_id, providers, workers, refresh)
+        else:
+            written = set()
+            items = queue.results(job_id)
+        
+        sink = sys.stdout if output_path == "-" else open(output_path, "a" if action == 'run' else "w", encoding="utf-8")
+        count = 0
+        try:
+            for seq, target, results in items:
+                if seq in written:
+                    continue
+                # Un seul fournisseur : même forme de résultat que le mode batch
+                if job['type'] != 'email' and len(results) == 1:
+                    results = next(iter(results.values()))
+                sink.write(json.dumps({
+                    'job': job_id,
+                    'seq': seq,
+                    'type': job['type'],
+                    'target': target,
+                    'date': datetime.now().strftime("%Y%m%d_%H%M%S"),
+                    'results': results
+                }, ensure_ascii=False, default=str) + "\n")
+                # Sur disque avant que run() ne marque la cible produite
+                sink.flush()
+                if sink is not sys.stdout:
+                    os.fsync(sink.fileno())
+                count += 1
+        finally:
+            if sink is not sys.stdout:
+                sink.close()
+            else:
+                sink.flush()
+        return count
+    
+    def written_seqs(self, output_path, job_id):
+        """Numéros des cibles d'un lot déjà présentes dans un fichier de sortie JSONL"""
+        seqs = set()
+        if output_path == "-" or not os.path.exists(output_path):
+            return seqs
+        with open(output_path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par une interruption
+                    continue
+                if isinstance(entry, dict) and entry.get('job') == job_id and 'seq' in entry:
+                    seqs.add(entry['seq'])
+        return seqs
+    
+    def job_refresh(self, provider, target):
+        """Avant une nouvelle tentative, oublie la réponse en cache pour forcer l'appel réseau"""
+        self.email_checker.forget(JOB_CACHE_PROVIDERS.get(provider, provider), target)
+    
+    def run_watch(self, action, target_type=None, input_path="-", output_path="-", force=False):
+        """Gère la liste de surveillance ; 'run' écrit une ligne JSON par cible ayant changé"""
+        watchlist = self._component('watchlist')
+        if watchlist is None:
+            raise RuntimeError("surveillance indisponible")
+        
+        if action in ('add', 'remove'):
+            source = sys.stdin if input_path == "-" else open(input_path, encoding="utf-8")
+            try:
+                targets = [line.strip() for line in source if line.strip()]
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+            if action == 'add':
+                return watchlist.add(target_type, targets)
+            return watchlist.remove(target_type, targets)
+        
+        if action == 'list':
+            targets = watchlist.targets(target_type)
+            for kind, target, checked in targets:
+                print(json.dumps({'type': kind, 'target': target, 'checked': checked}, ensure_ascii=False))
+            return len(targets)
+        
+        sink = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8")
+        count = 0
+        try:
+            for delta in watchlist.run(target_type, force):
+                delta['date'] = datetime.now().strftime("%Y%m%d_%H%M%S")
+                sink.write(json.dumps(delta, ensure_ascii=False) + "\n")
+                count += 1
+        finally:
+            if sink is not sys.stdout:
+                sink.close()
+            else:
+                sink.flush()
+        return count
+    
+    def run_correlate(self, kind, value, limit=None, reindex=False):
+        """Liste les rapports mentionnant un élément, une ligne JSON par rapport"""
+        store = self.report_store
+        if store is None:
+            raise RuntimeError("stockage des rapports indisponible")
+        if reindex:
+            print(f"{store.reindex()} rapport(s) réindexé(s)", file=sys.stderr)
+        if kind is None:
+            return 0
+        
+        reports = store.mentions(kind, value, limit)
+        for report_id, target, date in reports:
+            print(json.dumps({'id': report_id, 'target': target, 'date': date}, ensure_ascii=False))
+        return len(reports)
+    
     def run(self):
         """Fonction principale"""
         while True:
@@ -365,8 +886,155 @@ class OSINTToolPro:
                 print(Fore.RED + f"\n❌ Erreur: {e}")
                 time.sleep(2)
 
+def parse_args(argv):
+    """Analyse les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="OSINT Tool Pro by Dvrk_Smith")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Affiche le coût d'import de chaque module (seul : mesure tous les modules)")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    batch = subparsers.add_parser("batch", help="Analyse non interactive d'une liste de cibles")
+    batch.add_argument("--type", required=True, choices=["email", "phone", "username", "name"],
+                       help="Type des cibles")
+    batch.add_argument("--input", default="-", help="Fichier de cibles, une par ligne (- pour stdin)")
+    batch.add_argument("--output", default="-", help="Fichier JSON Lines de sortie (- pour stdout)")
+    batch.add_argument("--workers", type=int, default=8, help="Cibles analysées en parallèle")
+    batch.add_argument("--processes", type=int, default=0,
+                       help="Type phone : validation en masse sur N processus (0 = désactivé)")
+    batch.add_argument("--format", default="jsonl", choices=["jsonl", "csv", "parquet"],
+                       help="Format de sortie ; csv et parquet : type phone, stockage par colonnes")
+    batch.add_argument("--metrics-out",
+                       help="Écrit les métriques HTTP en fin de lot (Prometheus, ou JSON si .json)")
+    
+    jobs = subparsers.add_parser("jobs", help="Lots persistants, repris là où ils s'étaient arrêtés")
+    jobs.add_argument("action", choices=["submit", "run", "status", "export"],
+                      help="submit : enregistre les cibles ; run : exécute ou reprend un lot ; export : tous les résultats")
+    jobs.add_argument("job", nargs="?", type=int, help="Identifiant du lot (run, status, export)")
+    jobs.add_argument("--type", choices=["email", "phone", "username", "name"], help="Type des cibles (submit)")
+    jobs.add_argument("--input", default="-", help="Fichier de cibles, une par ligne (- pour stdin)")
+    jobs.add_argument("--output", default="-",
+                      help="Fichier JSON Lines (- pour stdout) ; run y ajoute les cibles terminées")
+    jobs.add_argument("--workers", type=int, default=8, help="Appels de fournisseurs en parallèle")
+    
+    serve = subparsers.add_parser("serve", help="Service HTTP/JSON local avec analyseurs préchargés")
+    serve.add_argument("--host", help="Adresse d'écoute (défaut : APP_CONFIG['service'] ou 127.0.0.1)")
+    serve.add_argument("--port", type=int, help="Port d'écoute (défaut : APP_CONFIG['service'] ou 8770)")
+    
+    watch = subparsers.add_parser("watch", help="Surveillance quotidienne : seules les différences sont écrites")
+    watch.add_argument("action", choices=["add", "remove", "list", "run"],
+                       help="add/remove : cibles lues depuis --input ; run : vérifie les cibles échues")
+    watch.add_argument("--type", choices=["email", "username"], help="Type des cibles (obligatoire pour add/remove)")
+    watch.add_argument("--input", default="-", help="Fichier de cibles, une par ligne (- pour stdin)")
+    watch.add_argument("--output", default="-", help="Fichier JSON Lines des changements (- pour stdout)")
+    watch.add_argument("--force", action="store_true", help="Vérifie aussi les cibles vérifiées récemment")
+    
+    correlate = subparsers.add_parser("correlate", help="Rapports mentionnant un email, un numéro, une fuite...")
+    terms = correlate.add_mutually_exclusive_group()
+    for kind in ("email", "phone", "username", "breach", "profile", "name"):
+        terms.add_argument(f"--{kind}", dest="term", metavar="VALEUR", type=lambda value, kind=kind: (kind, value),
+                           help=f"Élément recherché (type {kind})")
+    correlate.add_argument("--limit", type=int, help="Nombre maximal de rapports")
+    correlate.add_argument("--reindex", action="store_true",
+                           help="Reconstruit l'index depuis les rapports existants")
+    
+    return parser.parse_args(argv)
+
 def main():
     """Point d'entrée principal"""
+    args = parse_args(sys.argv[1:])
+    
+    if args.startup_profile and not args.command:
+        # Mesure le coût de chaque module sans lancer le menu
+        for name in LAZY_MODULES:
+            load_class(name)
+        print_startup_profile(sys.stdout)
+        return
+    
+    if args.command == "batch":
+        app = None
+        try:
+            app = OSINTToolPro()
+            if args.format != "jsonl":
+                if args.type != "phone":
+                    raise ValueError("Les formats csv et parquet sont réservés au type phone")
+                count = app.run_phone_export(args.input, args.output, args.format, args.processes)
+            else:
+                count = app.run_batch(args.type, args.input, args.output, args.workers, args.processes)
+            print(f"{count} cible(s) analysée(s)", file=sys.stderr)
+        except KeyboardInterrupt:
+            print("Interruption par l'utilisateur", file=sys.stderr)
+            sys.exit(130)
+        except Exception as e:
+            print(f"Erreur fatale: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if app and args.metrics_out:
+                app.export_metrics(args.metrics_out)
+            if args.startup_profile:
+                print_startup_profile()
+        return
+    
+    if args.command == "jobs":
+        if args.action == "submit" and not args.type:
+            print("--type est obligatoire pour submit", file=sys.stderr)
+            sys.exit(2)
+        if args.action in ("run", "export") and args.job is None:
+            print("Indiquez l'identifiant du lot", file=sys.stderr)
+            sys.exit(2)
+        try:
+            count = OSINTToolPro().run_jobs(args.action, args.job, args.type, args.input, args.output, args.workers)
+            labels = {'submit': "lot enregistré: #", 'run': "cible(s) terminée(s): ",
+                      'status': "lot(s): ", 'export': "cible(s) exportée(s): "}
+            print(f"{labels[args.action]}{count}", file=sys.stderr)
+        except KeyboardInterrupt:
+            # Les résultats déjà reçus sont enregistrés : 'jobs run' reprendra la suite
+            print(f"Interrompu ; reprise avec: python3 main.py jobs run {args.job}", file=sys.stderr)
+            sys.exit(130)
+        except Exception as e:
+            print(f"Erreur fatale: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
+    if args.command == "serve":
+        try:
+            OSINTToolPro().run_service(args.host, args.port)
+        except KeyboardInterrupt:
+            print("Service arrêté", file=sys.stderr)
+        except Exception as e:
+            print(f"Erreur fatale: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
+    if args.command == "watch":
+        if args.action in ("add", "remove") and not args.type:
+            print("--type est obligatoire pour add/remove", file=sys.stderr)
+            sys.exit(2)
+        try:
+            count = OSINTToolPro().run_watch(args.action, args.type, args.input, args.output, args.force)
+            labels = {'add': "cible(s) ajoutée(s)", 'remove': "cible(s) retirée(s)",
+                      'list': "cible(s) surveillée(s)", 'run': "cible(s) modifiée(s)"}
+            print(f"{count} {labels[args.action]}", file=sys.stderr)
+        except KeyboardInterrupt:
+            print("Interruption par l'utilisateur", file=sys.stderr)
+            sys.exit(130)
+        except Exception as e:
+            print(f"Erreur fatale: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
+    if args.command == "correlate":
+        if args.term is None and not args.reindex:
+            print("Indiquez un élément (--email, --phone, --breach...) ou --reindex", file=sys.stderr)
+            sys.exit(2)
+        try:
+            kind, value = args.term or (None, None)
+            count = OSINTToolPro().run_correlate(kind, value, args.limit, args.reindex)
+            print(f"{count} rapport(s)", file=sys.stderr)
+        except Exception as e:
+            print(f"Erreur fatale: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+    
     try:
         app = OSINTToolPro()
         app.run()
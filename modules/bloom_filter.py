@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Filtre de Bloom des adresses connues dans des fuites
+by Dvrk_Smith
+
+    python3 -m modules.bloom_filter data/breached.bloom --index data/breaches.idx
+    python3 -m modules.bloom_filter data/breached.bloom --fp-rate 0.001 adresses.txt ...
+"""
+
+import math
+import struct
+import argparse
+
+from modules.breach_index import BreachIndex, hash_email
+
+# En-tête : magic, version, fonctions de hachage, bits, éléments ajoutés, taux de faux positifs visé
+HEADER = struct.Struct("<4sHHQQd")
+MAGIC = b"OTBF"
+VERSION = 1
+
+class BloomFilter:
+    def __init__(self, capacity, fp_rate=0.001):
+        if capacity < 1 or not 0 < fp_rate < 1:
+            raise ValueError("Filtre de Bloom: capacité ou taux de faux positifs invalide")
+        self.fp_rate = fp_rate
+        self.bits = max(int(math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2)), 8)
+        self.hashes = max(int(round(self.bits / capacity * math.log(2))), 1)
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, digest):
+        """Positions des bits d'une empreinte (double hachage de Kirsch-Mitzenmacher)"""
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+    def add_digest(self, digest):
+        """Ajoute une empreinte (hash_email)"""
+        array = self._array
+        for position in self._positions(digest):
+            array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def add(self, email):
+        """Ajoute une adresse"""
+        self.add_digest(hash_email(email))
+
+    def might_contain(self, email):
+        """False : adresse certainement absente ; True : probablement présente"""
+        array = self._array
+        for position in self._positions(hash_email(email)):
+            if not array[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    __contains__ = might_contain
+
+    def estimated_fp_rate(self):
+        """Taux de faux positifs attendu pour le nombre d'éléments ajoutés"""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def save(self, path):
+        """Écrit le filtre (en-tête + tableau de bits)"""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.hashes, self.bits, self.count, self.fp_rate))
+            f.write(self._array)
+
+    @classmethod
+    def load(cls, path):
+        """Relit un filtre écrit par save()"""
+        with open(path, "rb") as f:
+            magic, version, hashes, bits, count, fp_rate = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"Fichier de filtre invalide: {path}")
+            bloom = cls.__new__(cls)
+            bloom.fp_rate, bloom.hashes, bloom.bits, bloom.count = fp_rate, hashes, bits, count
+            bloom._array = bytearray(f.read())
+        if len(bloom._array) != (bits + 7) // 8:
+            raise ValueError(f"Fichier de filtre tronqué: {path}")
+        return bloom
+
+    @classmethod
+    def from_index(cls, index, fp_rate=0.001):
+        """Filtre de toutes les adresses d'un index de fuites"""
+        bloom = cls(max(index.count, 1), fp_rate)
+        for digest in index.digests():
+            bloom.add_digest(digest)
+        return bloom
+
+    @classmethod
+    def from_emails(cls, emails, capacity, fp_rate=0.001):
+        """Filtre d'une liste d'adresses"""
+        bloom = cls(capacity, fp_rate)
+        for email in emails:
+            bloom.add(email)
+        return bloom
+
+def _read_emails(paths):
+    """Adresses des fichiers texte, une par ligne"""
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                email = line.strip()
+                if "@" in email:
+                    yield email
+
+# Construction en ligne de commande
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construit un filtre de Bloom d'adresses compromises")
+    parser.add_argument("output", help="Fichier du filtre à écrire")
+    parser.add_argument("emails", nargs="*", help="Fichiers d'adresses, une par ligne")
+    parser.add_argument("--index", help="Index de fuites (modules.breach_index) à reprendre")
+    parser.add_argument("--fp-rate", type=float, default=0.001, help="Taux de faux positifs visé")
+    args = parser.parse_args()
+
+    if args.index:
+        index = BreachIndex(args.index)
+        bloom = BloomFilter.from_index(index, args.fp_rate)
+        index.close()
+    elif args.emails:
+        capacity = sum(1 for _ in _read_emails(args.emails))
+        bloom = BloomFilter.from_emails(_read_emails(args.emails), max(capacity, 1), args.fp_rate)
+    else:
+        parser.error("indiquez --index ou des fichiers d'adresses")
+
+    bloom.save(args.output)
+    print(f"Filtre construit: {args.output} ({bloom.count} adresses, {len(bloom._array) / 1e6:.1f} Mo, "
+          f"{bloom.hashes} hachages, faux positifs ≈ {bloom.estimated_fp_rate():.4%})")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Index hors ligne des fuites de données (recherche binaire sur fichier projeté)
+by Dvrk_Smith
+
+Construction depuis un manifeste JSON des corpus détenus :
+
+    [{"Name": "Adobe", "BreachDate": "2013-10-04", "PwnCount": 152445165,
+      "files": ["corpus/adobe.txt"]}, ...]
+
+    python3 -m modules.breach_index data/breaches.idx manifeste.json
+"""
+
+import os
+import sys
+import mmap
+import json
+import heapq
+import struct
+import shutil
+import hashlib
+import tempfile
+
+from modules.normalize import normalize_email
+
+# En-tête : magic, version, enregistrements, ensembles de fuites, taille des métadonnées
+HEADER = struct.Struct("<4sHQII")
+MAGIC = b"OTBX"
+VERSION = 1
+# Enregistrement : empreinte tronquée de l'email + identifiant d'ensemble de fuites
+HASH_SIZE = 16
+RECORD = struct.Struct(f"<{HASH_SIZE}sI")
+# Table d'accès direct sur les deux premiers octets de l'empreinte
+FANOUT = 1 << 16
+FANOUT_TABLE = struct.Struct(f"<{FANOUT + 1}Q")
+# Enregistrements triés en mémoire avant d'être écrits en run temporaire
+RUN_SIZE = 1000000
+# Enregistrement des runs : empreinte + identifiant de fuite (gros-boutiste, triable tel quel)
+RUN_RECORD_SIZE = HASH_SIZE + 4
+
+def hash_email(email):
+    """Empreinte SHA-256 tronquée de l'email normalisé"""
+    return hashlib.sha256(normalize_email(email).encode("utf-8")).digest()[:HASH_SIZE]
+
+def _emails(path):
+    """Emails d'un fichier de corpus (premier champ de chaque ligne)"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            for separator in (":", ";", ",", "\t"):
+                line = line.split(separator, 1)[0]
+            email = line.strip()
+            if "@" in email:
+                yield email
+
+def _read_run(path):
+    """Relit un run trié enregistrement par enregistrement"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(RUN_RECORD_SIZE * 4096)
+            if not chunk:
+                return
+            for offset in range(0, len(chunk), RUN_RECORD_SIZE):
+                yield chunk[offset:offset + RUN_RECORD_SIZE]
+
+class BreachIndex:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, sets, meta_size = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Fichier d'index invalide: {path}")
+        self.count = count
+
+        self._fanout = FANOUT_TABLE.unpack_from(self._map, HEADER.size)
+        self._records = HEADER.size + FANOUT_TABLE.size
+        meta_offset = self._records + count * RECORD.size
+        meta = json.loads(self._map[meta_offset:meta_offset + meta_size])
+        self.breaches = meta["breaches"]
+        self._sets = meta["sets"]
+
+    def _find(self, digest):
+        """Identifiant d'ensemble de fuites d'une empreinte, ou None"""
+        prefix = int.from_bytes(digest[:2], "big")
+        lo, hi = self._fanout[prefix], self._fanout[prefix + 1]
+        data, base, size = self._map, self._records, RECORD.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = base + mid * size
+            found = data[offset:offset + HASH_SIZE]
+            if found < digest:
+                lo = mid + 1
+            elif found > digest:
+                hi = mid
+            else:
+                return RECORD.unpack_from(data, offset)[1]
+        return None
+
+    def lookup(self, email):
+        """Fuites contenant l'email (liste vide si absent)"""
+        set_id = self._find(hash_email(email))
+        if set_id is None:
+            return []
+        return [self.breaches[i] for i in self._sets[set_id]]
+
+    def check(self, email):
+        """Même forme de résultat que l'API Have I Been Pwned"""
+        breaches = self.lookup(email)
+        return {"breached": bool(breaches), "breaches": breaches, "breach_count": len(breaches)}
+
+    def __contains__(self, email):
+        return self._find(hash_email(email)) is not None
+
+    def digests(self):
+        """Parcourt toutes les empreintes dans l'ordre"""
+        for i in range(self.count):
+            offset = self._records + i * RECORD.size
+            yield self._map[offset:offset + HASH_SIZE]
+
+    def close(self):
+        """Libère la projection mémoire"""
+        self._map.close()
+        self._file.close()
+
+    @classmethod
+    def build(cls, path, breaches, run_size=RUN_SIZE):
+        """Construit l'index par tri externe
+
+        breaches : liste de dicts de métadonnées (format HIBP) avec une clé
+        "files" listant les fichiers de corpus de chaque fuite. Les corpus
+        sont lus en flux et triés par runs de run_size enregistrements :
+        la mémoire utilisée ne dépend pas de leur taille.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        work = tempfile.mkdtemp(dir=directory or None)
+        runs = []
+
+        def flush(records):
+            records.sort()
+            run_path = os.path.join(work, f"run_{len(runs):05d}")
+            with open(run_path, "wb") as f:
+                f.write(b"".join(records))
+            runs.append(run_path)
+            records.clear()
+
+        metadata = []
+        records = []
+        tmp_path = path + ".tmp"
+        readers = []
+        try:
+            for breach_id, breach in enumerate(breaches):
+                metadata.append({key: value for key, value in breach.items() if key != "files"})
+                suffix = breach_id.to_bytes(4, "big")
+                for corpus in breach.get("files", []):
+                    for email in _emails(corpus):
+                        records.append(hash_email(email) + suffix)
+                        if len(records) >= run_size:
+                            flush(records)
+            if records:
+                flush(records)
+
+            readers = [_read_run(run) for run in runs]
+            cls._merge(tmp_path, readers, metadata)
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Échec (ou interruption) : pas de fichier final partiel
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            for reader in readers:
+                reader.close()
+            # Runs écrits ou à moitié écrits
+            shutil.rmtree(work, ignore_errors=True)
+
+        return cls(path)
+
+    @staticmethod
+    def _merge(path, runs, metadata):
+        """Fusionne les runs triés, regroupe les doublons et écrit le fichier final"""
+        set_ids = {}
+        fanout = [0] * (FANOUT + 1)
+        count = 0
+
+        with open(path, "wb") as f:
+            # En-tête et table d'accès réécrits une fois les comptes connus
+            f.write(b"\0" * (HEADER.size + FANOUT_TABLE.size))
+            buffer = []
+
+            def emit(digest, breach_ids):
+                key = tuple(sorted(breach_ids))
+                set_id = set_ids.setdefault(key, len(set_ids))
+                buffer.append(RECORD.pack(digest, set_id))
+                fanout[int.from_bytes(digest[:2], "big") + 1] += 1
+                if len(buffer) >= 4096:
+                    f.write(b"".join(buffer))
+                    buffer.clear()
+
+            current, breach_ids = None, set()
+            for record in heapq.merge(*runs):
+                digest, breach_id = record[:HASH_SIZE], int.from_bytes(record[HASH_SIZE:], "big")
+                if digest != current:
+                    if current is not None:
+                        emit(current, breach_ids)
+                        count += 1
+                    current, breach_ids = digest, set()
+                breach_ids.add(breach_id)
+            if current is not None:
+                emit(current, breach_ids)
+                count += 1
+            f.write(b"".join(buffer))
+
+            sets = [list(key) for key, _ in sorted(set_ids.items(), key=lambda item: item[1])]
+            meta = json.dumps({"breaches": metadata, "sets": sets}, ensure_ascii=False).encode("utf-8")
+            f.write(meta)
+
+            for i in range(FANOUT):
+                fanout[i + 1] += fanout[i]
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, count, len(sets), len(meta)))
+            f.write(FANOUT_TABLE.pack(*fanout))
+
+# Construction en ligne de commande
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python3 -m modules.breach_index <index> <manifeste.json>")
+        sys.exit(1)
+    with open(sys.argv[2], "r", encoding="utf-8") as manifest:
+        entries = json.load(manifest)
+    # Chemins des corpus relatifs au manifeste
+    base = os.path.dirname(os.path.abspath(sys.argv[2]))
+    for entry in entries:
+        entry["files"] = [os.path.join(base, name) for name in entry.get("files", [])]
+    index = BreachIndex.build(sys.argv[1], entries)
+    print(f"Index construit: {sys.argv[1]} ({index.count} adresses, {len(index.breaches)} fuites)")
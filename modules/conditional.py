@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Requêtes conditionnelles (ETag / Last-Modified) et résultats revalidés
+by Dvrk_Smith
+"""
+
+import os
+import json
+import sqlite3
+import threading
+
+class ConditionalStore:
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        # Sans chemin, les validateurs ne sont gardés qu'en mémoire
+        self._memory = {}
+        self._db = None
+        self._stats = {'conditional': 0, 'not_modified': 0, 'stored': 0}
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS validators (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    value TEXT NOT NULL
+                )
+            """)
+            self._db.commit()
+
+    def _entry(self, url):
+        """(etag, last_modified, valeur) mémorisés pour une URL (verrou déjà pris)"""
+        if self._db is None:
+            return self._memory.get(url)
+        row = self._db.execute(
+            "SELECT etag, last_modified, value FROM validators WHERE url = ?", (url,)
+        ).fetchone()
+        return (row[0], row[1], json.loads(row[2])) if row else None
+
+    def headers(self, url):
+        """En-têtes conditionnels d'une URL déjà vue (dict vide sinon)"""
+        with self._lock:
+            entry = self._entry(url)
+            if entry is None:
+                return {}
+            self._stats['conditional'] += 1
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def not_modified(self, url):
+        """Résultat mémorisé d'une URL ayant répondu 304"""
+        with self._lock:
+            entry = self._entry(url)
+            self._stats['not_modified'] += 1
+        return entry[2] if entry else None
+
+    def remember(self, url, response, value):
+        """Mémorise le résultat d'une réponse portant un ETag ou un Last-Modified"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._stats['stored'] += 1
+            if self._db is None:
+                self._memory[url] = (etag, last_modified, value)
+            else:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO validators (url, etag, last_modified, value) VALUES (?, ?, ?, ?)",
+                    (url, etag, last_modified, json.dumps(value))
+                )
+                self._db.commit()
+
+    def stats(self):
+        """Requêtes conditionnelles envoyées, réponses 304 et validateurs enregistrés"""
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        """Ferme la base SQLite"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
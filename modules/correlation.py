@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Extraction des éléments corrélables d'un rapport (emails, numéros, usernames, fuites, profils)
+by Dvrk_Smith
+"""
+
+import re
+
+from modules.normalize import normalize_email, normalize_phone, normalize_username
+
+EMAIL = "email"
+PHONE = "phone"
+USERNAME = "username"
+BREACH = "breach"
+PROFILE = "profile"
+NAME = "name"
+KINDS = (EMAIL, PHONE, USERNAME, BREACH, PROFILE, NAME)
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Champs des résultats contenant un numéro au format international
+PHONE_FIELDS = ("formatted", "international_format")
+# Préfixes des cibles de rapport posés par le menu (voir main.save_report)
+TARGET_PREFIXES = (("phone_search_", PHONE), ("phone_", PHONE), ("username_", USERNAME), ("name_", NAME))
+
+def to_e164(phone_number, region="FR"):
+    """Numéro au format E.164, ou None s'il n'est pas interprétable"""
+    try:
+        import phonenumbers
+    except ImportError:
+        phone = normalize_phone(phone_number)
+        return phone if phone.startswith("+") else None
+    try:
+        parsed = phonenumbers.parse(phone_number, region)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_possible_number(parsed):
+        return None
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+def normalize_term(kind, value):
+    """Forme canonique d'une valeur indexée, ou None si elle est vide ou invalide"""
+    value = str(value).strip()
+    if not value:
+        return None
+    if kind == EMAIL:
+        return normalize_email(value)
+    if kind == PHONE:
+        return to_e164(value)
+    if kind in (USERNAME, NAME):
+        return normalize_username(value)
+    if kind == PROFILE:
+        return value.rstrip("/")
+    return value
+
+def _target_terms(target):
+    """Éléments déduits de la cible d'un rapport"""
+    for prefix, kind in TARGET_PREFIXES:
+        if target.startswith(prefix):
+            return [(kind, target[len(prefix):])]
+    if "@" in target:
+        return [(EMAIL, target)]
+    return []
+
+def _walk(node, terms, key=None):
+    """Parcourt les résultats et relève les éléments corrélables"""
+    if isinstance(node, dict):
+        # Résultat de sonde d'un site : seuls les profils trouvés comptent
+        if "available" in node and "url" in node:
+            if node["available"] is False:
+                terms.append((PROFILE, node["url"]))
+            return
+        if key == "username_variants":
+            for variant, sites in node.items():
+                if any(isinstance(site, dict) and site.get("available") is False for site in sites.values()):
+                    terms.append((USERNAME, variant))
+        for name, value in node.items():
+            _walk(value, terms, name)
+    elif isinstance(node, list):
+        for item in node:
+            if key == "breaches" and isinstance(item, dict) and item.get("Name"):
+                terms.append((BREACH, item["Name"]))
+            else:
+                _walk(item, terms, key)
+    elif isinstance(node, str):
+        if key in PHONE_FIELDS and node.startswith("+"):
+            terms.append((PHONE, node))
+        elif "@" in node:
+            terms.extend((EMAIL, email) for email in EMAIL_PATTERN.findall(node))
+
+def extract_terms(target, results):
+    """Ensemble trié des (type, valeur normalisée) mentionnés par un rapport"""
+    terms = _target_terms(target)
+    _walk(results, terms)
+    normalized = set()
+    for kind, value in terms:
+        value = normalize_term(kind, value)
+        if value:
+            normalized.add((kind, value))
+    return sorted(normalized)
@@ -4,46 +4,156 @@ Module de vérification d'emails
 by Dvrk_Smith
 """
 
-import requests
-import hashlib
 import json
 import time
-from colorama import Fore, Style
+import threading
+from itertools import count
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from modules.http_transport import get_default_transport
+from modules.resilience import CircuitOpenError, skipped_result
+from modules.normalize import normalize_email
+from modules.breach_index import BreachIndex
+from modules.bloom_filter import BloomFilter
+from modules.singleflight import SingleFlight
+from modules.rate_limiter import RateLimiter
+from modules.results import EmailResult
+from modules.renderers import get_renderer
 
 class EmailChecker:
-    def __init__(self):
-        self.api_key = ""  # À remplacer dans config.py
+    def __init__(self, max_workers=32, transport=None, cache=None, breach_index=None, breach_filter=None,
+                 conditional=None, api_keys=None, rate_limiter=None):
+        # Débit par clé, rotation des clés et respect de Retry-After pour chaque fournisseur
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Clés d'API de config.py : une chaîne ou une liste par fournisseur
+        for provider, keys in (api_keys or {}).items():
+            self.rate_limiter.set_keys(provider, keys)
         self.timeout = 10
+        self.transport = transport or get_default_transport()
+        self.cache = cache
+        # Un seul appel réseau pour les vérifications identiques simultanées
+        self.flights = SingleFlight()
+        # Index hors ligne (chemin ou BreachIndex) : remplace l'API HIBP
+        if isinstance(breach_index, str):
+            breach_index = BreachIndex(breach_index)
+        self.breach_index = breach_index
+        # Filtre de Bloom (chemin ou BloomFilter) : les adresses certainement
+        # absentes sont traitées localement, sans appel HIBP ni lecture d'index
+        if isinstance(breach_filter, str):
+            breach_filter = BloomFilter.load(breach_filter)
+        self.breach_filter = breach_filter
+        self._filter_lock = threading.Lock()
+        self.filter_stats = {'checked': 0, 'skipped': 0, 'passed': 0, 'false_positives': 0}
+        # Validateurs HTTP (ConditionalStore) : une réponse 304 reprend le résultat précédent
+        self.conditional = conditional
+        self.max_workers = max_workers
         self.headers = {
-            'User-Agent': 'OSINT-Tool-Pro by Dvrk_Smith',
-            'hibp-api-key': self.api_key
+            'User-Agent': 'OSINT-Tool-Pro by Dvrk_Smith'
         }
     
+    @property
+    def api_key(self):
+        """Première clé HIBP ("" sans clé)"""
+        return next(iter(self.rate_limiter.keys('hibp')), "")
+    
+    @api_key.setter
+    def api_key(self, keys):
+        self.rate_limiter.set_keys('hibp', keys)
+    
+    @property
+    def hunter_api_key(self):
+        """Première clé Hunter.io ("" sans clé)"""
+        return next(iter(self.rate_limiter.keys('hunter')), "")
+    
+    @hunter_api_key.setter
+    def hunter_api_key(self, keys):
+        self.rate_limiter.set_keys('hunter', keys)
+    
+    def _cached(self, provider, email, fetch):
+        """Passe par le cache de résultats s'il est configuré"""
+        key = normalize_email(email)
+        if self.cache is None:
+            return self.flights.do((provider, key), lambda: fetch(email))
+        return self.flights.do(
+            (provider, key),
+            lambda: self.cache.get_or_fetch(provider, key, lambda: fetch(email))
+        )
+    
+    def forget(self, provider, email):
+        """Retire du cache la réponse d'un fournisseur pour cet email"""
+        if self.cache is not None:
+            self.cache.delete(provider, normalize_email(email))
+    
     def check_hibp(self, email):
-        """Vérifie l'email dans Have I Been Pwned"""
+        """Vérifie l'email dans Have I Been Pwned (ou dans l'index hors ligne)"""
+        if self.breach_filter is not None and not self.breach_filter.might_contain(email):
+            self._count_filter('skipped')
+            return {"breached": False, "breaches": [], "breach_count": 0}
+        
+        if self.breach_index is not None:
+            result = self.breach_index.check(email)
+        else:
+            result = self._cached('hibp', email, self._fetch_hibp)
+        
+        if self.breach_filter is not None:
+            self._count_filter('passed', false_positive=result.get('breached') is False)
+        return result
+    
+    def _count_filter(self, outcome, false_positive=False):
+        """Compte les adresses écartées ou transmises par le filtre de Bloom"""
+        with self._filter_lock:
+            self.filter_stats['checked'] += 1
+            self.filter_stats[outcome] += 1
+            if false_positive:
+                self.filter_stats['false_positives'] += 1
+    
+    def _fetch_hibp(self, email):
+        """Interroge l'API Have I Been Pwned"""
         try:
             url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{email}"
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+            headers = self.headers
+            if self.conditional is not None:
+                headers = dict(headers, **self.conditional.headers(url))
+            response = self.rate_limiter.call('hibp', lambda key: self.transport.get(
+                url, headers=dict(headers, **{'hibp-api-key': key}) if key else headers,
+                timeout=self.timeout, provider='hibp'
+            ))
+            
+            if response.status_code == 304 and self.conditional is not None:
+                result = self.conditional.not_modified(url)
+                if result is not None:
+                    return result
             
             if response.status_code == 200:
-                return {
+                result = {
                     "breached": True,
                     "breaches": response.json(),
                     "breach_count": len(response.json())
                 }
             elif response.status_code == 404:
-                return {"breached": False, "breaches": [], "breach_count": 0}
+                result = {"breached": False, "breaches": [], "breach_count": 0}
             else:
-                return {"error": f"Statut API: {response.status_code}"}
+                return {"error": f"Statut API: {response.status_code}", "status": response.status_code}
+            
+            if self.conditional is not None:
+                self.conditional.remember(url, response, result)
+            return result
         
+        except CircuitOpenError as e:
+            return skipped_result(e)
         except Exception as e:
             return {"error": str(e)}
     
     def check_emailrep(self, email):
         """Vérifie la réputation de l'email via EmailRep.io"""
+        return self._cached('emailrep', email, self._fetch_emailrep)
+    
+    def _fetch_emailrep(self, email):
+        """Interroge l'API EmailRep.io"""
         try:
             url = f"https://emailrep.io/{email}"
-            response = requests.get(url, timeout=self.timeout)
+            response = self.rate_limiter.call('emailrep', lambda key: self.transport.get(
+                url, headers={'Key': key} if key else None, timeout=self.timeout, provider='emailrep'
+            ))
             
             if response.status_code == 200:
                 data = response.json()
@@ -53,21 +163,27 @@ class EmailChecker:
                     "details": data.get('details', {})
                 }
             else:
-                return {"error": f"Statut: {response.status_code}"}
+                return {"error": f"Statut: {response.status_code}", "status": response.status_code}
         
+        except CircuitOpenError as e:
+            return skipped_result(e)
         except Exception as e:
             return {"error": str(e)}
     
     def check_hunter(self, email):
         """Vérifie si l'email existe via Hunter.io"""
+        if not self.hunter_api_key:
+            return {"error": "API key manquante"}
+        
+        return self._cached('hunter', email, self._fetch_hunter)
+    
+    def _fetch_hunter(self, email):
+        """Interroge l'API Hunter.io"""
         try:
-            # Format: api_key = "ton_api_key"
-            api_key = ""  # À remplacer
-            if not api_key:
-                return {"error": "API key manquante"}
-            
-            url = f"https://api.hunter.io/v2/email-verifier?email={email}&api_key={api_key}"
-            response = requests.get(url, timeout=self.timeout)
+            url = f"https://api.hunter.io/v2/email-verifier?email={email}"
+            response = self.rate_limiter.call('hunter', lambda key: self.transport.get(
+                f"{url}&api_key={key}", timeout=self.timeout, provider='hunter'
+            ))
             
             if response.status_code == 200:
                 data = response.json()
@@ -78,72 +194,98 @@ class EmailChecker:
                     "sources": result.get('sources', [])
                 }
             else:
-                return {"error": f"Statut: {response.status_code}"}
+                return {"error": f"Statut: {response.status_code}", "status": response.status_code}
         
+        except CircuitOpenError as e:
+            return skipped_result(e)
         except Exception as e:
             return {"error": str(e)}
     
-    def comprehensive_check(self, email):
-        """Vérification complète d'un email"""
-        print(Fore.YELLOW + f"\n🔍 Analyse approfondie de: {email}")
-        print(Fore.CYAN + "─" * 50)
-        
-        results = {}
-        
-        # 1. Vérification HIBP
-        print(Fore.WHITE + "1. Vérification des fuites de données...")
-        hibp_result = self.check_hibp(email)
-        results['hibp'] = hibp_result
-        
-        if 'breached' in hibp_result and hibp_result['breached']:
-            print(Fore.RED + f"   ❌ TROUVÉ dans {hibp_result['breach_count']} fuite(s)")
-            for breach in hibp_result['breaches'][:3]:
-                print(Fore.YELLOW + f"     • {breach.get('Name')} ({breach.get('BreachDate')})")
-        else:
-            print(Fore.GREEN + "   ✅ Aucune fuite trouvée")
-        
-        # 2. Vérification réputation
-        print(Fore.WHITE + "\n2. Vérification réputation...")
-        rep_result = self.check_emailrep(email)
-        results['reputation'] = rep_result
-        
-        if 'reputation' in rep_result:
-            rep = rep_result['reputation']
-            if rep in ['high', 'good']:
-                print(Fore.GREEN + f"   ✅ Bonne réputation")
-            elif rep == 'medium':
-                print(Fore.YELLOW + f"   ⚠️  Réputation moyenne")
-            else:
-                print(Fore.RED + f"   ❌ Mauvaise réputation")
-        
-        # 3. Vérification existence
-        print(Fore.WHITE + "\n3. Vérification existence...")
-        hunter_result = self.check_hunter(email)
-        results['hunter'] = hunter_result
-        
-        if 'exists' in hunter_result:
-            if hunter_result['exists']:
-                print(Fore.GREEN + "   ✅ Email valide et actif")
-                if 'score' in hunter_result:
-                    print(Fore.WHITE + f"     Score de confiance: {hunter_result['score']}%")
-            else:
-                print(Fore.YELLOW + "   ⚠️  Email peut-être invalide")
-        
-        # Recommandations
-        print(Fore.CYAN + "\n" + "═" * 50)
-        print(Fore.GREEN + "🛡️  RECOMMANDATIONS DE SÉCURITÉ:")
+    def _providers(self):
+        """Fournisseurs interrogés pour chaque email"""
+        return {
+            'hibp': self.check_hibp,
+            'reputation': self.check_emailrep,
+            'hunter': self.check_hunter
+        }
+    
+    def _call_provider(self, call, email):
+        """Appelle un fournisseur sans jamais lever d'exception"""
+        try:
+            return call(email)
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def check_all(self, email):
+        """Interroge les trois fournisseurs en parallèle pour un email"""
+        providers = self._providers()
+        with ThreadPoolExecutor(max_workers=len(providers)) as pool:
+            futures = {name: pool.submit(self._call_provider, call, email)
+                       for name, call in providers.items()}
+        return {name: future.result() for name, future in futures.items()}
+    
+    def bulk_check(self, emails, max_pending=None, max_workers=None):
+        """Vérifie un lot d'emails et produit un dict par email dès qu'il est terminé
         
-        if hibp_result.get('breached', False):
-            print(Fore.WHITE + "1. CHANGEZ VOTRE MOT DE PASSE immédiatement")
-            print(Fore.WHITE + "2. Activez l'authentification à deux facteurs")
-            print(Fore.WHITE + "3. Utilisez un gestionnaire de mots de passe")
-            print(Fore.WHITE + "4. Surveillez vos comptes financiers")
-        else:
-            print(Fore.WHITE + "1. Continuez à utiliser des mots de passe uniques")
-            print(Fore.WHITE + "2. Activez la 2FA si ce n'est pas fait")
-            print(Fore.WHITE + "3. Évitez de réutiliser les mots de passe")
+        Les emails sont lus au fil de l'eau : au plus max_pending emails sont
+        en cours à un instant donné, les trois fournisseurs de chacun étant
+        interrogés en parallèle par max_workers threads. L'ordre de sortie est
+        l'ordre de fin.
+        """
+        providers = self._providers()
+        max_workers = max_workers or self.max_workers
+        max_pending = max_pending or max_workers
+        emails = iter(emails)
+        ids = count()
+        pending = {}
+        partial = {}
+        remaining = {}
+        exhausted = False
         
-        return results
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while True:
+                # Remplit la fenêtre d'emails en cours
+                while not exhausted and len(partial) < max_pending:
+                    email = next(emails, None)
+                    if email is None:
+                        exhausted = True
+                        break
+                    email = email.strip()
+                    if not email:
+                        continue
+                    
+                    idx = next(ids)
+                    partial[idx] = {'email': email}
+                    remaining[idx] = len(providers)
+                    for name, call in providers.items():
+                        future = pool.submit(self._call_provider, call, email)
+                        pending[future] = (idx, name)
+                
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, name = pending.pop(future)
+                    partial[idx][name] = future.result()
+                    remaining[idx] -= 1
+                    if remaining[idx] == 0:
+                        del remaining[idx]
+                        yield partial.pop(idx)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def check(self, email):
+        """Interroge les trois fournisseurs et retourne un EmailResult"""
+        return EmailResult(email, **self.check_all(email))
+    
+    def comprehensive_check(self, email, renderer=None):
+        """Vérification complète d'un email"""
+        # Les trois fournisseurs sont interrogés en parallèle, l'affichage vient ensuite
+        result = self.check(email)
+        get_renderer(renderer).email(result)
+        return result.to_dict()
 
 # Fonction de test
 if __name__ == "__main__":
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Couche de transport HTTP partagée
+by Dvrk_Smith
+"""
+
+import os
+import socket
+import threading
+import time
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from modules.metrics import METRICS
+from modules.resilience import Resilience
+
+_DNS_CACHE = {}
+_DNS_LOCK = threading.Lock()
+_DNS_TTL = 0
+_ORIGINAL_GETADDRINFO = socket.getaddrinfo
+
+def _cached_getaddrinfo(*args, **kwargs):
+    """getaddrinfo avec réutilisation des résolutions récentes"""
+    if _DNS_TTL <= 0:
+        return _ORIGINAL_GETADDRINFO(*args, **kwargs)
+
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    with _DNS_LOCK:
+        entry = _DNS_CACHE.get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    result = _ORIGINAL_GETADDRINFO(*args, **kwargs)
+    with _DNS_LOCK:
+        _DNS_CACHE[key] = (now + _DNS_TTL, result)
+    return result
+
+def enable_dns_cache(ttl=300):
+    """Active le cache DNS pour tout le processus (ttl en secondes, 0 pour désactiver)"""
+    global _DNS_TTL
+    _DNS_TTL = ttl
+    socket.getaddrinfo = _cached_getaddrinfo
+    if ttl <= 0:
+        with _DNS_LOCK:
+            _DNS_CACHE.clear()
+
+class HTTPTransport:
+    def __init__(self, pool_connections=32, pool_maxsize=16, dns_ttl=0, headers=None,
+                 endpoint_override=None, metrics=None, resilience=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.metrics = metrics or METRICS
+        # Délais adaptatifs et disjoncteur par hôte (dict d'options ou instance)
+        if isinstance(resilience, Resilience):
+            self.resilience = resilience
+        else:
+            self.resilience = Resilience(**(resilience or {}))
+        # Redirige toutes les requêtes vers un serveur de substitution local
+        # (ex. benchmarks/standin_server.py) : https://hote/chemin -> override/hote/chemin
+        self.endpoint_override = (endpoint_override or os.environ.get('OSINT_ENDPOINT_OVERRIDE') or '').rstrip('/')
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+
+        # Un pool de connexions keep-alive par hôte
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+        # Conserve les compteurs des pools évincés du cache de pools
+        self._retired = {}
+        self._retired_lock = threading.Lock()
+        pools = self.adapter.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def _retire(pool):
+            self._record_pool(self._retired, pool)
+            if dispose:
+                dispose(pool)
+
+        pools.dispose_func = _retire
+
+        # Cache DNS sur demande seulement : il remplace socket.getaddrinfo pour tout le processus
+        if dns_ttl:
+            enable_dns_cache(dns_ttl)
+
+    def _record_pool(self, totals, pool):
+        """Ajoute les compteurs d'un pool urllib3 au total de son hôte"""
+        host = f"{pool.scheme}://{pool.host}"
+        if pool.port and pool.port not in (80, 443):
+            host += f":{pool.port}"
+        with self._retired_lock:
+            entry = totals.setdefault(host, {'requests': 0, 'new_connections': 0})
+            entry['requests'] += pool.num_requests
+            entry['new_connections'] += pool.num_connections
+
+    def rewrite(self, url):
+        """Applique la redirection vers le serveur de substitution s'il est configuré"""
+        if not self.endpoint_override:
+            return url
+        parts = urlsplit(url)
+        rewritten = f"{self.endpoint_override}/{parts.netloc}{parts.path or '/'}"
+        return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+    def request(self, method, url, provider=None, **kwargs):
+        """Envoie une requête via le pool partagé
+
+        provider sert d'étiquette aux métriques (l'hôte par défaut). Le délai
+        demandé peut être raccourci d'après les latences observées de l'hôte.
+        """
+        host = urlsplit(url).hostname or ''
+        provider = provider or host
+
+        # Lève CircuitOpenError sans appel réseau si l'hôte est court-circuité
+        self.resilience.before(host)
+        kwargs['timeout'] = self.resilience.timeout_for(host, kwargs.get('timeout'))
+
+        self.metrics.start(provider, host)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.rewrite(url), **kwargs)
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            self.metrics.finish(provider, host, elapsed, error=e)
+            self.resilience.record(host, elapsed, kwargs['timeout'], error=e)
+            raise
+        elapsed = time.perf_counter() - start
+        self.metrics.finish(provider, host, elapsed, status=response.status_code)
+        self.resilience.record(host, elapsed, kwargs['timeout'], status=response.status_code)
+        return response
+
+    def get(self, url, **kwargs):
+        """Requête GET"""
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        """Requête HEAD"""
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def stats(self):
+        """Compteurs de réutilisation des connexions par hôte
+
+        'new_connections' compte les connexions ouvertes (poignées de main
+        TCP/TLS), 'reused' les requêtes servies par une connexion existante.
+        """
+        with self._retired_lock:
+            per_host = {host: dict(entry) for host, entry in self._retired.items()}
+
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                self._record_pool(per_host, pool)
+
+        totals = {'requests': 0, 'new_connections': 0, 'reused': 0}
+        for entry in per_host.values():
+            entry['reused'] = max(entry['requests'] - entry['new_connections'], 0)
+            for name in totals:
+                totals[name] += entry[name]
+
+        return {'hosts': per_host, 'total': totals}
+
+    def close(self):
+        """Ferme toutes les connexions du pool"""
+        self.session.close()
+
+_DEFAULT_TRANSPORT = None
+_DEFAULT_LOCK = threading.Lock()
+
+def get_default_transport():
+    """Transport partagé par défaut du processus"""
+    global _DEFAULT_TRANSPORT
+    with _DEFAULT_LOCK:
+        if _DEFAULT_TRANSPORT is None:
+            _DEFAULT_TRANSPORT = HTTPTransport()
+        return _DEFAULT_TRANSPORT
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+File de travaux persistante : les lots interrompus reprennent là où ils s'étaient arrêtés
+by Dvrk_Smith
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from modules.probe_engine import stream_map
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+# Cibles insérées par transaction lors de la soumission
+INSERT_BATCH = 5000
+# Unités (cible, fournisseur) lues à la fois lors de l'exécution
+PAGE_SIZE = 1000
+
+def _succeeded(result):
+    """Un résultat sans erreur est définitif ; une erreur sera retentée à la reprise"""
+    return not (isinstance(result, dict) and 'error' in result)
+
+class JobQueue:
+    def __init__(self, path="data/jobs.sqlite3", max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # WAL : un commit par résultat reste peu coûteux
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                type TEXT NOT NULL,
+                created TEXT NOT NULL,
+                providers TEXT NOT NULL,
+                targets INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS targets (
+                job INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                target TEXT NOT NULL,
+                PRIMARY KEY (job, seq)
+            ) WITHOUT ROWID;
+            -- Une unité par cible et par fournisseur
+            CREATE TABLE IF NOT EXISTS units (
+                job INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                provider TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                PRIMARY KEY (job, seq, provider)
+            ) WITHOUT ROWID;
+            -- Cibles déjà produites par run() : chacune ne l'est qu'une fois
+            CREATE TABLE IF NOT EXISTS emitted (
+                job INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                PRIMARY KEY (job, seq)
+            ) WITHOUT ROWID;
+        """)
+        self._db.commit()
+
+    def submit(self, job_type, targets, providers):
+        """Enregistre un lot (cibles lues au fil de l'eau) et retourne son identifiant"""
+        providers = list(providers)
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO jobs (type, created, providers) VALUES (?, ?, ?)",
+                (job_type, datetime.now().strftime("%Y%m%d_%H%M%S"), json.dumps(providers))
+            )
+            job_id = cursor.lastrowid
+
+            count = 0
+            batch = []
+            for target in targets:
+                target = target.strip()
+                if not target:
+                    continue
+                batch.append((job_id, count, target))
+                count += 1
+                if len(batch) >= INSERT_BATCH:
+                    self._insert(batch, providers)
+                    batch = []
+            self._insert(batch, providers)
+
+            self._db.execute("UPDATE jobs SET targets = ? WHERE id = ?", (count, job_id))
+            self._db.commit()
+        return job_id
+
+    def _insert(self, batch, providers):
+        """Insère des cibles et leurs unités en attente (verrou déjà pris)"""
+        self._db.executemany("INSERT INTO targets (job, seq, target) VALUES (?, ?, ?)", batch)
+        self._db.executemany(
+            "INSERT INTO units (job, seq, provider, status) VALUES (?, ?, ?, ?)",
+            [(job_id, seq, provider, PENDING) for job_id, seq, _ in batch for provider in providers]
+        )
+
+    def job(self, job_id):
+        """Type, date et fournisseurs d'un lot, ou None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, type, created, providers, targets FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'id': row[0], 'type': row[1], 'created': row[2], 'providers': json.loads(row[3]), 'targets': row[4]}
+
+    def jobs(self):
+        """Liste des lots, du plus récent au plus ancien"""
+        with self._lock:
+            ids = [row[0] for row in self._db.execute("SELECT id FROM jobs ORDER BY id DESC")]
+        return [self.job(job_id) for job_id in ids]
+
+    def status(self, job_id):
+        """Avancement d'un lot : unités par fournisseur et par statut, cibles terminées"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT provider, status, COUNT(*) FROM units WHERE job = ? GROUP BY provider, status", (job_id,)
+            ).fetchall()
+            remaining = self._db.execute(
+                "SELECT COUNT(DISTINCT seq) FROM units WHERE job = ? AND status != ?", (job_id, DONE)
+            ).fetchone()[0]
+        providers = {}
+        for provider, status, count in rows:
+            providers.setdefault(provider, {PENDING: 0, DONE: 0, FAILED: 0})[status] = count
+        job = self.job(job_id) or {'targets': 0}
+        return {'targets': job['targets'], 'complete': job['targets'] - remaining, 'providers': providers}
+
+    def _pending_units(self, job_id):
+        """Unités à (re)lancer, par pages, dans l'ordre des cibles"""
+        last = (-1, "")
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT u.seq, u.provider, t.target, u.attempts FROM units u "
+                    "JOIN targets t ON t.job = u.job AND t.seq = u.seq "
+                    "WHERE u.job = ? AND (u.seq, u.provider) > (?, ?) "
+                    "AND (u.status = ? OR (u.status = ? AND u.attempts < ?)) "
+                    "ORDER BY u.seq, u.provider LIMIT ?",
+                    (job_id, last[0], last[1], PENDING, FAILED, self.max_attempts, PAGE_SIZE)
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][:2]
+
+    def _record(self, job_id, seq, provider, result):
+        """Enregistre le résultat d'une unité ; retourne True si la cible est terminée et pas encore produite
+
+        Une cible est terminée quand chaque fournisseur a répondu ou épuisé
+        ses max_attempts tentatives : une erreur encore retentable la laisse
+        en attente de la prochaine reprise.
+        """
+        status = DONE if _succeeded(result) else FAILED
+        with self._lock:
+            self._db.execute(
+                "UPDATE units SET status = ?, attempts = attempts + 1, result = ? "
+                "WHERE job = ? AND seq = ? AND provider = ?",
+                (status, json.dumps(result, default=str), job_id, seq, provider)
+            )
+            self._db.commit()
+            waiting = self._db.execute(
+                "SELECT COUNT(*) FROM units WHERE job = ? AND seq = ? "
+                "AND (status = ? OR (status = ? AND attempts < ?))",
+                (job_id, seq, PENDING, FAILED, self.max_attempts)
+            ).fetchone()[0]
+            emitted = self._db.execute(
+                "SELECT 1 FROM emitted WHERE job = ? AND seq = ?", (job_id, seq)
+            ).fetchone()
+        return waiting == 0 and emitted is None
+
+    def _unemitted(self, job_id):
+        """Cibles terminées mais jamais produites (interruption entre l'enregistrement et la sortie)"""
+        with self._lock:
+            return [row[0] for row in self._db.execute(
+                "SELECT t.seq FROM targets t WHERE t.job = ? "
+                "AND NOT EXISTS (SELECT 1 FROM emitted e WHERE e.job = t.job AND e.seq = t.seq) "
+                "AND NOT EXISTS (SELECT 1 FROM units u WHERE u.job = t.job AND u.seq = t.seq "
+                "AND (u.status = ? OR (u.status = ? AND u.attempts < ?))) ORDER BY t.seq",
+                (job_id, PENDING, FAILED, self.max_attempts)
+            )]
+
+    def mark_emitted(self, job_id, seqs):
+        """Note que des cibles ont été produites (par run() ou déjà présentes dans la sortie)"""
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO emitted (job, seq) VALUES (?, ?)", ((job_id, seq) for seq in seqs)
+            )
+            self._db.commit()
+
+    def target_results(self, job_id, seq):
+        """(cible, {fournisseur: résultat}) d'une cible d'un lot"""
+        with self._lock:
+            target = self._db.execute(
+                "SELECT target FROM targets WHERE job = ? AND seq = ?", (job_id, seq)
+            ).fetchone()[0]
+            rows = self._db.execute(
+                "SELECT provider, result FROM units WHERE job = ? AND seq = ?", (job_id, seq)
+            ).fetchall()
+        return target, {provider: json.loads(result) if result else None for provider, result in rows}
+
+    def run(self, job_id, providers, workers=8, refresh=None):
+        """Exécute (ou reprend) un lot et produit (seq, cible, résultats) pour chaque cible terminée
+
+        providers : {nom: fonction(cible)}. Seules les unités en attente ou en
+        échec (moins de max_attempts tentatives) sont lancées : un fournisseur
+        qui a déjà répondu pour une cible n'est jamais réinterrogé. Chaque
+        résultat est enregistré dès son arrivée, si bien qu'une interruption
+        ne perd que les appels en cours. refresh(nom, cible), s'il est fourni,
+        est appelé avant chaque nouvelle tentative (ex. vider un cache).
+
+        Une cible est marquée produite quand le consommateur redemande la
+        suivante : une interruption entre les deux la reproduit à la reprise
+        (au moins une fois). Le consommateur déduplique par (lot, seq) et peut
+        déclarer ce qu'il a déjà écrit avec mark_emitted().
+        """
+        def call(unit):
+            seq, provider, target, attempts = unit
+            try:
+                if attempts and refresh is not None:
+                    refresh(provider, target)
+                return providers[provider](target)
+            except Exception as e:
+                return {"error": str(e)}
+
+        for seq in self._unemitted(job_id):
+            yield (seq,) + self.target_results(job_id, seq)
+            self.mark_emitted(job_id, [seq])
+
+        for (seq, provider, target, attempts), result in stream_map(call, self._pending_units(job_id), max_workers=workers):
+            if self._record(job_id, seq, provider, result):
+                yield (seq,) + self.target_results(job_id, seq)
+                self.mark_emitted(job_id, [seq])
+
+    def results(self, job_id):
+        """Produit (seq, cible, résultats) pour toutes les cibles d'un lot, dans l'ordre de soumission"""
+        with self._lock:
+            count = self._db.execute("SELECT targets FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        for seq in range(count[0] if count else 0):
+            yield (seq,) + self.target_results(job_id, seq)
+
+    def close(self):
+        """Ferme la base SQLite"""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Métriques de latence et d'erreurs par fournisseur et par hôte
+by Dvrk_Smith
+"""
+
+import json
+import threading
+
+# Bornes des histogrammes de latence (secondes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _labels(**labels):
+    """Étiquettes au format Prometheus"""
+    escaped = (
+        f'{name}="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+class Metrics:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._statuses = {}
+        self._errors = {}
+        self._in_flight = {}
+
+    def start(self, provider, host):
+        """Marque le début d'une requête (jauge des requêtes en cours)"""
+        with self._lock:
+            key = (provider, host)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+    def finish(self, provider, host, seconds, status=None, error=None):
+        """Enregistre la fin d'une requête : latence, statut ou exception"""
+        key = (provider, host)
+        with self._lock:
+            self._in_flight[key] = max(self._in_flight.get(key, 0) - 1, 0)
+
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+            if status is not None:
+                status_key = key + (str(status),)
+                self._statuses[status_key] = self._statuses.get(status_key, 0) + 1
+            if error is not None:
+                error_key = key + (type(error).__name__,)
+                self._errors[error_key] = self._errors.get(error_key, 0) + 1
+
+    def snapshot(self):
+        """Photographie JSON-sérialisable de toutes les métriques"""
+        with self._lock:
+            series = {}
+            for (provider, host), histogram in self._histograms.items():
+                series[(provider, host)] = {
+                    'provider': provider,
+                    'host': host,
+                    'count': histogram['count'],
+                    'sum_seconds': histogram['sum'],
+                    'buckets': dict(zip((str(b) for b in self.buckets), histogram['buckets'])),
+                    'statuses': {},
+                    'errors': {},
+                    'in_flight': self._in_flight.get((provider, host), 0)
+                }
+            for (provider, host, status), count in self._statuses.items():
+                series[(provider, host)]['statuses'][status] = count
+            for (provider, host, error), count in self._errors.items():
+                series[(provider, host)]['errors'][error] = count
+
+        return {'series': sorted(series.values(), key=lambda s: (s['provider'], s['host']))}
+
+    def summary(self):
+        """Totaux par fournisseur : requêtes, latence moyenne, erreurs"""
+        providers = {}
+        for series in self.snapshot()['series']:
+            entry = providers.setdefault(series['provider'], {'count': 0, 'sum_seconds': 0.0, 'errors': 0})
+            entry['count'] += series['count']
+            entry['sum_seconds'] += series['sum_seconds']
+            entry['errors'] += sum(series['errors'].values())
+            # Les statuts HTTP hors 2xx/404 sont aussi des échecs côté fournisseur
+            entry['errors'] += sum(n for code, n in series['statuses'].items()
+                                   if not code.startswith('2') and code != '404')
+        return providers
+
+    def to_prometheus(self):
+        """Export au format texte Prometheus"""
+        lines = [
+            "# HELP osint_request_duration_seconds Latence des requêtes par fournisseur et hôte",
+            "# TYPE osint_request_duration_seconds histogram",
+        ]
+        snapshot = self.snapshot()['series']
+        for series in snapshot:
+            base = {'provider': series['provider'], 'host': series['host']}
+            for bound, count in series['buckets'].items():
+                lines.append(f"osint_request_duration_seconds_bucket{_labels(**base, le=bound)} {count}")
+            lines.append(f"osint_request_duration_seconds_bucket{_labels(**base, le='+Inf')} {series['count']}")
+            lines.append(f"osint_request_duration_seconds_sum{_labels(**base)} {series['sum_seconds']:.6f}")
+            lines.append(f"osint_request_duration_seconds_count{_labels(**base)} {series['count']}")
+
+        lines.append("# HELP osint_requests_total Réponses reçues par code de statut")
+        lines.append("# TYPE osint_requests_total counter")
+        for series in snapshot:
+            for status, count in sorted(series['statuses'].items()):
+                labels = _labels(provider=series['provider'], host=series['host'], status=status)
+                lines.append(f"osint_requests_total{labels} {count}")
+
+        lines.append("# HELP osint_request_errors_total Requêtes échouées par type d'exception")
+        lines.append("# TYPE osint_request_errors_total counter")
+        for series in snapshot:
+            for error, count in sorted(series['errors'].items()):
+                labels = _labels(provider=series['provider'], host=series['host'], exception=error)
+                lines.append(f"osint_request_errors_total{labels} {count}")
+
+        lines.append("# HELP osint_requests_in_flight Requêtes en cours")
+        lines.append("# TYPE osint_requests_in_flight gauge")
+        for series in snapshot:
+            labels = _labels(provider=series['provider'], host=series['host'])
+            lines.append(f"osint_requests_in_flight{labels} {series['in_flight']}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Écrit les métriques : JSON si le fichier finit par .json, Prometheus sinon"""
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".json"):
+                json.dump(self.snapshot(), f, indent=4)
+            else:
+                f.write(self.to_prometheus())
+
+    def reset(self):
+        """Remet toutes les métriques à zéro"""
+        with self._lock:
+            self._histograms.clear()
+            self._statuses.clear()
+            self._errors.clear()
+            self._in_flight.clear()
+
+# Registre partagé par défaut
+METRICS = Metrics()
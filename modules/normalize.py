@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Normalisation des cibles (emails, numéros, usernames)
+by Dvrk_Smith
+"""
+
+import re
+
+def normalize_email(email):
+    """Forme canonique d'un email"""
+    return email.strip().lower()
+
+def valid_email(email):
+    """Contrôle de format minimal : un @ et un domaine avec un point"""
+    return "@" in email and "." in email.split("@")[1]
+
+def normalize_phone(phone_number):
+    """Forme canonique d'un numéro (chiffres et + uniquement)"""
+    phone = re.sub(r'[^\d+]', '', phone_number)
+    if phone.startswith('33'):
+        phone = '+' + phone
+    return phone
+
+def normalize_username(username):
+    """Forme canonique d'un username"""
+    return username.strip().lower()
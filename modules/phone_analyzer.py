@@ -4,38 +4,168 @@ Module d'analyse de numéros de téléphone
 by Dvrk_Smith
 """
 
-import re
-import requests
+import os
+import hashlib
+import warnings
 import phonenumbers
-from phonenumbers import carrier, geocoder, timezone
-from colorama import Fore, Style
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+from modules.http_transport import get_default_transport
+from modules.resilience import CircuitOpenError, skipped_result
+from modules.normalize import normalize_phone
+from modules.singleflight import SingleFlight
+from modules.prefix_index import PrefixIndex
+from modules.rate_limiter import RateLimiter
+from modules.results import PhoneResult
+from modules.renderers import get_renderer
+
+# Formats disponibles pour la sortie
+FORMATS = {
+    'formatted': phonenumbers.PhoneNumberFormat.INTERNATIONAL,
+    'national': phonenumbers.PhoneNumberFormat.NATIONAL,
+    'e164': phonenumbers.PhoneNumberFormat.E164,
+}
+
+def parse_phone(phone_number):
+    """Nettoie et parse un numéro, retourne None s'il n'est pas valide"""
+    parsed = phonenumbers.parse(normalize_phone(phone_number), None)
+    return parsed if phonenumbers.is_valid_number(parsed) else None
+
+# Les métadonnées carrier/geocoder/timezone (plusieurs centaines de ms à
+# charger) ne sont importées qu'à la première recherche qui en a besoin
+
+def lookup_carrier(parsed_number, lang="fr"):
+    """Opérateur d'un numéro parsé"""
+    from phonenumbers import carrier
+    
+    try:
+        carrier_name = carrier.name_for_number(parsed_number, lang)
+        return carrier_name if carrier_name else "Inconnu"
+    except:
+        return "Inconnu"
+
+def lookup_location(parsed_number, lang="fr"):
+    """Localisation géographique d'un numéro parsé"""
+    from phonenumbers import geocoder
+    
+    try:
+        region = geocoder.description_for_number(parsed_number, lang)
+        return region if region else "Inconnue"
+    except:
+        return "Inconnue"
+
+def lookup_timezone(parsed_number):
+    """Premier fuseau horaire d'un numéro parsé"""
+    from phonenumbers import timezone
+    
+    try:
+        timezones = timezone.time_zones_for_number(parsed_number)
+        return list(timezones)[0] if timezones else "Inconnu"
+    except:
+        return "Inconnu"
+
+def search_links(phone_number):
+    """Liens de recherche d'un numéro (sans le +)"""
+    return {
+        "Google": f"https://www.google.com/search?q={phone_number}",
+        "Facebook": f"https://www.facebook.com/search/top/?q={phone_number}",
+        "Truecaller": f"https://www.truecaller.com/search/fr/{phone_number}",
+        "Tellows": f"https://www.tellows.fr/num/{phone_number}",
+        "SpamCalls": f"https://spamcalls.net/fr/{phone_number}",
+        "Copains d'Avant": f"https://copainsdavant.linternaute.com/p/{phone_number}"
+    }
+
+def estimate_line_type(parsed_number, country_code):
+    """Estime le type de ligne d'après le format (numéros français uniquement)"""
+    if country_code != "FR":
+        return None
+    
+    national = str(parsed_number.national_number)
+    if national.startswith(('6', '7')):
+        return "mobile"
+    elif national.startswith(('1', '2', '3', '4', '5', '8', '9')):
+        return "fixe"
+    return "indéterminé"
+
+def e164_digits(parsed_number):
+    """Chiffres E.164 d'un numéro parsé, sans formatage complet"""
+    return str(parsed_number.country_code) + phonenumbers.national_significant_number(parsed_number)
+
+# Index de préfixes ouverts dans le processus courant (un par fichier)
+_OPEN_INDEXES = {}
+
+def _open_index(path):
+    """Ouvre un index de préfixes une seule fois par processus"""
+    index = _OPEN_INDEXES.get(path)
+    if index is None:
+        index = _OPEN_INDEXES[path] = PrefixIndex(path)
+    return index
+
+def _bulk_chunk(numbers, fields, enrich, lang, index_path=None):
+    """Valide et enrichit un lot de numéros (exécuté dans un processus fils)"""
+    index = _open_index(index_path) if enrich and index_path else None
+    results = []
+    for number in numbers:
+        try:
+            parsed = parse_phone(number)
+        except Exception as e:
+            results.append({'input': number, 'valid': False, 'error': str(e)})
+            continue
+        
+        if parsed is None:
+            results.append({'input': number, 'valid': False, 'error': 'Numéro invalide'})
+            continue
+        
+        result = {'input': number, 'valid': True}
+        # Formatage uniquement des champs demandés
+        for name in fields:
+            result[name] = phonenumbers.format_number(parsed, FORMATS[name])
+        
+        if index is not None:
+            carrier_name, region, zone = index.describe(parsed)
+            result['carrier'] = carrier_name or "Inconnu"
+            result['location'] = region or "Inconnue"
+            result['timezone'] = zone or "Inconnu"
+            result['country_code'] = phonenumbers.region_code_for_number(parsed)
+        elif enrich:
+            result['carrier'] = lookup_carrier(parsed, lang)
+            result['location'] = lookup_location(parsed, lang)
+            result['timezone'] = lookup_timezone(parsed)
+            result['country_code'] = phonenumbers.region_code_for_number(parsed)
+        results.append(result)
+    return results
 
 class PhoneAnalyzer:
-    def __init__(self):
-        self.api_keys = {}
+    def __init__(self, transport=None, cache=None, prefix_index=None, api_keys=None, rate_limiter=None):
+        # Débit par clé et rotation des clés NumVerify, partagés avec les autres modules
+        self.rate_limiter = rate_limiter or RateLimiter()
+        for provider, keys in (api_keys or {}).items():
+            self.rate_limiter.set_keys(provider, keys)
         self.timeout = 10
+        self.transport = transport or get_default_transport()
+        self.cache = cache
+        self.flights = SingleFlight()
+        # Index optionnel (chemin ou PrefixIndex) construit pour la langue "fr"
+        if isinstance(prefix_index, str):
+            try:
+                prefix_index = PrefixIndex(prefix_index)
+            except ValueError as e:
+                # Index d'un ancien format : recherches directes dans phonenumbers
+                warnings.warn(str(e))
+                prefix_index = None
+        self.prefix_index = prefix_index
         
     def validate_phone(self, phone_number):
         """Valide et formate le numéro de téléphone"""
         try:
-            # Nettoyage du numéro
-            phone = re.sub(r'[^\d+]', '', phone_number)
-            
-            # Ajoute le + si absent mais commence par 33
-            if phone.startswith('33') and not phone.startswith('+'):
-                phone = '+' + phone
+            parsed = parse_phone(phone_number)
             
-            # Parse avec phonenumbers
-            parsed = phonenumbers.parse(phone, None)
-            
-            if phonenumbers.is_valid_number(parsed):
-                return {
-                    'valid': True,
-                    'formatted': phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
-                    'national': phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.NATIONAL),
-                    'e164': phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164),
-                    'parsed': parsed
-                }
+            if parsed is not None:
+                result = {'valid': True}
+                for name, number_format in FORMATS.items():
+                    result[name] = phonenumbers.format_number(parsed, number_format)
+                return result
             else:
                 return {'valid': False, 'error': 'Numéro invalide'}
                 
@@ -44,43 +174,124 @@ class PhoneAnalyzer:
     
     def get_carrier_info(self, parsed_number):
         """Obtenir l'opérateur du numéro"""
-        try:
-            carrier_name = carrier.name_for_number(parsed_number, "fr")
-            return carrier_name if carrier_name else "Inconnu"
-        except:
-            return "Inconnu"
+        return lookup_carrier(parsed_number, "fr")
     
     def get_geolocation(self, parsed_number):
         """Obtenir la localisation géographique"""
-        try:
-            region = geocoder.description_for_number(parsed_number, "fr")
-            return region if region else "Inconnue"
-        except:
-            return "Inconnue"
+        return lookup_location(parsed_number, "fr")
     
     def get_timezone(self, parsed_number):
         """Obtenir le fuseau horaire"""
+        return lookup_timezone(parsed_number)
+    
+    def lookup_prefixes(self, parsed_number):
+        """Opérateur, localisation et fuseau horaire d'un numéro
+        
+        Avec un index de préfixes, les trois informations sont obtenues en
+        une seule recherche au lieu de trois parcours des métadonnées, avec
+        les mêmes résultats (règles par type de numéro comprises).
+        """
+        if self.prefix_index is not None and self.prefix_index.lang == "fr":
+            carrier_name, region, zone = self.prefix_index.describe(parsed_number)
+            return carrier_name or "Inconnu", region or "Inconnue", zone or "Inconnu"
+        
+        return (
+            self.get_carrier_info(parsed_number),
+            self.get_geolocation(parsed_number),
+            self.get_timezone(parsed_number)
+        )
+    
+    def bulk_validate(self, numbers, fields=('e164',), enrich=True, processes=None,
+                      chunk_size=5000, lang="fr"):
+        """Valide et enrichit un grand volume de numéros sur plusieurs cœurs
+        
+        Les numéros sont découpés en lots traités par un pool de processus ;
+        seuls les formats listés dans fields sont calculés. Les résultats sont
+        produits dans l'ordre d'entrée, avec au plus deux lots en attente par
+        processus pour borner la mémoire.
+        """
+        fields = tuple(fields)
+        unknown = set(fields) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Formats inconnus: {', '.join(sorted(unknown))}")
+        
+        processes = processes or os.cpu_count() or 1
+        index_path = None
+        if self.prefix_index is not None and self.prefix_index.lang == lang:
+            index_path = self.prefix_index.path
+        numbers = iter(numbers)
+        window = deque()
+        
+        pool = ProcessPoolExecutor(max_workers=processes)
+        completed = False
         try:
-            timezones = timezone.time_zones_for_number(parsed_number)
-            return list(timezones)[0] if timezones else "Inconnu"
-        except:
-            return "Inconnu"
+            while True:
+                chunk = list(islice(numbers, chunk_size))
+                if not chunk:
+                    break
+                window.append(pool.submit(_bulk_chunk, chunk, fields, enrich, lang, index_path))
+                if len(window) >= processes * 2:
+                    yield from window.popleft().result()
+            
+            while window:
+                yield from window.popleft().result()
+            completed = True
+        finally:
+            # Arrêt immédiat seulement si le flux est abandonné en cours de route
+            pool.shutdown(wait=completed, cancel_futures=not completed)
+    
+    def bulk_columns(self, numbers, processes=None, chunk_size=5000, lang="fr"):
+        """Valide et enrichit un grand volume de numéros dans un PhoneBatch
+        
+        Les résultats sont rangés par colonnes au fur et à mesure (quelques
+        dizaines d'octets par numéro) ; formats et liens de recherche sont
+        recalculés à la lecture d'une ligne.
+        """
+        from modules.phone_batch import PhoneBatch
+        
+        batch = PhoneBatch()
+        batch.extend(self.bulk_validate(numbers, fields=('e164',), enrich=True, processes=processes,
+                                        chunk_size=chunk_size, lang=lang))
+        return batch
+    
+    @property
+    def numverify_api_key(self):
+        """Première clé NumVerify ("" sans clé)"""
+        return next(iter(self.rate_limiter.keys('numverify')), "")
+    
+    @numverify_api_key.setter
+    def numverify_api_key(self, keys):
+        self.rate_limiter.set_keys('numverify', keys)
     
     def check_numverify(self, phone_number, api_key=""):
-        """Vérifie le numéro via NumVerify API"""
-        if not api_key:
+        """Vérifie le numéro via NumVerify API (clés de API_KEYS, ou api_key si fournie)"""
+        if not (api_key or self.numverify_api_key):
             return {"error": "API key requise pour NumVerify"}
         
+        key = normalize_phone(phone_number)
+        if api_key:
+            # Une clé explicite (peut-être invalide) ne partage ni appel ni cache avec les autres
+            key += "|" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        if self.cache is None:
+            return self.flights.do(key, lambda: self._fetch_numverify(phone_number, api_key))
+        return self.flights.do(key, lambda: self.cache.get_or_fetch(
+            'numverify', key, lambda: self._fetch_numverify(phone_number, api_key)
+        ))
+    
+    def _fetch_numverify(self, phone_number, api_key):
+        """Interroge l'API NumVerify"""
         try:
             url = f"http://apilayer.net/api/validate"
             params = {
-                'access_key': api_key,
                 'number': phone_number,
                 'country_code': '',
                 'format': 1
             }
             
-            response = requests.get(url, params=params, timeout=self.timeout)
+            # Clé explicite ajoutée au pool (son propre seau) ; sinon rotation des clés configurées
+            response = self.rate_limiter.call('numverify', lambda key: self.transport.get(
+                url, params=dict(params, access_key=key), timeout=self.timeout, provider='numverify'
+            ), key=api_key or None)
             
             if response.status_code == 200:
                 data = response.json()
@@ -97,95 +308,56 @@ class PhoneAnalyzer:
                     'line_type': data.get('line_type', '')
                 }
             else:
-                return {"error": f"API error: {response.status_code}"}
+                return {"error": f"API error: {response.status_code}", "status": response.status_code}
                 
+        except CircuitOpenError as e:
+            return skipped_result(e)
         except Exception as e:
             return {"error": str(e)}
     
     def search_online(self, phone_number):
         """Génère des liens de recherche pour le numéro"""
-        searches = {
-            "Google": f"https://www.google.com/search?q={phone_number}",
-            "Facebook": f"https://www.facebook.com/search/top/?q={phone_number}",
-            "Truecaller": f"https://www.truecaller.com/search/fr/{phone_number}",
-            "Tellows": f"https://www.tellows.fr/num/{phone_number}",
-            "SpamCalls": f"https://spamcalls.net/fr/{phone_number}",
-            "Copains d'Avant": f"https://copainsdavant.linternaute.com/p/{phone_number}"
-        }
-        return searches
-    
-    def analyze(self, phone_number):
-        """Analyse complète d'un numéro"""
-        print(Fore.YELLOW + f"\n🔍 Analyse du numéro: {phone_number}")
-        print(Fore.CYAN + "═" * 50)
-        
-        # 1. Validation
-        print(Fore.WHITE + "1. Validation du format...")
-        validation = self.validate_phone(phone_number)
-        
-        if not validation['valid']:
-            print(Fore.RED + f"   ❌ {validation.get('error', 'Numéro invalide')}")
-            return None
-        
-        print(Fore.GREEN + f"   ✅ Numéro valide")
-        print(Fore.WHITE + f"     Format international: {validation['formatted']}")
-        print(Fore.WHITE + f"     Format national: {validation['national']}")
-        
-        parsed = validation['parsed']
-        
-        # 2. Informations de base
-        print(Fore.WHITE + "\n2. Informations de base...")
-        
-        carrier_info = self.get_carrier_info(parsed)
-        print(Fore.WHITE + f"   📞 Opérateur: {carrier_info}")
-        
-        location = self.get_geolocation(parsed)
-        print(Fore.WHITE + f"   📍 Localisation: {location}")
+        return search_links(phone_number)
+    
+    def get_line_type(self, parsed_number, country_code):
+        """Estime le type de ligne d'après le format (numéros français uniquement)"""
+        return estimate_line_type(parsed_number, country_code)
+    
+    def lookup(self, phone_number):
+        """Analyse complète d'un numéro ; retourne un PhoneResult"""
+        try:
+            parsed = parse_phone(phone_number)
+        except Exception as e:
+            return PhoneResult(phone_number, False, str(e))
         
-        timezone_info = self.get_timezone(parsed)
-        print(Fore.WHITE + f"   🕐 Fuseau horaire: {timezone_info}")
+        if parsed is None:
+            return PhoneResult(phone_number, False, 'Numéro invalide')
         
-        # 3. Type de ligne (estimation)
-        print(Fore.WHITE + "\n3. Analyse du type...")
         country_code = phonenumbers.region_code_for_number(parsed)
+        carrier_info, location, timezone_info = self.lookup_prefixes(parsed)
         
-        # Estimation basée sur le format
-        if country_code == "FR":
-            if str(parsed.national_number).startswith(('6', '7')):
-                print(Fore.WHITE + "   📱 Type: Mobile")
-            elif str(parsed.national_number).startswith(('1', '2', '3', '4', '5', '8', '9')):
-                print(Fore.WHITE + "   🏠 Type: Fixe")
-            else:
-                print(Fore.WHITE + "   ❓ Type: Indéterminé")
-        else:
-            print(Fore.WHITE + "   🌍 Pays: " + country_code)
-        
-        # 4. Recherches en ligne
-        print(Fore.WHITE + "\n4. Recherches en ligne disponibles...")
-        searches = self.search_online(phone_number.replace('+', ''))
-        
-        for site, url in searches.items():
-            print(Fore.CYAN + f"   🔗 {site}: {url}")
-        
-        # 5. Conseils de sécurité
-        print(Fore.CYAN + "\n" + "═" * 50)
-        print(Fore.GREEN + "🛡️  CONSEILS DE SÉCURITÉ:")
-        
-        print(Fore.WHITE + "1. Vérifiez le numéro sur les sites anti-spam")
-        print(Fore.WHITE + "2. Ne partagez pas d'informations sensibles")
-        print(Fore.WHITE + "3. BloqueZ les numéros suspects")
-        print(Fore.WHITE + "4. Signalez les appels malveillants")
-        
-        # Retourner les résultats
-        return {
-            'valid': True,
-            'formatted': validation['formatted'],
-            'carrier': carrier_info,
-            'location': location,
-            'timezone': timezone_info,
-            'country_code': country_code,
-            'searches': searches
-        }
+        return PhoneResult(
+            phone_number, True,
+            formatted=phonenumbers.format_number(parsed, FORMATS['formatted']),
+            national=phonenumbers.format_number(parsed, FORMATS['national']),
+            e164=phonenumbers.format_number(parsed, FORMATS['e164']),
+            carrier=carrier_info,
+            location=location,
+            timezone=timezone_info,
+            country_code=country_code,
+            line_type=self.get_line_type(parsed, country_code),
+            searches=self.search_online(phone_number.replace('+', ''))
+        )
+    
+    def collect(self, phone_number):
+        """Analyse complète d'un numéro, sans affichage"""
+        return self.lookup(phone_number).to_dict()
+    
+    def analyze(self, phone_number, renderer=None):
+        """Analyse complète d'un numéro"""
+        result = self.lookup(phone_number)
+        get_renderer(renderer).phone(result)
+        return result.to_dict() if result.valid else None
 
 # Fonction de test
 if __name__ == "__main__":
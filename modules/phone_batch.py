@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Résultats de validation en masse stockés par colonnes
+by Dvrk_Smith
+
+Un dict par numéro (avec ses liens de recherche) coûte plusieurs Ko ; ici
+chaque numéro n'occupe que quelques dizaines d'octets : un bit de validité,
+l'E.164 en entier 64 bits, des codes vers des chaînes internées (pays,
+opérateur, localisation, fuseau, erreur) et le numéro d'origine en UTF-8.
+"""
+
+import csv
+from array import array
+
+import phonenumbers
+
+from modules.phone_analyzer import FORMATS, search_links, estimate_line_type
+from modules.results import PhoneResult
+
+# Colonnes exportées (CSV, Parquet)
+COLUMNS = ("input", "valid", "e164", "country_code", "carrier", "location", "timezone", "error")
+# Colonnes de chaînes internées
+INTERNED = ("country_code", "carrier", "location", "timezone", "error")
+
+class StringTable:
+    """Chaînes internées : chaque valeur distincte n'est stockée qu'une fois (code 0 : absente)"""
+
+    def __init__(self):
+        self.values = [None]
+        self._codes = {None: 0}
+
+    def code(self, value):
+        """Code d'une valeur, ajoutée à la table si nécessaire"""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values) - 1
+
+class PhoneBatch:
+    def __init__(self):
+        self._count = 0
+        self._valid = bytearray()
+        self._e164 = array('q')
+        # Numéros d'origine concaténés, avec la position de début de chacun
+        self._text = bytearray()
+        self._offsets = array('Q', [0])
+        self.tables = {name: StringTable() for name in INTERNED}
+        # Codes sur 16 bits, élargis à 32 bits si une table dépasse 65535 valeurs
+        self._codes = {name: array('H') for name in INTERNED}
+
+    def __len__(self):
+        return self._count
+
+    def _set_code(self, name, value):
+        """Ajoute le code d'une valeur à une colonne internée"""
+        code = self.tables[name].code(value)
+        column = self._codes[name]
+        if code > 0xFFFF and column.typecode == 'H':
+            column = self._codes[name] = array('I', column)
+        column.append(code)
+
+    def append(self, item):
+        """Ajoute un résultat de bulk_validate ({'input', 'valid', 'e164', 'carrier', ...})"""
+        index = self._count
+        if index % 8 == 0:
+            self._valid.append(0)
+
+        valid = item.get('valid', False)
+        if valid:
+            self._valid[index >> 3] |= 1 << (index & 7)
+            self._e164.append(int(item['e164'].lstrip('+')))
+        else:
+            self._e164.append(0)
+
+        self._text += item.get('input', '').encode('utf-8')
+        self._offsets.append(len(self._text))
+        for name in INTERNED:
+            self._set_code(name, item.get(name))
+        self._count += 1
+
+    def extend(self, items):
+        """Ajoute un flux de résultats de bulk_validate"""
+        for item in items:
+            self.append(item)
+
+    def _index(self, index):
+        """Index positif vérifié"""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Index hors du lot")
+        return index
+
+    def is_valid(self, index):
+        """Validité d'un numéro"""
+        index = self._index(index)
+        return bool(self._valid[index >> 3] & (1 << (index & 7)))
+
+    def input(self, index):
+        """Numéro tel qu'il a été soumis"""
+        index = self._index(index)
+        return self._text[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    def e164(self, index):
+        """Numéro au format E.164, ou None s'il n'est pas valide"""
+        value = self._e164[self._index(index)]
+        return f"+{value}" if value else None
+
+    def value(self, name, index):
+        """Valeur d'une colonne internée (country_code, carrier, location, timezone, error)"""
+        return self.tables[name].values[self._codes[name][self._index(index)]]
+
+    def searches(self, index):
+        """Liens de recherche d'un numéro, générés à la demande"""
+        value = self._e164[self._index(index)]
+        return search_links(str(value)) if value else {}
+
+    def __getitem__(self, index):
+        """PhoneResult complet d'un numéro (formats et liens recalculés à la lecture)"""
+        index = self._index(index)
+        number = self.input(index)
+        if not self.is_valid(index):
+            return PhoneResult(number, False, self.value('error', index) or 'Numéro invalide')
+
+        e164 = self.e164(index)
+        parsed = phonenumbers.parse(e164)
+        country_code = self.value('country_code', index)
+        return PhoneResult(
+            number, True,
+            formatted=phonenumbers.format_number(parsed, FORMATS['formatted']),
+            national=phonenumbers.format_number(parsed, FORMATS['national']),
+            e164=e164,
+            carrier=self.value('carrier', index),
+            location=self.value('location', index),
+            timezone=self.value('timezone', index),
+            country_code=country_code,
+            line_type=estimate_line_type(parsed, country_code),
+            searches=self.searches(index)
+        )
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def valid_count(self):
+        """Nombre de numéros valides"""
+        return sum(bin(byte).count("1") for byte in self._valid)
+
+    def rows(self):
+        """Lignes d'export (voir COLUMNS), sans formatage ni liens de recherche"""
+        tables = [(self.tables[name].values, self._codes[name]) for name in INTERNED]
+        for index in range(self._count):
+            value = self._e164[index]
+            yield (
+                self._text[self._offsets[index]:self._offsets[index + 1]].decode('utf-8'),
+                bool(self._valid[index >> 3] & (1 << (index & 7))),
+                f"+{value}" if value else None,
+                *(values[codes[index]] for values, codes in tables)
+            )
+
+    def to_csv(self, stream):
+        """Écrit le lot en CSV dans un fichier texte ouvert"""
+        writer = csv.writer(stream)
+        writer.writerow(COLUMNS)
+        writer.writerows(self.rows())
+        return self._count
+
+    def to_parquet(self, path):
+        """Écrit le lot en Parquet (pyarrow requis) ; les colonnes internées restent des dictionnaires"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Export Parquet indisponible: pip install pyarrow")
+
+        columns = {
+            'input': pa.array([self.input(index) for index in range(self._count)], type=pa.string()),
+            'valid': pa.array([self.is_valid(index) for index in range(self._count)], type=pa.bool_()),
+            'e164': pa.array([value or None for value in self._e164], type=pa.int64()),
+        }
+        for name in INTERNED:
+            indices = pa.array([code - 1 if code else None for code in self._codes[name]], type=pa.int32())
+            dictionary = pa.array(self.tables[name].values[1:], type=pa.string())
+            columns[name] = pa.DictionaryArray.from_arrays(indices, dictionary)
+        pq.write_table(pa.table(columns), path)
+        return self._count
+
+    def nbytes(self):
+        """Mémoire occupée par les colonnes (hors tables de chaînes)"""
+        return (
+            len(self._valid) + self._e164.itemsize * len(self._e164) + len(self._text)
+            + self._offsets.itemsize * len(self._offsets)
+            + sum(column.itemsize * len(column) for column in self._codes.values())
+        )
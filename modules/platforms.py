@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Catalogue des plateformes (modèles d'URL et règles de détection)
+by Dvrk_Smith
+"""
+
+import os
+import re
+import json
+import threading
+from string import Formatter
+
+CATALOGUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "platforms.json")
+
+# Règles appliquées aux sites sans "detect" : 200 = pris, 404 = disponible
+DEFAULT_DETECT = [
+    {"status": [200], "result": "taken"},
+    {"status": [404], "result": "available"}
+]
+RESULTS = {"taken": False, "available": True}
+
+# Variables autorisées dans les modèles d'URL de chaque section
+PLACEHOLDERS = {
+    "username": {"username"},
+    "name_search": {"name"},
+    "phone_search": {"phone", "digits"}
+}
+
+_LOADED = {}
+_LOAD_LOCK = threading.Lock()
+
+def _check_template(section, name, template):
+    """Vérifie qu'un modèle d'URL n'utilise que les variables de sa section"""
+    fields = {field for _, field, _, _ in Formatter().parse(template) if field is not None}
+    unknown = fields - PLACEHOLDERS[section]
+    if unknown:
+        raise ValueError(f"Catalogue: variable(s) inconnue(s) {sorted(unknown)} pour {name} ({section})")
+    return template
+
+class Rule:
+    def __init__(self, spec, patterns):
+        if spec.get("result") not in RESULTS:
+            raise ValueError(f"Catalogue: résultat de règle invalide {spec.get('result')!r}")
+        self.available = RESULTS[spec["result"]]
+        self.status = frozenset(spec["status"]) if "status" in spec else None
+        self.redirect = patterns.compile(spec["redirect"], text=True) if "redirect" in spec else None
+        self.body = patterns.compile(spec["body"]) if "body" in spec else None
+
+    def excluded(self, status, url):
+        """Vrai si le statut ou l'URL finale suffisent à écarter la règle"""
+        if self.status is not None and status not in self.status:
+            return True
+        if self.redirect is not None and not self.redirect.search(url or ""):
+            return True
+        return False
+
+class Platform:
+    def __init__(self, spec, patterns):
+        self.name = spec["name"]
+        self.template = _check_template("username", self.name, spec["url"])
+        self.rules = [Rule(rule, patterns) for rule in spec.get("detect", DEFAULT_DETECT)]
+        self.needs_body = any(rule.body is not None for rule in self.rules)
+        self.method = spec.get("method", "GET" if self.needs_body else "HEAD").upper()
+        # Plafond de lecture du corps (None = valeur par défaut du sondeur)
+        self.max_bytes = spec.get("max_bytes")
+
+    def url(self, username):
+        """URL du profil d'un username"""
+        return self.template.format(username=username)
+
+    def decide(self, status, url=None, body=b"", complete=True, start=0):
+        """Retourne (décidé, disponibilité) à partir d'un corps éventuellement partiel
+
+        Avec complete=False, la décision n'est définitive que si aucune règle
+        précédant la règle vérifiée ne peut encore l'être avec la suite du
+        corps. start permet de ne chercher les marqueurs que dans la partie
+        nouvellement reçue.
+        """
+        for rule in self.rules:
+            if rule.excluded(status, url):
+                continue
+            if rule.body is None or rule.body.search(body, start):
+                return True, rule.available
+            if not complete:
+                return False, None
+        return True, None
+
+    def evaluate(self, status, url=None, body=b""):
+        """Disponibilité selon la première règle vérifiée (None si aucune)"""
+        return self.decide(status, url, body)[1]
+
+class _Patterns:
+    """Compile chaque expression une seule fois, même partagée par plusieurs sites"""
+
+    def __init__(self):
+        self._compiled = {}
+
+    def compile(self, pattern, text=False):
+        key = (pattern, text)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = re.compile(pattern if text else pattern.encode("utf-8"))
+            self._compiled[key] = compiled
+        return compiled
+
+    def __len__(self):
+        return len(self._compiled)
+
+class Catalogue:
+    def __init__(self, data, path=None):
+        self.path = path
+        patterns = _Patterns()
+        self.platforms = [Platform(spec, patterns) for spec in data.get("username", [])]
+        self.name_search = [
+            (spec["name"], _check_template("name_search", spec["name"], spec["url"]))
+            for spec in data.get("name_search", [])
+        ]
+        self.phone_search = [
+            (spec["name"], _check_template("phone_search", spec["name"], spec["url"]))
+            for spec in data.get("phone_search", [])
+        ]
+        self.pattern_count = len(patterns)
+
+        names = [platform.name for platform in self.platforms]
+        if len(names) != len(set(names)):
+            raise ValueError("Catalogue: noms de plateformes en double")
+        self._by_name = {platform.name: platform for platform in self.platforms}
+
+    @classmethod
+    def load(cls, path=None):
+        """Lit et compile un catalogue JSON"""
+        path = path or CATALOGUE_PATH
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), path)
+
+    def __len__(self):
+        return len(self.platforms)
+
+    def platform(self, name):
+        """Plateforme par son nom"""
+        return self._by_name[name]
+
+    def username_urls(self, username):
+        """URLs de profil de toutes les plateformes"""
+        return {platform.name: platform.url(username) for platform in self.platforms}
+
+    def name_links(self, name):
+        """Liens de recherche d'un nom (déjà encodé pour une URL)"""
+        return {site: template.format(name=name) for site, template in self.name_search}
+
+    def phone_links(self, phone, digits):
+        """Liens de recherche d'un numéro (phone encodé pour une URL, digits chiffres seuls)"""
+        return {site: template.format(phone=phone, digits=digits) for site, template in self.phone_search}
+
+def load_catalogue(path=None):
+    """Catalogue compilé, chargé une seule fois par chemin"""
+    path = os.path.abspath(path or CATALOGUE_PATH)
+    with _LOAD_LOCK:
+        catalogue = _LOADED.get(path)
+        if catalogue is None:
+            catalogue = _LOADED[path] = Catalogue.load(path)
+        return catalogue
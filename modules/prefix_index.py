@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Index précalculé des préfixes téléphoniques (opérateur, région, fuseau)
+by Dvrk_Smith
+"""
+
+import os
+import sys
+import mmap
+import struct
+from bisect import bisect_right
+
+# En-tête : magic, version, langue, nombre de plages, nombre d'indicatifs, nombre de chaînes
+HEADER = struct.Struct("<4sH8sIII")
+MAGIC = b"OTPX"
+VERSION = 2
+# Longueur maximale d'un numéro E.164 (sans le +)
+E164_DIGITS = 15
+# Fuseau retourné par phonenumbers quand aucun préfixe ne correspond
+UNKNOWN_TIMEZONE = "Etc/Unknown"
+# Indicatif partagé par plusieurs pays : le pays dépend du numéro
+SHARED = 0xFFFFFFFF
+
+def _pick_lang(names, lang):
+    """Nom dans la langue demandée, avec repli sur l'anglais (même règle que phonenumbers)"""
+    if lang in names:
+        return names[lang]
+    if lang not in ("zh", "ja", "ko"):
+        return names.get("en")
+    return None
+
+def _country_name(region_code, lang):
+    """Nom du pays d'une région (même logique que phonenumbers.geocoder)"""
+    from phonenumbers.geodata.locale import LOCALE_DATA
+
+    names = LOCALE_DATA.get(region_code, {})
+    name = names.get(lang, "")
+    if name.startswith("*"):
+        name = names.get(name[1:], "")
+    return name
+
+def _longest(table, prefix, default=""):
+    """Valeur associée au plus long préfixe de prefix présent dans table"""
+    for length in range(len(prefix), 0, -1):
+        value = table.get(prefix[:length])
+        if value is not None:
+            return value
+    return default
+
+def _flatten(prefixes, resolve, empty):
+    """Transforme des préfixes imbriqués en plages disjointes [début, fin]
+
+    Chaque préfixe couvre tous les numéros E.164 qui commencent par lui ;
+    le plus long préfixe couvrant l'emporte. Retourne une liste triée de
+    (début de plage, valeurs), deux plages consécutives ayant des valeurs
+    différentes.
+    """
+    intervals = sorted(
+        (int(p.ljust(E164_DIGITS, "0")), len(p), int(p.ljust(E164_DIGITS, "9")), resolve(p))
+        for p in prefixes
+    )
+    segments = []
+
+    def emit(position, values):
+        if segments and segments[-1][0] == position:
+            segments.pop()
+        if not segments or segments[-1][1] != values:
+            segments.append((position, values))
+
+    stack = []
+    for start, _, end, values in intervals:
+        while stack and stack[-1][0] < start:
+            closed_end, _ = stack.pop()
+            emit(closed_end + 1, stack[-1][1] if stack else empty)
+        stack.append((end, values))
+        emit(start, values)
+
+    while stack:
+        closed_end, _ = stack.pop()
+        emit(closed_end + 1, stack[-1][1] if stack else empty)
+
+    return segments
+
+class PrefixIndex:
+    def __init__(self, path):
+        if sys.byteorder != "little":
+            raise ValueError("Index de préfixes non supporté sur cette architecture")
+
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, lang, count, countries, strings = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"Fichier d'index invalide ou ancien format, à reconstruire: {path}")
+        self.lang = lang.rstrip(b"\0").decode("ascii")
+        self.count = count
+
+        # Colonnes lues directement dans la projection mémoire
+        view = memoryview(self._map)
+        offset = _aligned(HEADER.size)
+        self._starts = view[offset:offset + 8 * count].cast("Q")
+        offset += 8 * count
+        self._values = view[offset:offset + 12 * count].cast("I")
+        offset += 12 * count
+        # Indicatif -> (nom du pays ou SHARED, fuseaux de l'indicatif), quelques centaines d'entrées
+        table = struct.unpack_from(f"<{3 * countries}I", self._map, offset)
+        offset += 12 * countries
+        self._string_offsets = view[offset:offset + 4 * (strings + 1)].cast("I")
+        self._strings_base = offset + 4 * (strings + 1)
+        self._decoded = {}
+        self._countries = {table[i]: (table[i + 1], table[i + 2]) for i in range(0, len(table), 3)}
+
+    def _string(self, string_id):
+        """Chaîne de la table des chaînes (0 = absente)"""
+        if not string_id:
+            return ""
+        text = self._decoded.get(string_id)
+        if text is None:
+            start = self._strings_base + self._string_offsets[string_id - 1]
+            end = self._strings_base + self._string_offsets[string_id]
+            text = self._map[start:end].decode("utf-8")
+            self._decoded[string_id] = text
+        return text
+
+    def lookup(self, e164):
+        """Retourne (opérateur, zone géographique, fuseau) du plus long préfixe d'un numéro E.164
+
+        Valeurs brutes des préfixes, sans les règles par type de numéro :
+        voir describe() pour les réponses de phonenumbers.
+        """
+        digits = e164.lstrip("+")
+        position = bisect_right(self._starts, int(digits.ljust(E164_DIGITS, "0")[:E164_DIGITS])) - 1
+        if position < 0:
+            return "", "", UNKNOWN_TIMEZONE
+        base = position * 3
+        return (
+            self._string(self._values[base]),
+            self._string(self._values[base + 1]),
+            self._string(self._values[base + 2])
+        )
+
+    def describe(self, parsed_number):
+        """(opérateur, localisation, fuseau) d'un numéro parsé, identiques aux fonctions phonenumbers
+
+        carrier.name_for_number, geocoder.description_for_number et le premier
+        fuseau de timezone.time_zones_for_number dépendent du type du numéro :
+        opérateur des seuls mobiles, pays et fuseaux de l'indicatif pour les
+        numéros non géographiques. Le type est calculé une fois ; les pays
+        des indicatifs partagés (+1, +7, +212...) et les jetons mobiles (+54 9)
+        passent par geocoder.
+        """
+        import phonenumbers
+
+        number_type = phonenumbers.number_type(parsed_number)
+        if number_type == phonenumbers.PhoneNumberType.UNKNOWN:
+            return "", "", UNKNOWN_TIMEZONE
+
+        country_code = parsed_number.country_code
+        carrier_name, area, zone = self.lookup(
+            str(country_code) + phonenumbers.national_significant_number(parsed_number)
+        )
+        if number_type not in (phonenumbers.PhoneNumberType.MOBILE,
+                               phonenumbers.PhoneNumberType.FIXED_LINE_OR_MOBILE,
+                               phonenumbers.PhoneNumberType.PAGER):
+            carrier_name = ""
+
+        country_name, country_zone = self._countries[country_code]
+        if not phonenumbers.is_number_type_geographical(number_type, country_code):
+            area = ""
+            zone = self._string(country_zone)
+        else:
+            token = phonenumbers.country_mobile_token(country_code)
+            if token and phonenumbers.national_significant_number(parsed_number).startswith(token):
+                return carrier_name, self._geocode(parsed_number), zone
+
+        if not area:
+            area = self._geocode(parsed_number) if country_name == SHARED else self._string(country_name)
+        return carrier_name, area, zone
+
+    def _geocode(self, parsed_number):
+        """Localisation calculée par phonenumbers (cas que l'index ne tranche pas seul)"""
+        from phonenumbers import geocoder
+
+        return geocoder.description_for_number(parsed_number, self.lang)
+
+    def close(self):
+        """Libère la projection mémoire"""
+        self._starts.release()
+        self._values.release()
+        self._string_offsets.release()
+        self._map.close()
+        self._file.close()
+
+    @classmethod
+    def build(cls, path, lang="fr"):
+        """Construit l'index depuis les métadonnées de phonenumbers"""
+        import phonenumbers
+        from phonenumbers.carrierdata import CARRIER_DATA
+        from phonenumbers.geodata import GEOCODE_DATA
+        from phonenumbers.tzdata import TIMEZONE_DATA
+
+        carriers = {p: _pick_lang(names, lang) for p, names in CARRIER_DATA.items()}
+        regions = {p: _pick_lang(names, lang) for p, names in GEOCODE_DATA.items()}
+        # Premier fuseau du préfixe ("" si le préfixe n'a aucun fuseau)
+        timezones = {p: zones[0] if zones else "" for p, zones in TIMEZONE_DATA.items()}
+
+        def resolve(prefix):
+            return (_longest(carriers, prefix), _longest(regions, prefix),
+                    _longest(timezones, prefix, UNKNOWN_TIMEZONE))
+
+        prefixes = set(carriers) | set(regions) | set(timezones)
+        segments = _flatten(prefixes, resolve, ("", "", UNKNOWN_TIMEZONE))
+
+        strings = {}
+        def intern(text):
+            if not text:
+                return 0
+            if text not in strings:
+                strings[text] = len(strings) + 1
+            return strings[text]
+
+        values = [tuple(intern(v) for v in vals) for _, vals in segments]
+
+        # Nom du pays (SHARED si l'indicatif couvre plusieurs pays) et fuseau de
+        # l'indicatif, retournés par phonenumbers pour les numéros non géographiques
+        countries = []
+        for country_code, region_codes in sorted(phonenumbers.COUNTRY_CODE_TO_REGION_CODE.items()):
+            code = str(country_code)
+            shortest = min(2, len(code))
+            zone = next((timezones[code[:length]] for length in range(len(code), shortest - 1, -1)
+                         if code[:length] in timezones), UNKNOWN_TIMEZONE)
+            name = intern(_country_name(region_codes[0], lang)) if len(region_codes) == 1 else SHARED
+            countries.append((country_code, name, intern(zone)))
+
+        blobs = [text.encode("utf-8") for text in strings]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            header = HEADER.pack(MAGIC, VERSION, lang.encode("ascii")[:8], len(segments), len(countries), len(blobs))
+            f.write(header.ljust(_aligned(HEADER.size), b"\0"))
+            f.write(struct.pack(f"<{len(segments)}Q", *(start for start, _ in segments)))
+            f.write(struct.pack(f"<{3 * len(values)}I", *(v for triple in values for v in triple)))
+            f.write(struct.pack(f"<{3 * len(countries)}I", *(v for entry in countries for v in entry)))
+            f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+            f.write(b"".join(blobs))
+        os.replace(tmp_path, path)
+        return cls(path)
+
+def _aligned(size, alignment=8):
+    """Arrondit size au multiple d'alignement supérieur"""
+    return (size + alignment - 1) // alignment * alignment
+
+# Construction en ligne de commande
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "data/prefix_fr.idx"
+    language = sys.argv[2] if len(sys.argv) > 2 else "fr"
+    index = PrefixIndex.build(target, language)
+    print(f"Index construit: {target} ({index.count} plages, langue {index.lang})")
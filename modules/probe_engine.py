@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Moteur de sondage concurrent
+by Dvrk_Smith
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlsplit
+
+class ProbeEngine:
+    def __init__(self, max_workers=16, per_host=4):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self._host_slots = {}
+        self._lock = threading.Lock()
+
+    def _slot_for(self, url):
+        """Retourne le sémaphore limitant les requêtes simultanées vers un hôte"""
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _guarded(self, func, url):
+        """Exécute une sonde en respectant la limite par hôte"""
+        with self._slot_for(url):
+            return func(url)
+
+    def run(self, jobs, func):
+        """Sonde toutes les URLs en parallèle
+
+        jobs: dict {clé: url}, func: fonction appelée avec l'URL.
+        Retourne {clé: résultat} dans l'ordre des jobs ; une exception levée
+        par func est retournée telle quelle comme résultat.
+        """
+        if not jobs:
+            return {}
+
+        workers = min(self.max_workers, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {key: pool.submit(self._guarded, func, url) for key, url in jobs.items()}
+
+        results = {}
+        for key, future in futures.items():
+            error = future.exception()
+            results[key] = error if error is not None else future.result()
+        return results
+
+    def run_ordered(self, jobs, func, deadline=None):
+        """Sonde des URLs par ordre de priorité, avec dédoublonnage et échéance
+
+        jobs: liste de (clé, url) du plus au moins prioritaire. Une URL déjà
+        planifiée n'est sondée qu'une fois, son résultat servant à toutes ses
+        clés. Les sondes sont lancées dans l'ordre, jamais plus de max_workers
+        à la fois : passée l'échéance (time.monotonic()), plus aucune n'est
+        lancée et les clés restantes sont absentes du résultat.
+        """
+        keys_by_url = {}
+        for key, url in jobs:
+            keys_by_url.setdefault(url, []).append(key)
+        urls = iter(keys_by_url)
+
+        results = {}
+        pending = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            while True:
+                while len(pending) < self.max_workers and (deadline is None or time.monotonic() < deadline):
+                    url = next(urls, None)
+                    if url is None:
+                        break
+                    pending[pool.submit(self._guarded, func, url)] = url
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = pending.pop(future)
+                    error = future.exception()
+                    for key in keys_by_url[url]:
+                        results[key] = error if error is not None else future.result()
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return results
+
+def stream_map(func, items, max_workers=8, max_pending=None):
+    """Applique func à un flux d'éléments en parallèle
+
+    Au plus max_pending éléments sont en cours à la fois, ce qui permet de
+    traiter des flux de taille arbitraire. Produit des tuples (élément,
+    résultat ou exception) dans l'ordre de fin.
+    """
+    max_pending = max_pending or max_workers * 2
+    items = iter(items)
+    pending = {}
+    exhausted = False
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[pool.submit(func, item)] = item
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, error if error is not None else future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Planification des appels d'API : débit par clé, rotation des clés et respect de Retry-After
+by Dvrk_Smith
+"""
+
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Pause appliquée à une clé après un 429 sans en-tête Retry-After (doublée à chaque 429 consécutif)
+DEFAULT_RETRY_AFTER = 1.0
+
+# Débits prudents par clé des fournisseurs connus, appliqués aux clés déclarées sans
+# débit configuré dans APP_CONFIG['rate_limits'] ({'rate': None} : aucune limite)
+DEFAULT_LIMITS = {
+    'hibp': {'rate': 10 / 60, 'burst': 1},   # Abonnement HIBP le plus bas : 10 requêtes/minute
+    'hunter': {'rate': 10, 'burst': 10},
+    'emailrep': {'rate': 1, 'burst': 1},
+    'numverify': {'rate': 1, 'burst': 1},
+}
+
+class RateLimitedError(Exception):
+    """Aucune clé du fournisseur ne sera disponible avant max_wait secondes"""
+
+    def __init__(self, provider, wait):
+        super().__init__(f"Limite de débit {provider}: prochaine clé disponible dans {wait:.0f} s")
+        self.provider = provider
+        self.wait = wait
+
+def parse_retry_after(value, now=None):
+    """Délai d'un en-tête Retry-After (secondes ou date HTTP), ou None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max((date - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+class TokenBucket:
+    """Seau de jetons : rate jetons par seconde, au plus burst d'avance (rate None : illimité)"""
+
+    def __init__(self, rate=None, burst=1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        # Clé suspendue jusqu'à cette date après un 429
+        self.paused_until = 0.0
+        self.strikes = 0
+
+    def wait(self, now):
+        """Secondes avant qu'un jeton soit disponible"""
+        pause = self.paused_until - now
+        if self.rate is None:
+            return max(pause, 0.0)
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        missing = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+        return max(pause, missing, 0.0)
+
+    def take(self):
+        """Consomme un jeton (après wait() == 0)"""
+        if self.rate is not None:
+            self.tokens -= 1
+
+    def pause(self, now, seconds):
+        """Suspend la clé et vide le seau : le fournisseur vient de refuser un appel"""
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = now
+
+class _KeyPool:
+    def __init__(self, keys, rate, burst):
+        self.keys = list(keys) or [None]
+        self.buckets = [TokenBucket(rate, burst) for _ in self.keys]
+        self.cursor = 0
+        self.stats = {'calls': 0, 'throttled': 0, 'requeued': 0, 'rejected': 0, 'waited': 0.0}
+
+class RateLimiter:
+    def __init__(self, limits=None, max_wait=60.0, max_retries=5):
+        # limits : {fournisseur: {'rate': appels par seconde et par clé, 'burst': avance permise}}
+        self.limits = limits or {}
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _new_pool(self, provider, keys):
+        """Pool de clés avec le débit configuré du fournisseur (débit par défaut pour des clés déclarées)"""
+        keys = [key for key in keys if key]
+        limit = self.limits.get(provider)
+        if limit is None and keys:
+            limit = DEFAULT_LIMITS.get(provider)
+        limit = limit or {}
+        return _KeyPool(keys, limit.get('rate'), limit.get('burst', 1))
+
+    def set_keys(self, provider, keys):
+        """Déclare les clés d'un fournisseur (une chaîne, une liste, ou None pour un appel sans clé)"""
+        if isinstance(keys, str):
+            keys = [keys]
+        pool = self._new_pool(provider, keys or [])
+        with self._lock:
+            self._pools[provider] = pool
+
+    def add_key(self, provider, key):
+        """Ajoute une clé aux clés déjà déclarées d'un fournisseur (sans effet si elle y est)"""
+        with self._lock:
+            pool = self._pools.get(provider)
+            keys = [k for k in pool.keys if k] if pool is not None else []
+            if key in keys:
+                return
+            if pool is None or not keys:
+                # Première clé : le débit par défaut du fournisseur s'applique
+                self._pools[provider] = self._new_pool(provider, [key])
+                return
+            limit = self.limits.get(provider) or DEFAULT_LIMITS.get(provider) or {}
+            pool.keys.append(key)
+            pool.buckets.append(TokenBucket(limit.get('rate'), limit.get('burst', 1)))
+
+    def keys(self, provider):
+        """Clés d'un fournisseur"""
+        return [key for key in self._pool(provider).keys if key]
+
+    def _pool(self, provider):
+        """Pool de clés d'un fournisseur, créé sans clé s'il n'a pas été déclaré"""
+        with self._lock:
+            pool = self._pools.get(provider)
+            if pool is None:
+                pool = self._pools[provider] = self._new_pool(provider, [])
+            return pool
+
+    def acquire(self, provider, key=None):
+        """Attend qu'une clé ait un jeton et la retourne (index, clé), à tour de rôle entre les clés
+
+        Avec key, seule cette clé (déjà déclarée) est utilisée.
+        """
+        pool = self._pool(provider)
+        index = self._acquire(provider, pool, key)
+        return index, pool.keys[index]
+
+    def _acquire(self, provider, pool, key=None):
+        """Index d'une clé du pool disposant d'un jeton, après attente si nécessaire"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = None
+                for step in range(len(pool.keys)):
+                    index = (pool.cursor + step) % len(pool.keys)
+                    if key is not None and pool.keys[index] != key:
+                        continue
+                    wait = pool.buckets[index].wait(now)
+                    if wait <= 0:
+                        pool.buckets[index].take()
+                        if key is None:
+                            pool.cursor = (index + 1) % len(pool.keys)
+                        pool.stats['calls'] += 1
+                        return index
+                    delay = wait if delay is None else min(delay, wait)
+                if delay is None:
+                    raise KeyError(f"Clé non déclarée pour {provider}")
+                if delay > self.max_wait:
+                    pool.stats['rejected'] += 1
+                    raise RateLimitedError(provider, delay)
+                pool.stats['waited'] += delay
+            time.sleep(delay)
+
+    def throttled(self, provider, index, retry_after=None, pool=None):
+        """Suspend une clé refusée par le fournisseur (429), Retry-After compris
+
+        pool : celui de l'appel en cours (set_keys a pu le remplacer depuis).
+        """
+        pool = pool or self._pool(provider)
+        with self._lock:
+            bucket = pool.buckets[index]
+            bucket.strikes += 1
+            if retry_after is None:
+                retry_after = DEFAULT_RETRY_AFTER * 2 ** (bucket.strikes - 1)
+            bucket.pause(time.monotonic(), retry_after)
+            pool.stats['throttled'] += 1
+
+    def _succeeded(self, pool, index):
+        """Réinitialise la pause progressive d'une clé après un appel accepté"""
+        with self._lock:
+            pool.buckets[index].strikes = 0
+
+    def call(self, provider, send, key=None):
+        """Appelle send(clé) au débit permis ; un 429 remet l'appel en file sur la prochaine clé libre
+
+        send retourne une réponse HTTP. Après max_retries refus, la dernière
+        réponse 429 est retournée telle quelle. Avec key, la clé est ajoutée
+        aux clés du fournisseur et seule elle est utilisée. Le pool lu au
+        départ sert jusqu'au bout, même si set_keys le remplace entre-temps.
+        """
+        if key:
+            self.add_key(provider, key)
+        pool = self._pool(provider)
+        attempt = 0
+        while True:
+            index = self._acquire(provider, pool, key or None)
+            response = send(pool.keys[index])
+            if response.status_code != 429:
+                self._succeeded(pool, index)
+                return response
+            self.throttled(provider, index, parse_retry_after(response.headers.get('Retry-After')), pool)
+            attempt += 1
+            if attempt > self.max_retries:
+                return response
+            with self._lock:
+                pool.stats['requeued'] += 1
+
+    def stats(self):
+        """Appels, refus (429), remises en file et attente cumulée par fournisseur"""
+        with self._lock:
+            return {
+                provider: dict(pool.stats, keys=len([key for key in pool.keys if key]))
+                for provider, pool in self._pools.items()
+            }
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Affichage des résultats d'analyse (terminal, silencieux, JSON)
+by Dvrk_Smith
+"""
+
+import sys
+import json
+from colorama import Fore
+
+from modules.resilience import CIRCUIT_OPEN
+from modules.results import TIME_BUDGET
+
+class QuietRenderer:
+    """N'affiche rien : les résultats sont seulement retournés"""
+
+    def email(self, result):
+        pass
+
+    def phone(self, result):
+        pass
+
+    def username(self, result):
+        pass
+
+    def variants(self, full_name, results):
+        pass
+
+    def social_media(self, full_name, platforms):
+        pass
+
+    def google_dorks(self, dorks, target=None):
+        pass
+
+    def phone_search(self, phone_number, searches):
+        pass
+
+    def search(self, result):
+        pass
+
+class JSONRenderer(QuietRenderer):
+    """Une ligne JSON par résultat"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def _write(self, kind, target, data):
+        self.stream.write(json.dumps({'type': kind, 'target': target, 'results': data},
+                                     ensure_ascii=False, default=str) + "\n")
+        self.stream.flush()
+
+    def email(self, result):
+        self._write('email', result.email, result.to_dict())
+
+    def phone(self, result):
+        self._write('phone', result.number, result.to_dict())
+
+    def username(self, result):
+        self._write('username', result.username, result.to_dict())
+
+    def variants(self, full_name, results):
+        self._write('name', full_name, {result.username: result.to_dict() for result in results})
+
+    def social_media(self, full_name, platforms):
+        self._write('social_media', full_name, platforms)
+
+    def google_dorks(self, dorks, target=None):
+        self._write('dorks', target, dorks)
+
+    def phone_search(self, phone_number, searches):
+        self._write('phone_search', phone_number, searches)
+
+    def search(self, result):
+        self._write(result.search_type, result.query, result.to_dict())
+
+class TerminalRenderer:
+    """Affichage coloré du mode interactif"""
+
+    def email(self, result):
+        """Fuites, réputation, existence et recommandations d'un email"""
+        print(Fore.YELLOW + f"\n🔍 Analyse approfondie de: {result.email}")
+        print(Fore.CYAN + "─" * 50)
+
+        # 1. Vérification HIBP
+        print(Fore.WHITE + "1. Vérification des fuites de données...")
+        hibp_result = result.hibp
+
+        if result.breached:
+            print(Fore.RED + f"   ❌ TROUVÉ dans {hibp_result['breach_count']} fuite(s)")
+            for breach in hibp_result['breaches'][:3]:
+                print(Fore.YELLOW + f"     • {breach.get('Name')} ({breach.get('BreachDate')})")
+        else:
+            print(Fore.GREEN + "   ✅ Aucune fuite trouvée")
+
+        # 2. Vérification réputation
+        print(Fore.WHITE + "\n2. Vérification réputation...")
+        rep_result = result.reputation
+
+        if 'reputation' in rep_result:
+            rep = rep_result['reputation']
+            if rep in ['high', 'good']:
+                print(Fore.GREEN + f"   ✅ Bonne réputation")
+            elif rep == 'medium':
+                print(Fore.YELLOW + f"   ⚠️  Réputation moyenne")
+            else:
+                print(Fore.RED + f"   ❌ Mauvaise réputation")
+
+        # 3. Vérification existence
+        print(Fore.WHITE + "\n3. Vérification existence...")
+        hunter_result = result.hunter
+
+        if 'exists' in hunter_result:
+            if hunter_result['exists']:
+                print(Fore.GREEN + "   ✅ Email valide et actif")
+                if 'score' in hunter_result:
+                    print(Fore.WHITE + f"     Score de confiance: {hunter_result['score']}%")
+            else:
+                print(Fore.YELLOW + "   ⚠️  Email peut-être invalide")
+
+        # Recommandations
+        print(Fore.CYAN + "\n" + "═" * 50)
+        print(Fore.GREEN + "🛡️  RECOMMANDATIONS DE SÉCURITÉ:")
+
+        if result.breached:
+            print(Fore.WHITE + "1. CHANGEZ VOTRE MOT DE PASSE immédiatement")
+            print(Fore.WHITE + "2. Activez l'authentification à deux facteurs")
+            print(Fore.WHITE + "3. Utilisez un gestionnaire de mots de passe")
+            print(Fore.WHITE + "4. Surveillez vos comptes financiers")
+        else:
+            print(Fore.WHITE + "1. Continuez à utiliser des mots de passe uniques")
+            print(Fore.WHITE + "2. Activez la 2FA si ce n'est pas fait")
+            print(Fore.WHITE + "3. Évitez de réutiliser les mots de passe")
+
+    def phone(self, result):
+        """Validation, informations et recherches d'un numéro"""
+        print(Fore.YELLOW + f"\n🔍 Analyse du numéro: {result.number}")
+        print(Fore.CYAN + "═" * 50)
+
+        # 1. Validation
+        print(Fore.WHITE + "1. Validation du format...")
+
+        if not result.valid:
+            print(Fore.RED + f"   ❌ {result.error}")
+            return
+
+        print(Fore.GREEN + f"   ✅ Numéro valide")
+        print(Fore.WHITE + f"     Format international: {result.formatted}")
+        print(Fore.WHITE + f"     Format national: {result.national}")
+
+        # 2. Informations de base
+        print(Fore.WHITE + "\n2. Informations de base...")
+        print(Fore.WHITE + f"   📞 Opérateur: {result.carrier}")
+        print(Fore.WHITE + f"   📍 Localisation: {result.location}")
+        print(Fore.WHITE + f"   🕐 Fuseau horaire: {result.timezone}")
+
+        # 3. Type de ligne (estimation basée sur le format)
+        print(Fore.WHITE + "\n3. Analyse du type...")
+
+        if result.line_type == "mobile":
+            print(Fore.WHITE + "   📱 Type: Mobile")
+        elif result.line_type == "fixe":
+            print(Fore.WHITE + "   🏠 Type: Fixe")
+        elif result.line_type:
+            print(Fore.WHITE + "   ❓ Type: Indéterminé")
+        else:
+            print(Fore.WHITE + "   🌍 Pays: " + result.country_code)
+
+        # 4. Recherches en ligne
+        print(Fore.WHITE + "\n4. Recherches en ligne disponibles...")
+
+        for site, url in result.searches.items():
+            print(Fore.CYAN + f"   🔗 {site}: {url}")
+
+        # 5. Conseils de sécurité
+        print(Fore.CYAN + "\n" + "═" * 50)
+        print(Fore.GREEN + "🛡️  CONSEILS DE SÉCURITÉ:")
+
+        print(Fore.WHITE + "1. Vérifiez le numéro sur les sites anti-spam")
+        print(Fore.WHITE + "2. Ne partagez pas d'informations sensibles")
+        print(Fore.WHITE + "3. BloqueZ les numéros suspects")
+        print(Fore.WHITE + "4. Signalez les appels malveillants")
+
+    def username(self, result):
+        """Disponibilité d'un username site par site"""
+        print(Fore.YELLOW + f"\n🔍 Vérification du username '{result.username}'...")
+        print(Fore.CYAN + "═" * 50)
+
+        print(Fore.WHITE + "📊 RÉSULTATS DE DISPONIBILITÉ:")
+        print(Fore.CYAN + "─" * 40)
+
+        for site in result.sites:
+            if site.skipped == CIRCUIT_OPEN:
+                print(Fore.YELLOW + f"   ⏭️  {site.site}: Ignoré (hôte indisponible)")
+            elif site.status is None:
+                print(Fore.YELLOW + f"   ⚠️  {site.site}: Impossible à vérifier")
+            elif site.available is False:
+                print(Fore.RED + f"   ❌ {site.site}: Utilisé ({site.url})")
+            elif site.available:
+                print(Fore.GREEN + f"   ✅ {site.site}: Disponible")
+            else:
+                print(Fore.YELLOW + f"   ⚠️  {site.site}: Statut {site.status}")
+
+    def variants(self, full_name, results):
+        """Comptes trouvés pour chaque variante de username d'un nom"""
+        print(Fore.YELLOW + f"\n🔍 Vérification des variantes de username pour '{full_name}'...")
+        print(Fore.CYAN + "═" * 50)
+
+        print(Fore.WHITE + "📊 COMPTES TROUVÉS PAR VARIANTE:")
+        print(Fore.CYAN + "─" * 40)
+
+        for result in results:
+            taken = [site.site for site in result.taken()]
+            skipped = sum(1 for site in result.sites if site.skipped == TIME_BUDGET)
+            if taken:
+                print(Fore.RED + f"   👤 {result.username}: {len(taken)} compte(s) ({', '.join(taken)})")
+            else:
+                print(Fore.GREEN + f"   ✅ {result.username}: aucun compte trouvé")
+            if skipped:
+                print(Fore.YELLOW + f"      ⏭️  {skipped} site(s) non vérifié(s) (temps écoulé)")
+
+    def social_media(self, full_name, platforms):
+        """Liens de recherche d'un nom sur les réseaux sociaux"""
+        print(Fore.YELLOW + f"\n🔍 Recherche de '{full_name}'...")
+        print(Fore.CYAN + "═" * 50)
+
+        print(Fore.WHITE + "📊 PLATEFORMES DISPONIBLES:")
+        print(Fore.CYAN + "─" * 40)
+
+        for platform, url in platforms.items():
+            print(Fore.WHITE + f"   🔗 {platform}: {url}")
+
+    def google_dorks(self, dorks, target=None):
+        """Google Dorks à copier dans le moteur de recherche"""
+        print(Fore.YELLOW + f"\n🔎 GOOGLE DORKS GÉNÉRÉS:")
+        print(Fore.CYAN + "═" * 50)
+
+        print(Fore.WHITE + "📋 COPIEZ CES REQUÊTES DANS GOOGLE:\n")
+
+        for i, dork in enumerate(dorks[:15], 1):  # Limite à 15 dorks
+            print(Fore.CYAN + f"   {i:2d}. " + Fore.WHITE + dork)
+
+    def phone_search(self, phone_number, searches):
+        """Liens de recherche d'un numéro"""
+        print(Fore.YELLOW + f"\n🔍 Recherche pour le numéro: {phone_number}")
+        print(Fore.CYAN + "═" * 50)
+
+        print(Fore.WHITE + "🔗 RECHERCHES DISPONIBLES:")
+        print(Fore.CYAN + "─" * 40)
+
+        for site, url in searches.items():
+            print(Fore.WHITE + f"   🌐 {site}: {url}")
+
+    def search(self, result):
+        """Recherche complète (nom, username ou numéro) et conseils"""
+        print(Fore.CYAN + "\n" + "═" * 60)
+        print(Fore.CYAN + "🔍 RECHERCHE COMPLÈTE OSINT")
+        print(Fore.CYAN + "═" * 60)
+
+        if result.search_type == "name":
+            print(Fore.WHITE + f"\n📊 RECHERCHE POUR LE NOM: {result.query}")
+
+            print(Fore.YELLOW + "\n1. RECHERCHE RÉSEAUX SOCIAUX...")
+            self.social_media(result.query, result.social_media)
+
+            print(Fore.YELLOW + "\n2. GÉNÉRATION GOOGLE DORKS...")
+            self.google_dorks(result.google_dorks, result.query)
+
+            print(Fore.YELLOW + "\n3. VÉRIFICATION USERNAME...")
+            self.variants(result.query, result.usernames)
+
+        elif result.search_type == "phone":
+            print(Fore.WHITE + f"\n📊 RECHERCHE POUR LE NUMÉRO: {result.query}")
+            self.phone_search(result.query, result.phone_search)
+
+        elif result.search_type == "username":
+            print(Fore.WHITE + f"\n📊 RECHERCHE POUR USERNAME: {result.query}")
+            for username in result.usernames:
+                self.username(username)
+
+        # Conseils de sécurité
+        print(Fore.CYAN + "\n" + "═" * 60)
+        print(Fore.GREEN + "🛡️  CONSEILS DE PROTECTION DE LA VIE PRIVÉE:")
+
+        print(Fore.WHITE + "1. Vérifiez vos paramètres de confidentialité")
+        print(Fore.WHITE + "2. Utilisez des noms différents sur chaque plateforme")
+        print(Fore.WHITE + "3. Évitez de partager trop d'informations personnelles")
+        print(Fore.WHITE + "4. Utilisez l'authentification à deux facteurs")
+        print(Fore.WHITE + "5. Revoyez régulièrement vos traces numériques")
+
+RENDERERS = {
+    'rich': TerminalRenderer,
+    'quiet': QuietRenderer,
+    'json': JSONRenderer,
+}
+
+def get_renderer(renderer=None):
+    """Renderer à partir d'un nom ('rich', 'quiet', 'json') ou d'une instance ; terminal par défaut"""
+    if renderer is None:
+        return TerminalRenderer()
+    if isinstance(renderer, str):
+        if renderer not in RENDERERS:
+            raise ValueError(f"Affichage inconnu: {renderer}")
+        return RENDERERS[renderer]()
+    return renderer
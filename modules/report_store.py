@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Stockage des rapports en segments compressés (ajout seul)
+by Dvrk_Smith
+"""
+
+import os
+import json
+import zlib
+import struct
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows : pas de verrou entre processus, un seul processus doit écrire
+    fcntl = None
+
+from modules.correlation import extract_terms, normalize_term
+
+# En-tête d'enregistrement : type (1 octet) + taille compressée (4 octets)
+RECORD_HEADER = struct.Struct("<BI")
+RECORD_REPORT = 1
+RECORD_PAYLOAD = 2
+
+def _canonical(data):
+    """Sérialisation JSON stable (clés triées) pour la déduplication"""
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+class ReportStore:
+    def __init__(self, root="reports", segment_size=64 * 1024 * 1024, compress_level=6):
+        self.root = root
+        self.segment_size = segment_size
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._writer = None
+        self._segment = 0
+
+        os.makedirs(root, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS reports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                target TEXT NOT NULL,
+                date TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS reports_target ON reports (target);
+            CREATE TABLE IF NOT EXISTS payloads (
+                hash TEXT PRIMARY KEY,
+                segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL
+            );
+            -- Index inversé : éléments (emails, numéros, usernames, fuites, profils) → rapports
+            CREATE TABLE IF NOT EXISTS terms (
+                id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                UNIQUE (kind, value)
+            );
+            CREATE TABLE IF NOT EXISTS mentions (
+                term INTEGER NOT NULL,
+                report INTEGER NOT NULL,
+                PRIMARY KEY (term, report)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS mentions_report ON mentions (report, term);
+            -- Anciens rapports JSON (reports/report_*.json) déjà importés
+            CREATE TABLE IF NOT EXISTS legacy (
+                name TEXT PRIMARY KEY,
+                report INTEGER NOT NULL
+            );
+        """)
+        self._db.commit()
+        # Verrou partagé par tous les processus qui écrivent dans root (CLI, service, lots)
+        self._lock_file = open(os.path.join(root, ".lock"), "a")
+
+        names = os.listdir(root)
+        segments = [int(name[8:14]) for name in names
+                    if name.startswith("segment_") and name.endswith(".seg")]
+        self._segment = max(segments) if segments else 1
+        self.import_legacy(sorted(name for name in names
+                                  if name.startswith("report_") and name.endswith(".json")))
+
+    def _segment_path(self, segment):
+        """Chemin du fichier d'un segment"""
+        return os.path.join(self.root, f"segment_{segment:06d}.seg")
+
+    @contextmanager
+    def _writing(self):
+        """Verrou d'écriture : threads du processus puis autres processus (fcntl) ; annule la transaction en cas d'erreur"""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            except Exception:
+                # Transaction incomplète : rien n'est indexé (les octets ajoutés restent orphelins)
+                self._db.rollback()
+                raise
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _open_writer(self):
+        """Ouvre le dernier segment, y compris s'il a été créé par un autre processus (verrou pris)"""
+        segment = self._segment
+        while os.path.exists(self._segment_path(segment + 1)):
+            segment += 1
+        if self._writer is None or segment != self._segment:
+            if self._writer is not None:
+                self._writer.close()
+            self._segment = segment
+            self._writer = open(self._segment_path(segment), "ab")
+
+    def _append(self, kind, data):
+        """Ajoute un enregistrement compressé et retourne (segment, offset, taille) (verrou d'écriture pris)"""
+        blob = zlib.compress(_canonical(data).encode("utf-8"), self.compress_level)
+        record = RECORD_HEADER.pack(kind, len(blob)) + blob
+
+        self._open_writer()
+        # Taille réelle du fichier : d'autres processus ont pu y écrire
+        offset = os.fstat(self._writer.fileno()).st_size
+        # Rotation quand le segment courant atteint sa taille maximale
+        if offset and offset + len(record) > self.segment_size:
+            self._writer.close()
+            self._segment += 1
+            self._writer = open(self._segment_path(self._segment), "ab")
+            offset = os.fstat(self._writer.fileno()).st_size
+
+        self._writer.write(record)
+        self._writer.flush()
+        return self._segment, offset, len(record)
+
+    def _read(self, segment, offset, length):
+        """Lit et décompresse un enregistrement"""
+        with open(self._segment_path(segment), "rb") as f:
+            f.seek(offset)
+            record = f.read(length)
+        _, size = RECORD_HEADER.unpack_from(record)
+        return json.loads(zlib.decompress(record[RECORD_HEADER.size:RECORD_HEADER.size + size]))
+
+    def append(self, target, date, results, **meta):
+        """Enregistre un rapport et retourne son identifiant
+
+        Chaque résultat de fournisseur est stocké une seule fois, adressé par
+        son empreinte SHA-256 : deux rapports identiques ne coûtent que leur
+        enveloppe.
+        """
+        terms = extract_terms(target, results)
+        with self._writing():
+            report_id = self._store(target, date, results, meta, terms)
+            self._db.commit()
+            return report_id
+
+    def _store(self, target, date, results, meta, terms):
+        """Écrit un rapport et l'indexe, sans valider la transaction (verrou d'écriture pris)"""
+        if isinstance(results, dict):
+            sections = results
+        else:
+            sections = {None: results}
+
+        refs = {}
+        for name, payload in sections.items():
+            digest = hashlib.sha256(_canonical(payload).encode("utf-8")).hexdigest()
+            known = self._db.execute("SELECT 1 FROM payloads WHERE hash = ?", (digest,)).fetchone()
+            if not known:
+                location = self._append(RECORD_PAYLOAD, payload)
+                self._db.execute(
+                    "INSERT INTO payloads (hash, segment, offset, length) VALUES (?, ?, ?, ?)",
+                    (digest,) + location
+                )
+            refs[name] = digest
+
+        envelope = dict(meta, target=target, date=date, refs=refs)
+        if not isinstance(results, dict):
+            envelope["refs"] = refs[None]
+        location = self._append(RECORD_REPORT, envelope)
+
+        cursor = self._db.execute(
+            "INSERT INTO reports (target, date, segment, offset, length) VALUES (?, ?, ?, ?, ?)",
+            (target, date) + location
+        )
+        self._index_terms(cursor.lastrowid, terms)
+        return cursor.lastrowid
+
+    def import_legacy(self, names):
+        """Importe une fois les rapports JSON de l'ancien format (report_*.json de root)
+
+        Les fichiers sont conservés ; un fichier illisible est ignoré. Retourne
+        le nombre de rapports importés.
+        """
+        with self._lock:
+            done = {row[0] for row in self._db.execute("SELECT name FROM legacy")}
+        count = 0
+        for name in names:
+            if name in done:
+                continue
+            try:
+                with open(os.path.join(self.root, name), encoding="utf-8") as f:
+                    report = json.load(f)
+                target, date, results = report.pop("target"), report.pop("date"), report.pop("results")
+            except (OSError, ValueError, KeyError, AttributeError):
+                continue
+            terms = extract_terms(target, results)
+            with self._writing():
+                if self._db.execute("SELECT 1 FROM legacy WHERE name = ?", (name,)).fetchone():
+                    continue
+                report_id = self._store(target, date, results, report, terms)
+                self._db.execute("INSERT INTO legacy (name, report) VALUES (?, ?)", (name, report_id))
+                self._db.commit()
+            count += 1
+        return count
+
+    def _index_terms(self, report_id, terms):
+        """Ajoute les éléments d'un rapport à l'index inversé (verrou déjà pris)"""
+        self._db.executemany("INSERT OR IGNORE INTO terms (kind, value) VALUES (?, ?)", terms)
+        self._db.executemany(
+            "INSERT OR IGNORE INTO mentions (term, report) "
+            "SELECT id, ? FROM terms WHERE kind = ? AND value = ?",
+            [(report_id, kind, value) for kind, value in terms]
+        )
+
+    def _payload(self, digest):
+        """Lit un résultat de fournisseur par son empreinte"""
+        row = self._db.execute(
+            "SELECT segment, offset, length FROM payloads WHERE hash = ?", (digest,)
+        ).fetchone()
+        return self._read(*row) if row else None
+
+    def get(self, report_id):
+        """Relit un rapport complet par son identifiant"""
+        with self._lock:
+            return self._get(report_id)
+
+    def _get(self, report_id):
+        """Relit un rapport (verrou déjà pris)"""
+        row = self._db.execute(
+            "SELECT segment, offset, length FROM reports WHERE id = ?", (report_id,)
+        ).fetchone()
+        if not row:
+            return None
+
+        envelope = self._read(*row)
+        refs = envelope.pop("refs")
+        if isinstance(refs, dict):
+            envelope["results"] = {name: self._payload(digest) for name, digest in refs.items()}
+        else:
+            envelope["results"] = self._payload(refs)
+        envelope["id"] = report_id
+        return envelope
+
+    def find(self, target):
+        """Liste des (identifiant, date) des rapports d'une cible, du plus récent au plus ancien"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, date FROM reports WHERE target = ? ORDER BY id DESC", (target,)
+            ).fetchall()
+
+    def latest(self, target):
+        """Dernier rapport d'une cible"""
+        reports = self.find(target)
+        return self.get(reports[0][0]) if reports else None
+
+    def mentions(self, kind, value, limit=None):
+        """Rapports mentionnant un élément : liste de (identifiant, cible, date), du plus récent au plus ancien
+
+        kind : email, phone (normalisé en E.164), username, breach, profile ou name.
+        """
+        value = normalize_term(kind, value)
+        if value is None:
+            return []
+        query = (
+            "SELECT r.id, r.target, r.date FROM terms t "
+            "JOIN mentions m ON m.term = t.id JOIN reports r ON r.id = m.report "
+            "WHERE t.kind = ? AND t.value = ? ORDER BY r.id DESC"
+        )
+        params = (kind, value)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            return self._db.execute(query, params).fetchall()
+
+    def terms(self, report_id):
+        """Éléments indexés d'un rapport : liste de (type, valeur)"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT t.kind, t.value FROM mentions m JOIN terms t ON t.id = m.term "
+                "WHERE m.report = ? ORDER BY t.kind, t.value", (report_id,)
+            ).fetchall()
+
+    def related(self, report_id):
+        """Autres rapports partageant au moins un élément : {identifiant: [(type, valeur), ...]}"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT other.report, t.kind, t.value FROM mentions own "
+                "JOIN mentions other ON other.term = own.term AND other.report != own.report "
+                "JOIN terms t ON t.id = own.term "
+                "WHERE own.report = ? ORDER BY other.report DESC, t.kind, t.value", (report_id,)
+            ).fetchall()
+        related = {}
+        for other, kind, value in rows:
+            related.setdefault(other, []).append((kind, value))
+        return related
+
+    def reindex(self):
+        """Reconstruit l'index inversé depuis les rapports déjà stockés ; retourne leur nombre
+
+        Une seule transaction : les lecteurs voient l'ancien index jusqu'à la
+        fin, et une interruption le laisse intact.
+        """
+        with self._writing():
+            ids = [row[0] for row in self._db.execute("SELECT id FROM reports ORDER BY id")]
+            self._db.execute("DELETE FROM mentions")
+            self._db.execute("DELETE FROM terms")
+            for report_id in ids:
+                report = self._get(report_id)
+                self._index_terms(report_id, extract_terms(report["target"], report["results"]))
+            self._db.commit()
+        return len(ids)
+
+    def stats(self):
+        """Nombre de rapports, de résultats uniques, d'éléments indexés et de segments"""
+        with self._lock:
+            reports = self._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+            payloads = self._db.execute("SELECT COUNT(*) FROM payloads").fetchone()[0]
+            terms = self._db.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        return {'reports': reports, 'payloads': payloads, 'terms': terms, 'segments': self._segment}
+
+    def close(self):
+        """Ferme le segment courant et l'index"""
+        with self._lock:
+            if self._writer:
+                self._writer.close()
+                self._writer = None
+            self._lock_file.close()
+            self._db.close()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Délais adaptatifs par hôte et disjoncteur
+by Dvrk_Smith
+"""
+
+import time
+import threading
+from collections import deque
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+
+# Marqueur des résultats non obtenus car l'hôte était court-circuité
+CIRCUIT_OPEN = "circuit_open"
+
+CLOSED = "fermé"
+OPEN = "ouvert"
+HALF_OPEN = "semi-ouvert"
+
+class CircuitOpenError(RequestsConnectionError):
+    """Requête refusée sans appel réseau : l'hôte est en panne ou nous bloque"""
+
+    def __init__(self, host, retry_in):
+        super().__init__(f"Hôte {host} indisponible, ignoré (nouvel essai dans {retry_in:.0f} s)")
+        self.host = host
+        self.retry_in = retry_in
+
+def skipped_result(error):
+    """Résultat d'un fournisseur court-circuité"""
+    return {"error": str(error), "skipped": CIRCUIT_OPEN}
+
+def is_failure(error=None, status=None):
+    """Vrai pour ce qui indique un hôte en panne : délai dépassé, connexion refusée, 5xx"""
+    if error is not None:
+        return isinstance(error, (Timeout, RequestsConnectionError))
+    return status is not None and status >= 500
+
+class _HostState:
+    def __init__(self, window):
+        self.latencies = deque(maxlen=window)
+        self.timeout = None
+        self.state = CLOSED
+        self.failures = 0
+        self.opens = 0
+        self.open_until = 0.0
+        self.trial_running = False
+        self.short_circuits = 0
+
+class Resilience:
+    def __init__(self, min_timeout=1.0, multiplier=3.0, percentile=0.95, window=100, min_samples=10,
+                 failure_threshold=5, cooldown=30.0, max_cooldown=300.0):
+        self.min_timeout = min_timeout
+        self.multiplier = multiplier
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, host):
+        """État d'un hôte (verrou déjà pris)"""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.window)
+        return state
+
+    def before(self, host):
+        """Autorise une requête ou lève CircuitOpenError
+
+        Après le délai de refroidissement, une seule requête d'essai passe ;
+        les autres restent court-circuitées jusqu'à son résultat.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._host(host)
+            if state.state == CLOSED:
+                return
+            if state.state == OPEN and now >= state.open_until:
+                state.state = HALF_OPEN
+            if state.state == HALF_OPEN and not state.trial_running:
+                state.trial_running = True
+                return
+            state.short_circuits += 1
+            raise CircuitOpenError(host, max(state.open_until - now, 0))
+
+    def timeout_for(self, host, requested):
+        """Délai de la requête : réduit au multiple du percentile observé, jamais allongé"""
+        if not isinstance(requested, (int, float)):
+            return requested
+        with self._lock:
+            adaptive = self._host(host).timeout
+        if adaptive is None:
+            return requested
+        return min(requested, adaptive)
+
+    def record(self, host, seconds, timeout=None, error=None, status=None):
+        """Enregistre le résultat d'une requête autorisée par before()"""
+        with self._lock:
+            state = self._host(host)
+            state.trial_running = False
+
+            if is_failure(error, status):
+                # Un dépassement compte comme une latence au moins égale au délai
+                if isinstance(error, Timeout) and isinstance(timeout, (int, float)):
+                    self._sample(state, timeout)
+                state.failures += 1
+                # Les requêtes parties avant l'ouverture ne prolongent pas le refroidissement
+                if state.state == HALF_OPEN or (state.state == CLOSED and state.failures >= self.failure_threshold):
+                    self._open(state)
+                return
+            if error is not None:
+                # Erreur sans rapport avec la santé de l'hôte (URL invalide...)
+                return
+
+            self._sample(state, seconds)
+            state.failures = 0
+            state.opens = 0
+            state.state = CLOSED
+
+    def _sample(self, state, seconds):
+        """Ajoute une latence et recalcule le délai adaptatif (verrou déjà pris)"""
+        state.latencies.append(seconds)
+        if len(state.latencies) < self.min_samples:
+            return
+        ordered = sorted(state.latencies)
+        observed = ordered[min(int(self.percentile * len(ordered)), len(ordered) - 1)]
+        state.timeout = max(self.min_timeout, observed * self.multiplier)
+
+    def _open(self, state):
+        """Ouvre le disjoncteur, avec un refroidissement qui double à chaque réouverture"""
+        state.opens += 1
+        cooldown = min(self.cooldown * 2 ** (state.opens - 1), self.max_cooldown)
+        state.state = OPEN
+        state.open_until = time.monotonic() + cooldown
+
+    def stats(self):
+        """État, délai adaptatif et requêtes court-circuitées par hôte"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                host: {
+                    'state': state.state,
+                    'timeout': state.timeout,
+                    'samples': len(state.latencies),
+                    'failures': state.failures,
+                    'short_circuits': state.short_circuits,
+                    'retry_in': max(state.open_until - now, 0) if state.state != CLOSED else 0
+                }
+                for host, state in self._hosts.items()
+            }
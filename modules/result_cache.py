@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Cache des résultats des fournisseurs (mémoire LRU + SQLite)
+by Dvrk_Smith
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# Durée de vie par fournisseur (secondes)
+DEFAULT_TTLS = {
+    'hibp': 24 * 3600,
+    'emailrep': 6 * 3600,
+    'hunter': 7 * 24 * 3600,
+    'numverify': 30 * 24 * 3600,
+}
+
+# Statuts 4xx qui ne disent rien de la cible (clé refusée, délai, limite de débit)
+UNCACHED_STATUSES = (401, 403, 408, 429)
+
+def is_definitive(value):
+    """Réponse définitive du fournisseur : un résultat, ou un refus 4xx portant sur la cible
+
+    Les erreurs sans statut HTTP (délai dépassé, connexion, disjoncteur,
+    limite de débit locale) et les statuts 5xx sont passagères.
+    """
+    if not (isinstance(value, dict) and 'error' in value):
+        return True
+    status = value.get('status')
+    return isinstance(status, int) and 400 <= status < 500 and status not in UNCACHED_STATUSES
+
+class ResultCache:
+    def __init__(self, path="data/cache.sqlite3", memory_size=1024, disk_size=100000,
+                 ttls=None, default_ttl=3600, negative_ttl=300):
+        self.path = path
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._db = None
+        self._disk_rows = 0
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    provider TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires REAL NOT NULL,
+                    stored REAL NOT NULL,
+                    PRIMARY KEY (provider, key)
+                )
+            """)
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_stored ON results (stored)")
+            self._db.commit()
+            self._disk_rows = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _count(self, provider, name):
+        """Incrémente un compteur de statistiques (verrou déjà pris)"""
+        counters = self._stats.setdefault(provider, {'memory_hits': 0, 'disk_hits': 0, 'misses': 0})
+        counters[name] += 1
+
+    def _ttl_for(self, provider, value):
+        """TTL d'un résultat : court pour les refus définitifs (cache négatif)"""
+        if isinstance(value, dict) and 'error' in value:
+            return self.negative_ttl
+        return self.ttls.get(provider, self.default_ttl)
+
+    def _remember(self, provider, key, value, expires):
+        """Place une entrée en mémoire en évinçant la moins récente (verrou déjà pris)"""
+        self._memory[(provider, key)] = (expires, value)
+        self._memory.move_to_end((provider, key))
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, provider, key):
+        """Retourne (trouvé, valeur) pour une clé normalisée"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get((provider, key))
+            if entry and entry[0] > now:
+                self._memory.move_to_end((provider, key))
+                self._count(provider, 'memory_hits')
+                return True, entry[1]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires FROM results WHERE provider = ? AND key = ?",
+                    (provider, key)
+                ).fetchone()
+                if row and row[1] > now:
+                    value = json.loads(row[0])
+                    self._remember(provider, key, value, row[1])
+                    self._count(provider, 'disk_hits')
+                    return True, value
+
+            self._count(provider, 'misses')
+            return False, None
+
+    def set(self, provider, key, value):
+        """Enregistre un résultat avec le TTL de son fournisseur"""
+        now = time.time()
+        expires = now + self._ttl_for(provider, value)
+        with self._lock:
+            self._remember(provider, key, value, expires)
+            if self._db is None:
+                return
+
+            known = self._db.execute(
+                "SELECT 1 FROM results WHERE provider = ? AND key = ?", (provider, key)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (provider, key, value, expires, stored) VALUES (?, ?, ?, ?, ?)",
+                (provider, key, json.dumps(value), expires, now)
+            )
+            # Un remplacement ne change pas le nombre de lignes
+            if known is None:
+                self._disk_rows += 1
+            if self._disk_rows > self.disk_size:
+                self._evict_disk(now)
+            self._db.commit()
+
+    def delete(self, provider, key):
+        """Oublie une entrée (mémoire et disque) pour forcer le prochain appel réseau"""
+        with self._lock:
+            self._memory.pop((provider, key), None)
+            if self._db is None:
+                return
+            removed = self._db.execute(
+                "DELETE FROM results WHERE provider = ? AND key = ?", (provider, key)
+            ).rowcount
+            self._disk_rows -= removed
+            self._db.commit()
+
+    def _evict_disk(self, now):
+        """Supprime les entrées expirées puis les plus anciennes (verrou déjà pris)"""
+        self._db.execute("DELETE FROM results WHERE expires <= ?", (now,))
+        excess = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.disk_size
+        if excess > 0:
+            # Garde une marge de 10% pour ne pas évincer à chaque écriture
+            excess += self.disk_size // 10
+            self._db.execute(
+                "DELETE FROM results WHERE rowid IN (SELECT rowid FROM results ORDER BY stored LIMIT ?)",
+                (excess,)
+            )
+        self._disk_rows = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get_or_fetch(self, provider, key, fetch):
+        """Retourne le résultat en cache ou appelle fetch() et le mémorise"""
+        hit, value = self.get(provider, key)
+        if hit:
+            return value
+        value = fetch()
+        # Les échecs passagers (hôte en panne, délai, 429...) ne sont pas mis en cache
+        if is_definitive(value):
+            self.set(provider, key, value)
+        return value
+
+    def stats(self):
+        """Statistiques de hits/misses par fournisseur et au total"""
+        with self._lock:
+            providers = {name: dict(counters) for name, counters in self._stats.items()}
+            memory_entries = len(self._memory)
+            disk_entries = self._disk_rows
+
+        total = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+        for counters in providers.values():
+            for name in total:
+                total[name] += counters[name]
+        lookups = sum(total.values())
+        total['hit_rate'] = (total['memory_hits'] + total['disk_hits']) / lookups if lookups else 0.0
+
+        return {
+            'providers': providers,
+            'total': total,
+            'memory_entries': memory_entries,
+            'disk_entries': disk_entries
+        }
+
+    def clear(self):
+        """Vide le cache (mémoire et disque)"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+                self._disk_rows = 0
+
+    def close(self):
+        """Ferme la base SQLite"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Résultats d'analyse typés, indépendants de l'affichage
+by Dvrk_Smith
+
+Les analyseurs retournent ces objets ; les renderers (modules.renderers)
+les affichent, et to_dict() donne la forme JSON des rapports et du mode batch.
+"""
+
+from typing import Optional
+from dataclasses import dataclass, field
+
+# Marqueur des sondes non lancées faute de temps (voir UsernameSearch.probe_variants)
+TIME_BUDGET = "time_budget"
+
+@dataclass(slots=True)
+class PhoneResult:
+    number: str
+    valid: bool
+    error: Optional[str] = None
+    formatted: Optional[str] = None
+    national: Optional[str] = None
+    e164: Optional[str] = None
+    carrier: Optional[str] = None
+    location: Optional[str] = None
+    timezone: Optional[str] = None
+    country_code: Optional[str] = None
+    line_type: Optional[str] = None
+    searches: dict = field(default_factory=dict)
+
+    def to_dict(self):
+        """Forme JSON (celle des rapports sauvegardés)"""
+        if not self.valid:
+            return {'valid': False, 'error': self.error}
+        return {
+            'valid': True,
+            'formatted': self.formatted,
+            'national': self.national,
+            'e164': self.e164,
+            'carrier': self.carrier,
+            'location': self.location,
+            'timezone': self.timezone,
+            'country_code': self.country_code,
+            'line_type': self.line_type,
+            'searches': self.searches
+        }
+
+@dataclass(slots=True)
+class EmailResult:
+    email: str
+    # Réponses des fournisseurs, telles que retournées par check_hibp, check_emailrep, check_hunter
+    hibp: dict
+    reputation: dict
+    hunter: dict
+
+    @property
+    def breached(self):
+        """Adresse trouvée dans au moins une fuite"""
+        return bool(self.hibp.get('breached'))
+
+    @property
+    def breach_names(self):
+        """Noms des fuites contenant l'adresse"""
+        return [breach.get('Name') for breach in self.hibp.get('breaches', [])]
+
+    def to_dict(self):
+        """Forme JSON (celle des rapports sauvegardés)"""
+        return {'hibp': self.hibp, 'reputation': self.reputation, 'hunter': self.hunter}
+
+@dataclass(slots=True)
+class SiteResult:
+    site: str
+    url: str
+    # True : disponible, False : utilisé, None : non vérifié
+    available: Optional[bool] = None
+    status: Optional[int] = None
+    skipped: Optional[str] = None
+
+    def to_dict(self):
+        """Forme JSON : {"available", "url"} (+ "skipped" si la sonde n'a pas eu lieu)"""
+        result = {"available": self.available, "url": self.url}
+        if self.skipped:
+            result["skipped"] = self.skipped
+        return result
+
+@dataclass(slots=True)
+class UsernameResult:
+    username: str
+    sites: list = field(default_factory=list)
+
+    def taken(self):
+        """Sites où le username est utilisé"""
+        return [site for site in self.sites if site.available is False]
+
+    def to_dict(self):
+        """Forme JSON : {site: {"available", "url"}}"""
+        return {site.site: site.to_dict() for site in self.sites}
+
+@dataclass(slots=True)
+class SearchResult:
+    query: str
+    search_type: str
+    social_media: Optional[dict] = None
+    google_dorks: Optional[list] = None
+    phone_search: Optional[dict] = None
+    # Variantes de username classées (recherche par nom) ou username recherché seul
+    usernames: list = field(default_factory=list)
+
+    def to_dict(self):
+        """Forme JSON (celle des rapports sauvegardés)"""
+        results = {}
+        if self.social_media is not None:
+            results['social_media'] = self.social_media
+        if self.google_dorks is not None:
+            results['google_dorks'] = self.google_dorks
+        if self.phone_search is not None:
+            results['phone_search'] = self.phone_search
+        if self.search_type == "name":
+            results['username_variants'] = {result.username: result.to_dict() for result in self.usernames}
+        if self.usernames:
+            results['username_check'] = self.usernames[0].to_dict()
+        elif self.search_type == "name":
+            results['username_check'] = {}
+        return results
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Service HTTP/JSON local : analyseurs chargés une fois, requêtes traitées en parallèle
+by Dvrk_Smith
+
+    GET  /email?email=jean@exemple.fr
+    GET  /phone?number=+33612345678
+    GET  /username?username=jdupont
+    GET  /name?name=Jean+Dupont[&email=...]
+    GET  /correlate?kind=breach&value=Adobe
+    GET  /health, /stats, /metrics
+    POST /email (corps JSON {"email": ...}), de même pour les autres analyses
+"""
+
+import json
+import time
+import hmac
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from modules.correlation import EMAIL, KINDS
+from modules.normalize import valid_email
+
+# Taille maximale d'un corps de requête POST
+MAX_BODY = 64 * 1024
+
+class ServiceError(Exception):
+    """Erreur renvoyée au client avec un code HTTP"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service = None
+
+    def log_message(self, format, *args):
+        """Pas de journal par requête (voir /stats et /metrics)"""
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        """Envoie une réponse JSON (ou texte)"""
+        if content_type == "application/json":
+            payload = json.dumps(body, ensure_ascii=False, default=str).encode("utf-8")
+        else:
+            payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _params(self):
+        """Paramètres de la requête : chaîne de requête, complétée par le corps JSON d'un POST"""
+        parts = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        if self.command == "POST":
+            length = self.headers.get("Content-Length") or "0"
+            if not length.strip().isdigit():
+                raise ServiceError(400, "En-tête Content-Length invalide")
+            length = int(length)
+            if length > MAX_BODY:
+                raise ServiceError(413, "Corps de requête trop volumineux")
+            if length:
+                try:
+                    body = json.loads(self.rfile.read(length))
+                except ValueError:
+                    raise ServiceError(400, "Corps JSON invalide")
+                if not isinstance(body, dict):
+                    raise ServiceError(400, "Le corps JSON doit être un objet")
+                params.update(body)
+        return parts.path.rstrip("/") or "/", params
+
+    def _authorized(self):
+        """Vérifie le jeton (Authorization: Bearer ...) s'il est configuré"""
+        token = self.service.token
+        if not token:
+            return True
+        given = self.headers.get("Authorization", "")
+        return hmac.compare_digest(given.encode("utf-8"), f"Bearer {token}".encode("utf-8"))
+
+    def _handle(self):
+        """Traite une requête GET ou POST"""
+        start = time.perf_counter()
+        status = 500
+        try:
+            if not self._authorized():
+                raise ServiceError(401, "Jeton manquant ou invalide")
+            path, params = self._params()
+            body, content_type = self.service.dispatch(path, params)
+            status = 200
+        except ServiceError as e:
+            status, body, content_type = e.status, {"error": str(e)}, "application/json"
+        except Exception as e:
+            body, content_type = {"error": str(e)}, "application/json"
+        try:
+            self._send(status, body, content_type)
+        finally:
+            self.service.record(status, time.perf_counter() - start)
+
+    do_GET = _handle
+    do_POST = _handle
+
+class ServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+class OSINTService:
+    def __init__(self, email_checker=None, phone_analyzer=None, username_searcher=None,
+                 report_store=None, metrics=None, stats=None, token=None):
+        self.email_checker = email_checker
+        self.phone_analyzer = phone_analyzer
+        self.username_searcher = username_searcher
+        self.report_store = report_store
+        self.metrics = metrics
+        # Fonction retournant les statistiques de l'application (transport, cache...)
+        self.stats = stats
+        self.token = token
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._requests = {'total': 0, 'errors': 0, 'seconds': 0.0}
+        self.server = None
+
+        self.routes = {
+            '/health': (None, self.health),
+            '/stats': (None, self.service_stats),
+            '/metrics': (None, self.prometheus),
+            '/email': ('email', self.email),
+            '/phone': ('number', self.phone),
+            '/username': ('username', self.username),
+            '/name': ('name', self.name),
+            '/correlate': ('value', self.correlate),
+        }
+
+    def warm_up(self):
+        """Charge les données paresseuses (métadonnées phonenumbers, catalogue) avant la première requête"""
+        if self.phone_analyzer is not None:
+            self.phone_analyzer.validate_phone("+33612345678")
+        if self.username_searcher is not None:
+            self.username_searcher.catalogue
+
+    def dispatch(self, path, params):
+        """Appelle l'analyse d'un chemin ; retourne (corps, type de contenu)"""
+        route = self.routes.get(path)
+        if route is None:
+            raise ServiceError(404, f"Chemin inconnu: {path}")
+        required, handler = route
+        if required and not str(params.get(required, "")).strip():
+            raise ServiceError(400, f"Paramètre manquant: {required}")
+        return handler(params)
+
+    def _require(self, analyzer, label):
+        """Analyseur chargé, ou erreur 503"""
+        if analyzer is None:
+            raise ServiceError(503, f"Module {label} non chargé")
+        return analyzer
+
+    def email(self, params):
+        """Vérifications d'un email (fuites, réputation, existence)"""
+        checker = self._require(self.email_checker, "email")
+        email = str(params['email']).strip()
+        if not valid_email(email):
+            raise ServiceError(400, f"Format d'email invalide: {email}")
+        return dict(checker.check_all(email), email=email), "application/json"
+
+    def phone(self, params):
+        """Analyse d'un numéro"""
+        analyzer = self._require(self.phone_analyzer, "téléphone")
+        return analyzer.collect(str(params['number']).strip()), "application/json"
+
+    def username(self, params):
+        """Disponibilité d'un username sur les plateformes"""
+        searcher = self._require(self.username_searcher, "recherche")
+        return searcher.collect(str(params['username']).strip(), "username"), "application/json"
+
+    def name(self, params):
+        """Recherche par nom complet (variantes de username comprises)"""
+        searcher = self._require(self.username_searcher, "recherche")
+        email = str(params.get('email') or "").strip() or None
+        return searcher.collect(str(params['name']).strip(), "name", email=email), "application/json"
+
+    def correlate(self, params):
+        """Rapports sauvegardés mentionnant un élément"""
+        store = self._require(self.report_store, "rapports")
+        kind = params.get('kind', EMAIL)
+        if kind not in KINDS:
+            raise ServiceError(400, f"Type inconnu: {kind} (attendu: {', '.join(KINDS)})")
+        limit = params.get('limit', 100)
+        if isinstance(limit, str) and limit.isdigit():
+            limit = int(limit)
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit <= 0:
+            raise ServiceError(400, "Paramètre limit invalide: entier positif attendu")
+        reports = store.mentions(kind, str(params['value']), limit)
+        return [{'id': report_id, 'target': target, 'date': date} for report_id, target, date in reports], \
+            "application/json"
+
+    def health(self, params):
+        """État du service et modules chargés"""
+        loaded = {
+            'email': self.email_checker is not None,
+            'phone': self.phone_analyzer is not None,
+            'username': self.username_searcher is not None,
+            'reports': self.report_store is not None,
+        }
+        return {'status': 'ok', 'uptime': time.time() - self.started, 'modules': loaded}, "application/json"
+
+    def service_stats(self, params):
+        """Requêtes servies et statistiques de l'application"""
+        with self._lock:
+            requests = dict(self._requests)
+        requests['avg_ms'] = requests['seconds'] * 1000 / requests['total'] if requests['total'] else 0.0
+        body = {'requests': requests}
+        if self.stats is not None:
+            body.update(self.stats())
+        return body, "application/json"
+
+    def prometheus(self, params):
+        """Métriques HTTP au format Prometheus"""
+        if self.metrics is None:
+            raise ServiceError(503, "Métriques indisponibles")
+        return self.metrics.to_prometheus(), "text/plain"
+
+    def record(self, status, seconds):
+        """Compte une requête servie"""
+        with self._lock:
+            self._requests['total'] += 1
+            self._requests['seconds'] += seconds
+            if status >= 400:
+                self._requests['errors'] += 1
+
+    def start(self, host="127.0.0.1", port=8770):
+        """Ouvre le port d'écoute ; retourne l'adresse effective (hôte, port)"""
+        handler = type("BoundServiceHandler", (ServiceHandler,), {"service": self})
+        self.server = ServiceServer((host, port), handler)
+        return self.server.server_address[:2]
+
+    def serve_forever(self):
+        """Traite les requêtes jusqu'à shutdown()"""
+        self.server.serve_forever()
+
+    def shutdown(self):
+        """Arrête le service"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
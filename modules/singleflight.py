@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Regroupement des appels identiques simultanés (single-flight)
+by Dvrk_Smith
+"""
+
+import threading
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {'calls': 0, 'shared': 0}
+
+    def do(self, key, func):
+        """Appelle func() une seule fois pour tous les appelants simultanés d'une même clé
+
+        Les appelants arrivés pendant l'appel en cours attendent et reçoivent
+        le même résultat (ou la même exception). Rien n'est conservé une fois
+        l'appel terminé : c'est le rôle du cache de résultats.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+                self._stats['calls'] += 1
+            else:
+                leader = False
+                self._stats['shared'] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """Appels réellement exécutés et appels servis par un appel déjà en cours"""
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
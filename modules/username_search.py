@@ -4,96 +4,235 @@ Module de recherche de noms et usernames
 by Dvrk_Smith
 """
 
-import requests
 import re
 import json
-from colorama import Fore, Style
+import time
+import threading
 from urllib.parse import quote
+from modules.probe_engine import ProbeEngine
+from modules.platforms import Catalogue, load_catalogue
+from modules.singleflight import SingleFlight
+from modules.username_variants import username_variants
+from modules.http_transport import get_default_transport
+from modules.resilience import CIRCUIT_OPEN, CircuitOpenError
+from modules.results import TIME_BUDGET, SiteResult, UsernameResult, SearchResult
+from modules.renderers import get_renderer
+
+# Lecture des pages de profil en flux
+STREAM_CHUNK = 8192
+MAX_BODY_BYTES = 64 * 1024
+# Reste du corps lu pour rendre la connexion au pool (au-delà : fermeture)
+DRAIN_BYTES = 16 * 1024
+# Marge relue à chaque morceau pour un marqueur à cheval sur deux morceaux
+MARKER_OVERLAP = 1024
 
 class UsernameSearch:
-    def __init__(self):
+    def __init__(self, max_workers=16, per_host=4, transport=None, catalogue=None,
+                 max_body_bytes=MAX_BODY_BYTES, max_variants=8, variant_budget=30.0, conditional=None):
         self.timeout = 10
+        self.transport = transport or get_default_transport()
+        self.probe_timeout = 5
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (compatible; OSINT-Tool-Pro/1.2; by Dvrk_Smith)'
         }
+        self.engine = ProbeEngine(max_workers=max_workers, per_host=per_host)
+        # Une seule sonde pour les URLs identiques demandées en même temps
+        self.flights = SingleFlight()
+        # Chemin ou Catalogue déjà chargé ; lu au premier usage
+        self._catalogue = catalogue
+        self.max_body_bytes = max_body_bytes
+        self._stream_lock = threading.Lock()
+        self.stream_stats = {'probes': 0, 'bytes_read': 0, 'early_stops': 0, 'capped': 0, 'closed': 0}
+        # Variantes sondées pour un nom et temps alloué à leur sondage (secondes)
+        self.max_variants = max_variants
+        self.variant_budget = variant_budget
+        # Validateurs HTTP (ConditionalStore) : une page inchangée (304) n'est pas relue
+        self.conditional = conditional
+    
+    @property
+    def catalogue(self):
+        """Catalogue des plateformes, chargé à la demande"""
+        if not isinstance(self._catalogue, Catalogue):
+            self._catalogue = load_catalogue(self._catalogue)
+        return self._catalogue
     
-    def search_social_media(self, full_name):
+    def social_media_links(self, full_name):
+        """Liens de recherche d'un nom complet sur les réseaux sociaux"""
+        return self.catalogue.name_links(quote(full_name))
+    
+    def search_social_media(self, full_name, renderer=None):
         """Recherche un nom complet sur les réseaux sociaux"""
-        print(Fore.YELLOW + f"\n🔍 Recherche de '{full_name}'...")
-        print(Fore.CYAN + "═" * 50)
-        
-        results = {}
+        platforms = self.social_media_links(full_name)
+        get_renderer(renderer).social_media(full_name, platforms)
+        return platforms
+    
+    def username_urls(self, username):
+        """URLs de profil à sonder pour un username"""
+        return self.catalogue.username_urls(username)
+    
+    def _probe_username(self, username):
+        """Sonde tous les sites et retourne [(site, url, (statut, disponibilité) ou exception)]"""
+        catalogue = self.catalogue
+        sites = catalogue.username_urls(username)
+        platforms = {url: catalogue.platform(site) for site, url in sites.items()}
+        outcomes = self.engine.run(
+            sites, lambda url: self.flights.do(url, lambda: self._probe_site(platforms[url], url))
+        )
+        return [(site, url, outcomes[site]) for site, url in sites.items()]
+    
+    def _site_result(self, site, url, outcome):
+        """Résultat d'un site ; marqué 'skipped' si l'hôte était court-circuité ou la sonde non lancée"""
+        if outcome is None:
+            return SiteResult(site, url, skipped=TIME_BUDGET)
+        if isinstance(outcome, CircuitOpenError):
+            return SiteResult(site, url, skipped=CIRCUIT_OPEN)
+        if isinstance(outcome, Exception):
+            return SiteResult(site, url)
+        status, available = outcome
+        return SiteResult(site, url, available, status)
+    
+    def probe(self, username):
+        """Vérifie la disponibilité d'un username ; retourne un UsernameResult"""
+        return UsernameResult(username, [
+            self._site_result(site, url, outcome)
+            for site, url, outcome in self._probe_username(username)
+        ])
+    
+    def probe_username(self, username):
+        """Vérifie la disponibilité d'un username, sans affichage : {site: {"available", "url"}}"""
+        return self.probe(username).to_dict()
+    
+    def variant_results(self, full_name, email=None, max_variants=None, time_budget=None):
+        """Sonde les variantes de username d'un nom sur tous les sites
+
+        La matrice variantes × sites est planifiée d'un bloc : les variantes
+        les plus probables passent en premier, et celles qui n'ont pas pu être
+        lancées dans le temps alloué sont marquées 'skipped'. Retourne une
+        liste de UsernameResult dans l'ordre de classement.
+        """
+        variants = username_variants(full_name, email, limit=max_variants or self.max_variants)
+        budget = self.variant_budget if time_budget is None else time_budget
+        deadline = time.monotonic() + budget if budget else None
         
-        # Liste des plateformes à vérifier
+        catalogue = self.catalogue
+        matrix = {variant: catalogue.username_urls(variant) for variant in variants}
         platforms = {
-            "Google": f"https://www.google.com/search?q={quote(full_name)}",
-            "Facebook": f"https://www.facebook.com/public/{quote(full_name)}",
-            "LinkedIn": f"https://www.linkedin.com/search/results/people/?keywords={quote(full_name)}",
-            "Twitter": f"https://twitter.com/search?q={quote(full_name)}&f=user",
-            "Instagram": f"https://www.instagram.com/web/search/topsearch/?query={quote(full_name)}",
-            "GitHub": f"https://github.com/search?q={quote(full_name)}&type=users",
-            "TikTok": f"https://www.tiktok.com/search/user?q={quote(full_name)}",
-            "YouTube": f"https://www.youtube.com/results?search_query={quote(full_name)}&sp=EgIQAg%253D%253D"
+            url: catalogue.platform(site)
+            for sites in matrix.values() for site, url in sites.items()
+        }
+        jobs = [((variant, site), url) for variant, sites in matrix.items() for site, url in sites.items()]
+        outcomes = self.engine.run_ordered(
+            jobs, lambda url: self.flights.do(url, lambda: self._probe_site(platforms[url], url)), deadline
+        )
+        return [
+            UsernameResult(variant, [
+                self._site_result(site, url, outcomes.get((variant, site))) for site, url in sites.items()
+            ])
+            for variant, sites in matrix.items()
+        ]
+    
+    def probe_variants(self, full_name, email=None, max_variants=None, time_budget=None):
+        """Sonde les variantes de username d'un nom, sans affichage : {variante: {site: résultat}}"""
+        return {
+            result.username: result.to_dict()
+            for result in self.variant_results(full_name, email, max_variants, time_budget)
         }
+    
+    def check_username_variants(self, full_name, email=None, renderer=None):
+        """Sonde les variantes de username d'un nom et affiche les comptes trouvés"""
+        results = self.variant_results(full_name, email)
+        get_renderer(renderer).variants(full_name, results)
+        return {result.username: result.to_dict() for result in results}
+    
+    def check_username_availability(self, username, renderer=None):
+        """Vérifie la disponibilité d'un username sur différentes plateformes"""
+        result = self.probe(username)
+        get_renderer(renderer).username(result)
+        return result.to_dict()
+    
+    def _probe_site(self, platform, url):
+        """Sonde une URL et retourne (code de statut, disponibilité)"""
+        headers = self.headers
+        if self.conditional is not None:
+            headers = dict(headers, **self.conditional.headers(url))
+        response = self.transport.request(platform.method, url, headers=headers,
+                                          timeout=self.probe_timeout, allow_redirects=True,
+                                          stream=platform.needs_body, provider='username')
         
-        print(Fore.WHITE + "📊 PLATEFORMES DISPONIBLES:")
-        print(Fore.CYAN + "─" * 40)
+        if response.status_code == 304 and self.conditional is not None:
+            previous = self.conditional.not_modified(url)
+            if previous is not None:
+                response.close()
+                return tuple(previous)
         
-        for platform, url in platforms.items():
-            print(Fore.WHITE + f"   🔗 {platform}: {url}")
-            results[platform] = url
+        if not platform.needs_body:
+            outcome = response.status_code, platform.evaluate(response.status_code, response.url)
+        else:
+            try:
+                outcome = response.status_code, self._read_until_decided(platform, response)
+            finally:
+                response.close()
         
-        return results
+        if self.conditional is not None:
+            self.conditional.remember(url, response, list(outcome))
+        return outcome
     
-    def check_username_availability(self, username):
-        """Vérifie la disponibilité d'un username sur différentes plateformes"""
-        print(Fore.YELLOW + f"\n🔍 Vérification du username '{username}'...")
-        print(Fore.CYAN + "═" * 50)
-        
-        # Liste des sites populaires
-        sites = {
-            "Instagram": f"https://www.instagram.com/{username}/",
-            "Twitter": f"https://twitter.com/{username}",
-            "GitHub": f"https://github.com/{username}",
-            "Reddit": f"https://www.reddit.com/user/{username}",
-            "TikTok": f"https://www.tiktok.com/@{username}",
-            "Pinterest": f"https://pinterest.com/{username}/",
-            "Twitch": f"https://www.twitch.tv/{username}",
-            "Spotify": f"https://open.spotify.com/user/{username}",
-            "Steam": f"https://steamcommunity.com/id/{username}",
-            "Telegram": f"https://t.me/{username}"
-        }
+    def _read_until_decided(self, platform, response):
+        """Lit le corps en flux jusqu'à ce qu'une règle tranche ou que le plafond soit atteint"""
+        status, url = response.status_code, response.url
+        limit = platform.max_bytes or self.max_body_bytes
+        chunks = response.iter_content(STREAM_CHUNK)
+        body = bytearray()
+        outcome = None
         
-        print(Fore.WHITE + "📊 RÉSULTATS DE DISPONIBILITÉ:")
-        print(Fore.CYAN + "─" * 40)
+        decided, available = platform.decide(status, url, body, complete=False)
+        while not decided:
+            chunk = next(chunks, None)
+            if chunk is None:
+                outcome = 'complete'
+                available = platform.evaluate(status, url, body)
+                break
+            
+            start = max(len(body) - MARKER_OVERLAP, 0)
+            body += chunk
+            if len(body) >= limit:
+                outcome = 'capped'
+                available = platform.evaluate(status, url, body)
+                break
+            decided, available = platform.decide(status, url, body, complete=False, start=start)
         
-        results = {}
+        # Petit reste : on le lit pour garder la connexion, sinon elle sera fermée
+        reusable, drained = True, 0
+        if outcome != 'complete':
+            reusable, drained = self._drain(response, chunks, len(body))
         
-        for site, url in sites.items():
-            try:
-                response = requests.head(url, headers=self.headers, timeout=5, allow_redirects=True)
-                
-                if response.status_code == 200:
-                    print(Fore.RED + f"   ❌ {site}: Utilisé ({url})")
-                    results[site] = {"available": False, "url": url}
-                elif response.status_code == 404:
-                    print(Fore.GREEN + f"   ✅ {site}: Disponible")
-                    results[site] = {"available": True, "url": url}
-                else:
-                    print(Fore.YELLOW + f"   ⚠️  {site}: Statut {response.status_code}")
-                    results[site] = {"available": None, "url": url}
-                    
-            except Exception:
-                print(Fore.YELLOW + f"   ⚠️  {site}: Impossible à vérifier")
-                results[site] = {"available": None, "url": url}
-        
-        return results
-    
-    def generate_google_dorks(self, full_name, email=None, phone=None):
-        """Génère des Google Dorks pour la recherche"""
-        print(Fore.YELLOW + f"\n🔎 GOOGLE DORKS GÉNÉRÉS:")
-        print(Fore.CYAN + "═" * 50)
+        with self._stream_lock:
+            self.stream_stats['probes'] += 1
+            self.stream_stats['bytes_read'] += len(body) + drained
+            if outcome is None:
+                self.stream_stats['early_stops'] += 1
+            elif outcome == 'capped':
+                self.stream_stats['capped'] += 1
+            if not reusable:
+                self.stream_stats['closed'] += 1
+        return available
+    
+    def _drain(self, response, chunks, read):
+        """Lit le reste du corps s'il est court ; retourne (connexion réutilisable, octets lus)"""
+        length = response.headers.get('Content-Length', '')
+        # Taille inconnue ou corps compressé : mieux vaut fermer que tout lire
+        if not length.isdigit() or response.headers.get('Content-Encoding'):
+            return False, 0
+        if int(length) - read > DRAIN_BYTES:
+            return False, 0
         
+        drained = 0
+        for chunk in chunks:
+            drained += len(chunk)
+        return True, drained
+    
+    def build_google_dorks(self, full_name, email=None, phone=None):
+        """Construit la liste des Google Dorks pour la recherche"""
         dorks = []
         
         # Dorks pour le nom
@@ -127,88 +266,51 @@ class UsernameSearch:
                     f'"{phone}" site:truecaller.com OR site:whocalledme.com'
                 ])
         
-        print(Fore.WHITE + "📋 COPIEZ CES REQUÊTES DANS GOOGLE:\n")
-        
-        for i, dork in enumerate(dorks[:15], 1):  # Limite à 15 dorks
-            print(Fore.CYAN + f"   {i:2d}. " + Fore.WHITE + dork)
-        
         return dorks
     
-    def search_by_phone_number(self, phone_number):
-        """Recherche d'informations par numéro de téléphone"""
-        print(Fore.YELLOW + f"\n🔍 Recherche pour le numéro: {phone_number}")
-        print(Fore.CYAN + "═" * 50)
-        
+    def generate_google_dorks(self, full_name, email=None, phone=None, renderer=None):
+        """Génère des Google Dorks pour la recherche"""
+        dorks = self.build_google_dorks(full_name, email, phone)
+        get_renderer(renderer).google_dorks(dorks, full_name)
+        return dorks
+    
+    def phone_search_links(self, phone_number):
+        """Liens de recherche d'informations pour un numéro de téléphone"""
         clean_phone = re.sub(r'\D', '', phone_number)
-        
-        searches = {
-            "Truecaller": f"https://www.truecaller.com/search/fr/{clean_phone}",
-            "Tellows": f"https://www.tellows.fr/num/{clean_phone}",
-            "SpamCalls": f"https://spamcalls.net/fr/{clean_phone}",
-            "NumBuster": f"https://www.numbuster.com/fr/{clean_phone}",
-            "Google": f"https://www.google.com/search?q={quote(phone_number)}",
-            "Facebook": f"https://www.facebook.com/search/top/?q={quote(phone_number)}",
-            "Whitepages": f"https://www.whitepages.com/phone/{clean_phone}",
-            "411.com": f"https://www.411.com/phone/{clean_phone}"
-        }
-        
-        print(Fore.WHITE + "🔗 RECHERCHES DISPONIBLES:")
-        print(Fore.CYAN + "─" * 40)
-        
-        for site, url in searches.items():
-            print(Fore.WHITE + f"   🌐 {site}: {url}")
-        
+        return self.catalogue.phone_links(quote(phone_number), clean_phone)
+    
+    def search_by_phone_number(self, phone_number, renderer=None):
+        """Recherche d'informations par numéro de téléphone"""
+        searches = self.phone_search_links(phone_number)
+        get_renderer(renderer).phone_search(phone_number, searches)
         return searches
     
-    def comprehensive_search(self, query, search_type="name"):
-        """Recherche complète selon le type"""
-        print(Fore.CYAN + "\n" + "═" * 60)
-        print(Fore.CYAN + "🔍 RECHERCHE COMPLÈTE OSINT")
-        print(Fore.CYAN + "═" * 60)
-        
-        results = {}
+    def search(self, query, search_type="name", email=None):
+        """Recherche complète selon le type ; retourne un SearchResult"""
+        result = SearchResult(query, search_type)
         
         if search_type == "name":
-            print(Fore.WHITE + f"\n📊 RECHERCHE POUR LE NOM: {query}")
-            
-            # 1. Recherche réseaux sociaux
-            print(Fore.YELLOW + "\n1. RECHERCHE RÉSEAUX SOCIAUX...")
-            social_results = self.search_social_media(query)
-            results['social_media'] = social_results
-            
-            # 2. Génération Google Dorks
-            print(Fore.YELLOW + "\n2. GÉNÉRATION GOOGLE DORKS...")
-            dorks = self.generate_google_dorks(query)
-            results['google_dorks'] = dorks
-            
-            # 3. Vérification username
-            print(Fore.YELLOW + "\n3. VÉRIFICATION USERNAME...")
-            # Extrait un username potentiel du nom
-            username = query.lower().replace(' ', '.')
-            username_results = self.check_username_availability(username)
-            results['username_check'] = username_results
+            result.social_media = self.social_media_links(query)
+            result.google_dorks = self.build_google_dorks(query, email)
+            result.usernames = self.variant_results(query, email)
         
         elif search_type == "phone":
-            print(Fore.WHITE + f"\n📊 RECHERCHE POUR LE NUMÉRO: {query}")
-            phone_results = self.search_by_phone_number(query)
-            results['phone_search'] = phone_results
+            result.phone_search = self.phone_search_links(query)
         
         elif search_type == "username":
-            print(Fore.WHITE + f"\n📊 RECHERCHE POUR USERNAME: {query}")
-            username_results = self.check_username_availability(query)
-            results['username_check'] = username_results
-        
-        # Conseils de sécurité
-        print(Fore.CYAN + "\n" + "═" * 60)
-        print(Fore.GREEN + "🛡️  CONSEILS DE PROTECTION DE LA VIE PRIVÉE:")
-        
-        print(Fore.WHITE + "1. Vérifiez vos paramètres de confidentialité")
-        print(Fore.WHITE + "2. Utilisez des noms différents sur chaque plateforme")
-        print(Fore.WHITE + "3. Évitez de partager trop d'informations personnelles")
-        print(Fore.WHITE + "4. Utilisez l'authentification à deux facteurs")
-        print(Fore.WHITE + "5. Revoyez régulièrement vos traces numériques")
+            result.usernames = [self.probe(query)]
         
-        return results
+        return result
+    
+    def collect(self, query, search_type="name", email=None):
+        """Recherche complète selon le type, sans affichage"""
+        return self.search(query, search_type, email).to_dict()
+    
+    def comprehensive_search(self, query, search_type="name", email=None, renderer=None):
+        """Recherche complète selon le type"""
+        result = self.search(query, search_type, email)
+        get_renderer(renderer).search(result)
+        return result.to_dict()
 
 # Fonction de test
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Génération de variantes de username à partir d'un nom
+by Dvrk_Smith
+"""
+
+import re
+import unicodedata
+
+# Caractères admis par la plupart des plateformes
+VALID_USERNAME = re.compile(r"^[a-z0-9][a-z0-9._-]{1,29}$")
+
+# Motifs classés du plus au moins fréquent ; f/l : prénom/nom, i/j : leurs initiales
+NAME_PATTERNS = [
+    "{f}.{l}",
+    "{f}{l}",
+    "{i}{l}",
+    "{f}_{l}",
+    "{f}-{l}",
+    "{f}{j}",
+    "{i}.{l}",
+    "{l}{f}",
+    "{l}.{f}",
+    "{l}{i}",
+    "{l}_{f}",
+    "{i}_{l}",
+    "{f}",
+    "{l}",
+]
+
+def _ascii(text):
+    """Minuscules sans accents"""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+def name_tokens(full_name):
+    """Parties d'un nom, sans accents ni ponctuation ("Jean-Pierre Dupont" → jeanpierre, dupont)"""
+    tokens = [re.sub(r"[^a-z0-9]", "", part) for part in _ascii(full_name).split()]
+    return [token for token in tokens if token]
+
+def local_part_variants(email):
+    """Variantes issues de la partie locale d'un email (sans +étiquette, sans chiffres finaux)"""
+    local = _ascii(email.split("@", 1)[0]).split("+", 1)[0].strip()
+    variants = [local]
+    stripped = local.rstrip("0123456789._-")
+    if stripped and stripped != local:
+        variants.append(stripped)
+    return variants
+
+def username_variants(full_name, email=None, limit=None):
+    """Usernames probables, du plus au moins vraisemblable
+
+    La partie locale de l'email, quand elle est connue, passe en tête :
+    c'est un identifiant réellement choisi par la personne. Les doublons
+    et les usernames invalides sont écartés.
+    """
+    candidates = local_part_variants(email) if email else []
+
+    tokens = name_tokens(full_name)
+    if len(tokens) == 1:
+        candidates.append(tokens[0])
+    elif tokens:
+        first, last = tokens[0], tokens[-1]
+        for pattern in NAME_PATTERNS:
+            candidates.append(pattern.format(f=first, l=last, i=first[0], j=last[0]))
+
+    variants = []
+    for candidate in candidates:
+        if VALID_USERNAME.match(candidate) and candidate not in variants:
+            variants.append(candidate)
+    return variants[:limit] if limit else variants
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Surveillance d'une liste de cibles : seules les différences sont signalées
+by Dvrk_Smith
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from modules.conditional import ConditionalStore
+from modules.normalize import normalize_email, normalize_username
+from modules.probe_engine import stream_map
+
+EMAIL = "email"
+USERNAME = "username"
+KINDS = (EMAIL, USERNAME)
+
+# Changements signalés
+NEW_BREACH = "new_breach"
+TAKEN = "taken"
+RELEASED = "released"
+
+# Mises à jour de l'état écrites par transaction
+COMMIT_EVERY = 200
+
+def _normalize(kind, target):
+    """Forme canonique d'une cible surveillée"""
+    return normalize_email(target) if kind == EMAIL else normalize_username(target)
+
+def diff_snapshots(kind, previous, current):
+    """Liste des changements entre deux relevés d'une cible"""
+    changes = []
+    if kind == EMAIL:
+        known = set(previous.get('breaches', []))
+        for breach in current['breaches']:
+            if breach not in known:
+                changes.append({'change': NEW_BREACH, 'breach': breach})
+    else:
+        for site, available in current.items():
+            before = previous.get(site)
+            if available is False and before is not False:
+                changes.append({'change': TAKEN, 'site': site})
+            elif available is True and before is False:
+                changes.append({'change': RELEASED, 'site': site})
+    return changes
+
+class Watchlist:
+    def __init__(self, path="data/watchlist.sqlite3", email_checker=None, username_searcher=None,
+                 min_interval=20 * 3600, workers=8):
+        self.path = path
+        self.email_checker = email_checker
+        self.username_searcher = username_searcher
+        self.min_interval = min_interval
+        self.workers = workers
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS targets (
+                kind TEXT NOT NULL,
+                target TEXT NOT NULL,
+                added REAL NOT NULL,
+                checked REAL,
+                snapshot TEXT,
+                PRIMARY KEY (kind, target)
+            )
+        """)
+        self._db.commit()
+
+        # Validateurs HTTP conservés d'une exécution à l'autre, dans une base à part :
+        # ils sont écrits par les sondes pendant que run() met à jour les relevés
+        self.conditional = ConditionalStore(os.path.splitext(path)[0] + "_validators.sqlite3")
+        for analyzer in (email_checker, username_searcher):
+            if analyzer is not None:
+                analyzer.conditional = self.conditional
+
+    def add(self, kind, targets):
+        """Ajoute des cibles à surveiller ; retourne le nombre de nouvelles cibles"""
+        now = time.time()
+        rows = {(kind, _normalize(kind, target), now) for target in targets if target.strip()}
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO targets (kind, target, added) VALUES (?, ?, ?)", rows)
+            self._db.commit()
+            return self._db.total_changes - before
+
+    def remove(self, kind, targets):
+        """Retire des cibles ; retourne le nombre de cibles retirées"""
+        rows = [(kind, _normalize(kind, target)) for target in targets if target.strip()]
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany("DELETE FROM targets WHERE kind = ? AND target = ?", rows)
+            self._db.commit()
+            return self._db.total_changes - before
+
+    def targets(self, kind=None):
+        """Liste des (type, cible, dernière vérification)"""
+        query = "SELECT kind, target, checked FROM targets"
+        params = ()
+        if kind:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        with self._lock:
+            return self._db.execute(query + " ORDER BY kind, target", params).fetchall()
+
+    def _due(self, kind, force):
+        """Cibles dont le dernier relevé est plus vieux que min_interval"""
+        query = "SELECT kind, target, snapshot FROM targets"
+        conditions, params = [], []
+        if kind:
+            conditions.append("kind = ?")
+            params.append(kind)
+        if not force:
+            conditions.append("(checked IS NULL OR checked <= ?)")
+            params.append(time.time() - self.min_interval)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        for kind, target, snapshot in rows:
+            yield kind, target, json.loads(snapshot) if snapshot else None
+
+    def snapshot(self, kind, target, previous=None):
+        """Relevé actuel d'une cible, ou None si la vérification a échoué
+
+        Les sites non vérifiés (erreur, hôte court-circuité) gardent leur
+        valeur précédente pour ne pas signaler de faux changements.
+        """
+        if kind == EMAIL:
+            result = self.email_checker.check_hibp(target)
+            if 'error' in result:
+                return None
+            return {'breaches': sorted(breach.get('Name') for breach in result['breaches'])}
+
+        results = self.username_searcher.probe_username(target)
+        current = dict(previous or {})
+        for site, result in results.items():
+            if result['available'] is not None:
+                current[site] = result['available']
+        return current
+
+    def run(self, kind=None, force=False):
+        """Vérifie les cibles échues et produit un dict par cible ayant changé
+
+        Au premier relevé d'une cible, tout ce qui est trouvé est signalé
+        (baseline: True). Les cibles vérifiées depuis moins de min_interval
+        sont ignorées sauf si force est vrai.
+        """
+        def check(item):
+            kind, target, previous = item
+            return self.snapshot(kind, target, previous)
+
+        pending = 0
+        try:
+            for (kind, target, previous), current in stream_map(check, self._due(kind, force), self.workers):
+                if current is None or isinstance(current, Exception):
+                    continue
+
+                with self._lock:
+                    self._db.execute(
+                        "UPDATE targets SET checked = ?, snapshot = ? WHERE kind = ? AND target = ?",
+                        (time.time(), json.dumps(current), kind, target)
+                    )
+                    pending += 1
+                    if pending >= COMMIT_EVERY:
+                        self._db.commit()
+                        pending = 0
+
+                changes = diff_snapshots(kind, previous or {}, current)
+                if changes:
+                    yield {'type': kind, 'target': target, 'baseline': previous is None, 'changes': changes}
+        finally:
+            with self._lock:
+                self._db.commit()
+
+    def stats(self):
+        """Cibles surveillées par type et requêtes conditionnelles"""
+        with self._lock:
+            counts = dict(self._db.execute("SELECT kind, COUNT(*) FROM targets GROUP BY kind").fetchall())
+        return {'targets': counts, 'conditional': self.conditional.stats()}
+
+    def close(self):
+        """Ferme les bases SQLite"""
+        with self._lock:
+            self._db.close()
+        self.conditional.close()
@@ -0,0 +1,9 @@
+"""
+Configuration pytest : les tests importent les modules depuis la racine du dépôt
+by Dvrk_Smith
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
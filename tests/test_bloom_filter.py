@@ -0,0 +1,68 @@
+"""
+Tests du filtre de Bloom des adresses compromises
+by Dvrk_Smith
+"""
+
+import math
+
+import pytest
+
+from modules.bloom_filter import BloomFilter
+
+def _emails(prefix, count):
+    return [f"{prefix}{i}@example.com" for i in range(count)]
+
+@pytest.mark.parametrize("capacity, fp_rate", [(1000, 0.01), (10000, 0.001), (50000, 0.0001)])
+def test_sizing(capacity, fp_rate):
+    """Taille et nombre de hachages optimaux pour la capacité et le taux visés"""
+    bloom = BloomFilter(capacity, fp_rate)
+    expected_bits = -capacity * math.log(fp_rate) / math.log(2) ** 2
+    assert expected_bits <= bloom.bits < expected_bits + 1
+    assert bloom.hashes == round(bloom.bits / capacity * math.log(2))
+    assert len(bloom._array) == (bloom.bits + 7) // 8
+    # Rempli à capacité, le taux attendu reste celui visé
+    bloom.count = capacity
+    assert bloom.estimated_fp_rate() == pytest.approx(fp_rate, rel=0.1)
+
+@pytest.mark.parametrize("capacity, fp_rate", [(0, 0.01), (100, 0), (100, 1), (100, 1.5)])
+def test_invalid_parameters(capacity, fp_rate):
+    with pytest.raises(ValueError):
+        BloomFilter(capacity, fp_rate)
+
+def test_no_false_negatives():
+    members = _emails("member", 5000)
+    bloom = BloomFilter.from_emails(members, len(members), 0.01)
+    assert bloom.count == 5000
+    assert all(bloom.might_contain(email) for email in members)
+    # Les adresses sont normalisées comme dans l'index des fuites
+    assert "Member42@Example.com" in bloom
+
+def test_false_positive_rate_bounded():
+    """Taux mesuré sur 50 000 adresses absentes : proche de celui visé"""
+    fp_rate = 0.01
+    bloom = BloomFilter.from_emails(_emails("member", 10000), 10000, fp_rate)
+    false_positives = sum(bloom.might_contain(email) for email in _emails("stranger", 50000))
+    assert false_positives / 50000 < fp_rate * 1.5
+    assert bloom.estimated_fp_rate() < fp_rate * 1.1
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "breached.bloom")
+    bloom = BloomFilter.from_emails(_emails("member", 1000), 1000, 0.001)
+    bloom.save(path)
+
+    loaded = BloomFilter.load(path)
+    assert (loaded.bits, loaded.hashes, loaded.count, loaded.fp_rate) == (bloom.bits, bloom.hashes, 1000, 0.001)
+    assert loaded._array == bloom._array
+    assert all(loaded.might_contain(email) for email in _emails("member", 1000))
+
+def test_load_rejects_bad_files(tmp_path):
+    path = tmp_path / "breached.bloom"
+    BloomFilter.from_emails(_emails("member", 100), 100).save(str(path))
+    data = path.read_bytes()
+
+    path.write_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        BloomFilter.load(str(path))
+    path.write_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        BloomFilter.load(str(path))
@@ -0,0 +1,88 @@
+"""
+Tests des requêtes conditionnelles (ETag / Last-Modified)
+by Dvrk_Smith
+"""
+
+import pytest
+
+from modules.conditional import ConditionalStore
+from modules.email_checker import EmailChecker
+
+URL = "https://haveibeenpwned.com/api/v3/breachedaccount/alice@example.com"
+BREACHES = [{"Name": "Adobe"}, {"Name": "LinkedIn"}]
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def json(self):
+        return self._body
+
+class FakeTransport:
+    """Répond 200 avec un ETag, puis 304 à toute requête portant If-None-Match"""
+
+    def __init__(self, etag='"v1"'):
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        if headers and headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304, {'ETag': self.etag})
+        return FakeResponse(200, {'ETag': self.etag}, BREACHES)
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    store = ConditionalStore(str(tmp_path / "validators.sqlite3") if request.param == "sqlite" else None)
+    yield store
+    store.close()
+
+def test_headers_follow_remembered_validators(store):
+    assert store.headers(URL) == {}
+    response = FakeResponse(200, {'ETag': '"abc"', 'Last-Modified': "Mon, 01 Jan 2024 00:00:00 GMT"})
+    store.remember(URL, response, {'breached': True})
+    assert store.headers(URL) == {'If-None-Match': '"abc"', 'If-Modified-Since': "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert store.not_modified(URL) == {'breached': True}
+
+def test_responses_without_validators_are_not_kept(store):
+    store.remember(URL, FakeResponse(200), {'breached': True})
+    assert store.headers(URL) == {}
+    assert store.not_modified(URL) is None
+    assert store.stats()['stored'] == 0
+
+def test_validators_survive_reopening(tmp_path):
+    path = str(tmp_path / "validators.sqlite3")
+    store = ConditionalStore(path)
+    store.remember(URL, FakeResponse(200, {'ETag': '"abc"'}), ["200", True])
+    store.close()
+
+    store = ConditionalStore(path)
+    assert store.headers(URL) == {'If-None-Match': '"abc"'}
+    assert store.not_modified(URL) == ["200", True]
+    store.close()
+
+def test_304_reuses_previous_result(store):
+    """Une réponse 304 reprend le résultat de la réponse 200 précédente"""
+    transport = FakeTransport()
+    checker = EmailChecker(transport=transport, conditional=store)
+
+    first = checker.check_hibp("alice@example.com")
+    second = checker.check_hibp("alice@example.com")
+    assert first == {"breached": True, "breaches": BREACHES, "breach_count": 2}
+    assert second == first
+    assert 'If-None-Match' not in transport.requests[0]
+    assert transport.requests[1]['If-None-Match'] == '"v1"'
+    assert store.stats() == {'conditional': 1, 'not_modified': 1, 'stored': 1}
+
+def test_changed_resource_is_read_again(store):
+    """Un nouvel ETag côté serveur donne une réponse 200 relue et mémorisée"""
+    transport = FakeTransport()
+    checker = EmailChecker(transport=transport, conditional=store)
+    checker.check_hibp("alice@example.com")
+
+    transport.etag = '"v2"'
+    assert checker.check_hibp("alice@example.com")["breach_count"] == 2
+    assert store.headers(URL) == {'If-None-Match': '"v2"'}
+    assert store.stats()['not_modified'] == 0
@@ -0,0 +1,100 @@
+"""
+Tests de la file de travaux persistante
+by Dvrk_Smith
+"""
+
+import pytest
+
+from modules.job_queue import JobQueue
+
+TARGETS = ["a@example.com", "b@example.com", "c@example.com"]
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=3)
+    yield queue
+    queue.close()
+
+def test_run_emits_each_target_once(queue):
+    """Chaque cible terminée est produite une fois ; une nouvelle exécution ne produit rien"""
+    job_id = queue.submit('email', TARGETS, ['hibp', 'reputation'])
+    providers = {'hibp': lambda target: {'breached': False}, 'reputation': lambda target: {'score': 1}}
+
+    emitted = list(queue.run(job_id, providers, workers=2))
+    assert sorted(seq for seq, _, _ in emitted) == [0, 1, 2]
+    for seq, target, results in emitted:
+        assert target == TARGETS[seq]
+        assert results == {'hibp': {'breached': False}, 'reputation': {'score': 1}}
+    assert list(queue.run(job_id, providers)) == []
+    assert queue.status(job_id)['complete'] == 3
+
+def test_resume_only_retries_failed_units(queue):
+    """À la reprise, seuls les fournisseurs en erreur sont réinterrogés"""
+    job_id = queue.submit('email', TARGETS, ['hibp', 'reputation'])
+    calls = []
+
+    def flaky(target):
+        calls.append(target)
+        return {'error': "timeout"} if len(calls) == 1 else {'score': 1}
+
+    first = list(queue.run(job_id, {'hibp': lambda target: {'breached': False}, 'reputation': flaky}, workers=1))
+    assert [seq for seq, _, _ in first] == [1, 2]
+
+    def untouched(target):
+        raise AssertionError("fournisseur déjà terminé réinterrogé")
+
+    second = list(queue.run(job_id, {'hibp': untouched, 'reputation': flaky}, workers=1))
+    assert second == [(0, TARGETS[0], {'hibp': {'breached': False}, 'reputation': {'score': 1}})]
+    assert calls.count(TARGETS[0]) == 2
+
+def test_attempts_are_bounded(queue):
+    """Une unité toujours en erreur est abandonnée après max_attempts et sa cible produite"""
+    job_id = queue.submit('phone', ["+33612345678"], ['phone'])
+    calls = []
+
+    def failing(target):
+        calls.append(target)
+        raise RuntimeError("indisponible")
+
+    emitted = []
+    for _ in range(5):
+        emitted += list(queue.run(job_id, {'phone': failing}))
+    assert len(calls) == 3
+    assert emitted == [(0, "+33612345678", {'phone': {'error': "indisponible"}})]
+
+def test_refresh_called_before_retries(queue):
+    """refresh() précède chaque nouvelle tentative, jamais le premier appel"""
+    job_id = queue.submit('email', TARGETS[:1], ['hibp'])
+    refreshed = []
+    results = iter([{'error': "HTTP 429", 'status': 429}, {'breached': True}])
+
+    def refresh(provider, target):
+        refreshed.append((provider, target))
+
+    assert list(queue.run(job_id, {'hibp': lambda target: next(results)}, refresh=refresh)) == []
+    assert refreshed == []
+    assert len(list(queue.run(job_id, {'hibp': lambda target: next(results)}, refresh=refresh))) == 1
+    assert refreshed == [('hibp', TARGETS[0])]
+
+def test_interrupted_consumer_gets_target_again(queue):
+    """Une cible produite mais pas encore marquée est reproduite à la reprise, sauf si mark_emitted l'a notée"""
+    job_id = queue.submit('email', TARGETS, ['hibp'])
+    providers = {'hibp': lambda target: {'breached': False}}
+
+    items = queue.run(job_id, providers, workers=1)
+    assert next(items)[0] == 0
+    items.close()
+
+    replayed = queue.run(job_id, providers, workers=1)
+    assert next(replayed)[0] == 0
+    replayed.close()
+
+    queue.mark_emitted(job_id, [0])
+    assert [seq for seq, _, _ in queue.run(job_id, providers, workers=1)] == [1, 2]
+
+def test_results_replays_all_targets_in_order(queue):
+    """results() relit toutes les cibles dans l'ordre de soumission"""
+    job_id = queue.submit('username', ["alice", "", "bob"], ['username'])
+    list(queue.run(job_id, {'username': lambda target: [target]}))
+    assert list(queue.results(job_id)) == [(0, "alice", {'username': ["alice"]}),
+                                           (1, "bob", {'username': ["bob"]})]
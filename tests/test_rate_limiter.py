@@ -0,0 +1,120 @@
+"""
+Tests de la planification des appels d'API
+by Dvrk_Smith
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from modules.rate_limiter import RateLimiter, RateLimitedError, TokenBucket, parse_retry_after
+
+class FakeResponse:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {'Retry-After': retry_after} if retry_after is not None else {}
+
+def test_parse_retry_after_seconds():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(" 3 ") == 3.0
+
+def test_parse_retry_after_http_date():
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("Mon, 01 Jan 2024 12:00:30 GMT", now) == 30.0
+    # Date passée : aucune attente
+    assert parse_retry_after("Mon, 01 Jan 2024 11:00:00 GMT", now) == 0.0
+
+@pytest.mark.parametrize("value", [None, "", "bientôt", "-5", "1.5"])
+def test_parse_retry_after_invalid(value):
+    assert parse_retry_after(value) is None
+
+def test_token_bucket_refill():
+    bucket = TokenBucket(rate=2, burst=1)
+    now = bucket.updated
+    assert bucket.wait(now) == 0
+    bucket.take()
+    assert bucket.wait(now) == pytest.approx(0.5)
+    assert bucket.wait(now + 0.5) == 0
+
+def test_keys_rotate_round_robin():
+    limiter = RateLimiter()
+    limiter.set_keys('hunter', ["k1", "k2", "k3"])
+    assert [limiter.acquire('hunter')[1] for _ in range(6)] == ["k1", "k2", "k3", "k1", "k2", "k3"]
+    assert limiter.keys('hunter') == ["k1", "k2", "k3"]
+
+def test_throttled_key_is_skipped():
+    """Une clé refusée (429) est suspendue ; la suivante prend le relais"""
+    limiter = RateLimiter(limits={'hunter': {'rate': None}})
+    limiter.set_keys('hunter', ["k1", "k2"])
+    used = []
+
+    def send(key):
+        used.append(key)
+        return FakeResponse(429, "60") if key == "k1" else FakeResponse(200)
+
+    assert limiter.call('hunter', send).status_code == 200
+    assert used == ["k1", "k2"]
+    used.clear()
+    assert limiter.call('hunter', send).status_code == 200
+    assert used == ["k2"]
+    stats = limiter.stats()['hunter']
+    assert stats['throttled'] == 1 and stats['requeued'] == 1
+
+def test_rejected_beyond_max_wait():
+    """Aucune clé disponible avant max_wait : RateLimitedError plutôt qu'une longue attente"""
+    limiter = RateLimiter(limits={'hibp': {'rate': None}}, max_wait=5)
+    limiter.set_keys('hibp', ["k1"])
+    with pytest.raises(RateLimitedError) as error:
+        limiter.call('hibp', lambda key: FakeResponse(429, "3600"))
+    assert error.value.provider == 'hibp'
+    assert error.value.wait > 5
+    with pytest.raises(RateLimitedError):
+        limiter.acquire('hibp')
+    assert limiter.stats()['hibp']['rejected'] == 2
+
+def test_last_429_returned_after_max_retries():
+    limiter = RateLimiter(limits={'emailrep': {'rate': None}}, max_retries=2)
+    limiter.set_keys('emailrep', ["k1", "k2", "k3"])
+    used = []
+
+    def send(key):
+        used.append(key)
+        return FakeResponse(429, "0")
+
+    assert limiter.call('emailrep', send).status_code == 429
+    assert used == ["k1", "k2", "k3"]
+
+def test_explicit_key_uses_only_that_key():
+    """Une clé passée à call() est ajoutée au pool et seule utilisée"""
+    limiter = RateLimiter(limits={'numverify': {'rate': None}})
+    limiter.set_keys('numverify', ["k1", "k2"])
+    used = []
+    for _ in range(3):
+        limiter.call('numverify', lambda key: used.append(key) or FakeResponse(200), key="mine")
+    assert used == ["mine"] * 3
+    assert limiter.keys('numverify') == ["k1", "k2", "mine"]
+
+def test_acquire_undeclared_key():
+    limiter = RateLimiter()
+    limiter.set_keys('hunter', ["k1"])
+    with pytest.raises(KeyError):
+        limiter.acquire('hunter', key="inconnue")
+
+def test_set_keys_during_call():
+    """Remplacer les clés pendant un appel ne casse pas l'appel en cours"""
+    limiter = RateLimiter(limits={'hunter': {'rate': None}})
+    limiter.set_keys('hunter', ["k1", "k2", "k3"])
+    used = []
+
+    def send(key):
+        used.append(key)
+        if len(used) == 1:
+            limiter.set_keys('hunter', ["new"])
+            return FakeResponse(429, "0")
+        return FakeResponse(200)
+
+    limiter.acquire('hunter')
+    limiter.acquire('hunter')
+    assert limiter.call('hunter', send).status_code == 200
+    assert used == ["k3", "k1"]
+    assert limiter.keys('hunter') == ["new"]
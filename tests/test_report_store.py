@@ -0,0 +1,132 @@
+"""
+Tests du stockage des rapports en segments
+by Dvrk_Smith
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+from modules import report_store
+from modules.report_store import ReportStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _segments(root):
+    return sorted(name for name in os.listdir(root) if name.startswith("segment_"))
+
+def test_round_trip(tmp_path):
+    """Un rapport relu est identique à celui enregistré"""
+    store = ReportStore(str(tmp_path))
+    results = {'hibp': {'breached': True, 'breach_count': 2}, 'emailrep': {'reputation': 'low'}}
+    report_id = store.append("alice@example.com", "20240101_120000", results, type="email")
+
+    report = store.get(report_id)
+    assert report['target'] == "alice@example.com"
+    assert report['date'] == "20240101_120000"
+    assert report['type'] == "email"
+    assert report['results'] == results
+    assert store.latest("alice@example.com")['id'] == report_id
+    store.close()
+
+def test_list_results_round_trip(tmp_path):
+    """Des résultats sous forme de liste sont relus tels quels"""
+    store = ReportStore(str(tmp_path))
+    report_id = store.append("alice", "20240101_120000", [{'platform': 'GitHub', 'exists': True}])
+    assert store.get(report_id)['results'] == [{'platform': 'GitHub', 'exists': True}]
+    store.close()
+
+def test_identical_payloads_are_stored_once(tmp_path):
+    """Deux rapports identiques partagent leurs résultats de fournisseurs"""
+    store = ReportStore(str(tmp_path))
+    results = {'hibp': {'breached': False}, 'emailrep': {'reputation': 'high'}}
+    first = store.append("bob@example.com", "20240101_120000", results)
+    second = store.append("bob@example.com", "20240102_120000", dict(results, hunter={'score': 80}))
+
+    assert store.stats()['reports'] == 2
+    assert store.stats()['payloads'] == 3
+    assert store.get(first)['results'] == results
+    assert store.get(second)['results']['hibp'] == {'breached': False}
+    assert [row[0] for row in store.find("bob@example.com")] == [second, first]
+    store.close()
+
+def test_segment_rotation(tmp_path):
+    """Les segments tournent à leur taille maximale et chaque rapport reste lisible"""
+    store = ReportStore(str(tmp_path), segment_size=512, compress_level=0)
+    ids = [store.append(f"user{i}", "20240101_120000", {'data': {'index': i, 'padding': "x" * 100}})
+           for i in range(20)]
+
+    assert len(_segments(str(tmp_path))) > 1
+    for name in _segments(str(tmp_path)):
+        assert os.path.getsize(os.path.join(str(tmp_path), name)) <= 512
+    for i, report_id in enumerate(ids):
+        assert store.get(report_id)['results']['data']['index'] == i
+    store.close()
+
+def test_reopen_continues_last_segment(tmp_path):
+    """Un stockage rouvert relit les rapports et continue d'écrire à la suite"""
+    store = ReportStore(str(tmp_path), segment_size=512, compress_level=0)
+    first = store.append("carol", "20240101_120000", {'data': {'padding': "y" * 200}})
+    store.close()
+
+    store = ReportStore(str(tmp_path), segment_size=512, compress_level=0)
+    second = store.append("carol", "20240102_120000", {'data': {'padding': "z" * 200}})
+    assert store.get(first)['results']['data']['padding'] == "y" * 200
+    assert store.get(second)['results']['data']['padding'] == "z" * 200
+    store.close()
+
+@pytest.mark.skipif(report_store.fcntl is None, reason="verrou entre processus indisponible")
+def test_concurrent_processes(tmp_path):
+    """Plusieurs processus écrivent dans le même stockage sans corrompre les segments"""
+    script = (
+        "import sys\n"
+        "from modules.report_store import ReportStore\n"
+        "store = ReportStore(sys.argv[1], segment_size=2048, compress_level=0)\n"
+        "for i in range(50):\n"
+        "    store.append(f'{sys.argv[2]}-{i}', '20240101_120000', {'data': {'n': i, 'who': sys.argv[2]}})\n"
+        "store.close()\n"
+    )
+    workers = [subprocess.Popen([sys.executable, "-c", script, str(tmp_path), f"p{n}"], cwd=ROOT)
+               for n in range(4)]
+    assert all(worker.wait() == 0 for worker in workers)
+
+    store = ReportStore(str(tmp_path), segment_size=2048, compress_level=0)
+    assert store.stats()['reports'] == 200
+    for n in range(4):
+        for i in range(50):
+            report = store.latest(f"p{n}-{i}")
+            assert report['results'] == {'data': {'n': i, 'who': f"p{n}"}}
+    store.close()
+
+def test_legacy_reports_imported_once(tmp_path):
+    """Les anciens report_*.json sont importés une seule fois et conservés"""
+    legacy = {'target': "dave@example.com", 'date': "20230101_000000", 'type': "email",
+              'results': {'hibp': {'breached': True}}}
+    path = tmp_path / "report_dave_20230101_000000.json"
+    path.write_text(json.dumps(legacy), encoding="utf-8")
+    (tmp_path / "report_broken.json").write_text("{", encoding="utf-8")
+
+    store = ReportStore(str(tmp_path))
+    report = store.latest("dave@example.com")
+    assert report['results'] == {'hibp': {'breached': True}}
+    assert report['type'] == "email"
+    store.close()
+
+    store = ReportStore(str(tmp_path))
+    assert store.stats()['reports'] == 1
+    assert path.exists()
+    store.close()
+
+def test_mentions_and_reindex(tmp_path):
+    """L'index inversé retrouve les rapports et survit à une reconstruction"""
+    store = ReportStore(str(tmp_path))
+    first = store.append("eve@example.com", "20240101_120000", {'hibp': {'breached': False}})
+    second = store.append("eve@example.com", "20240102_120000", {'hibp': {'breached': True}})
+
+    assert [row[0] for row in store.mentions('email', "Eve@Example.com")] == [second, first]
+    assert store.reindex() == 2
+    assert [row[0] for row in store.mentions('email', "eve@example.com")] == [second, first]
+    store.close()
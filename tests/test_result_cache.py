@@ -0,0 +1,78 @@
+"""
+Tests du cache des résultats des fournisseurs
+by Dvrk_Smith
+"""
+
+import pytest
+
+from modules.result_cache import ResultCache, is_definitive
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "cache.sqlite3"), memory_size=2)
+
+@pytest.mark.parametrize("value, definitive", [
+    ({'breached': False}, True),
+    ([{'platform': 'GitHub'}], True),
+    ({'error': "Statut API: 400", 'status': 400}, True),
+    ({'error': "Statut API: 404", 'status': 404}, True),
+    ({'error': "Statut API: 401", 'status': 401}, False),
+    ({'error': "Statut API: 429", 'status': 429}, False),
+    ({'error': "Statut API: 503", 'status': 503}, False),
+    ({'error': "timed out"}, False),
+])
+def test_is_definitive(value, definitive):
+    assert is_definitive(value) is definitive
+
+def test_get_or_fetch_caches_definitive_answers(cache):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {'breached': True}
+
+    assert cache.get_or_fetch('hibp', "a@example.com", fetch) == {'breached': True}
+    assert cache.get_or_fetch('hibp', "a@example.com", fetch) == {'breached': True}
+    assert len(calls) == 1
+
+def test_transient_errors_are_not_cached(cache):
+    answers = iter([{'error': "Statut API: 429", 'status': 429}, {'breached': False}])
+    assert cache.get_or_fetch('hibp', "a@example.com", lambda: next(answers))['status'] == 429
+    assert cache.get_or_fetch('hibp', "a@example.com", lambda: next(answers)) == {'breached': False}
+
+def test_disk_hits_after_memory_eviction(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(path, memory_size=1)
+    cache.set('hunter', "a", {'score': 1})
+    cache.set('hunter', "b", {'score': 2})
+    assert cache.get('hunter', "a") == (True, {'score': 1})
+    assert cache.stats()['providers']['hunter']['disk_hits'] == 1
+
+    reopened = ResultCache(path)
+    assert reopened.get('hunter', "b") == (True, {'score': 2})
+    assert reopened.stats()['disk_entries'] == 2
+
+def test_expired_entries_are_misses(cache):
+    cache.ttls['emailrep'] = -1
+    cache.set('emailrep', "a@example.com", {'reputation': 'high'})
+    assert cache.get('emailrep', "a@example.com") == (False, None)
+
+def test_row_count_ignores_replacements(cache):
+    for _ in range(5):
+        cache.set('hibp', "a@example.com", {'breached': False})
+    cache.set('hibp', "b@example.com", {'breached': False})
+    assert cache.stats()['disk_entries'] == 2
+
+def test_delete(cache):
+    cache.set('hibp', "a@example.com", {'error': "Statut API: 400", 'status': 400})
+    cache.delete('hibp', "a@example.com")
+    cache.delete('hibp', "absent@example.com")
+    assert cache.get('hibp', "a@example.com") == (False, None)
+    assert cache.stats()['disk_entries'] == 0
+
+def test_disk_eviction_keeps_size_bounded(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite3"), memory_size=1, disk_size=10)
+    for i in range(25):
+        cache.set('hunter', f"user{i}", {'score': i})
+    assert cache.stats()['disk_entries'] <= 10
+    assert cache.get('hunter', "user24") == (True, {'score': 24})
@@ -0,0 +1,83 @@
+"""
+Tests du regroupement des appels identiques simultanés
+by Dvrk_Smith
+"""
+
+import threading
+
+import pytest
+
+from modules.singleflight import SingleFlight
+
+def _concurrent(flights, key, func, callers):
+    """Lance callers appels simultanés ; retourne (résultats, exceptions)"""
+    results, errors = [], []
+    barrier = threading.Barrier(callers)
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(flights.do(key, func))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+def _slow(release, value=None, error=None, calls=None):
+    """Fonction bloquée jusqu'à release, qui retourne value ou lève error"""
+    def func():
+        if calls is not None:
+            calls.append(1)
+        release.wait(5)
+        if error is not None:
+            raise error
+        return value
+    return func
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    release, calls = threading.Event(), []
+    threading.Timer(0.2, release.set).start()
+
+    results, errors = _concurrent(flights, 'k', _slow(release, value={'ok': True}, calls=calls), 8)
+    assert errors == []
+    assert results == [{'ok': True}] * 8
+    assert len(calls) == 1
+    stats = flights.stats()
+    assert stats['calls'] == 1 and stats['shared'] == 7 and stats['in_flight'] == 0
+
+def test_exception_propagates_to_every_caller():
+    """L'exception du premier appel est relevée chez tous les appelants en attente"""
+    flights = SingleFlight()
+    release, calls = threading.Event(), []
+    failure = ValueError("fournisseur indisponible")
+    threading.Timer(0.2, release.set).start()
+
+    results, errors = _concurrent(flights, 'k', _slow(release, error=failure, calls=calls), 6)
+    assert results == []
+    assert len(errors) == 6
+    assert all(error is failure for error in errors)
+    assert len(calls) == 1
+
+def test_nothing_is_kept_after_the_call():
+    """Un appel terminé (même en échec) n'est pas réutilisé par l'appel suivant"""
+    flights = SingleFlight()
+
+    def failing():
+        raise RuntimeError("échec")
+
+    with pytest.raises(RuntimeError):
+        flights.do('k', failing)
+    assert flights.do('k', lambda: 42) == 42
+    assert flights.stats() == {'calls': 2, 'shared': 0, 'in_flight': 0}
+
+def test_distinct_keys_run_separately():
+    flights = SingleFlight()
+    assert flights.do('a', lambda: 1) == 1
+    assert flights.do('b', lambda: 2) == 2
+    assert flights.stats()['calls'] == 2